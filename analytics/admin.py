@@ -0,0 +1,47 @@
+from django.contrib import admin
+from analytics.models import DailyRevenue, DailyOrderStatus, DailyFoodItemSales, DailyCategorySales, DailyAbandonedCarts
+from nomino.admin import LargeTableAdminMixin
+
+# Register your models here.
+
+# The rollups are written by AnalyticsServices; edit them by rebuilding (`manage.py rebuild_rollups`).
+
+
+class RollupAdmin(LargeTableAdminMixin, admin.ModelAdmin):
+    date_hierarchy = 'date'
+    ordering = ('-date',)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(DailyRevenue)
+class DailyRevenueAdmin(RollupAdmin):
+    list_display = ('date', 'orders', 'revenue')
+
+
+@admin.register(DailyOrderStatus)
+class DailyOrderStatusAdmin(RollupAdmin):
+    list_display = ('date', 'status', 'orders')
+    list_filter = ('status',)
+
+
+@admin.register(DailyFoodItemSales)
+class DailyFoodItemSalesAdmin(RollupAdmin):
+    list_display = ('date', 'food_item', 'quantity', 'revenue')
+    list_select_related = ('food_item',)
+    search_fields = ['food_item__name']
+
+
+@admin.register(DailyCategorySales)
+class DailyCategorySalesAdmin(RollupAdmin):
+    list_display = ('date', 'category', 'quantity', 'revenue')
+    list_select_related = ('category',)
+
+
+@admin.register(DailyAbandonedCarts)
+class DailyAbandonedCartsAdmin(RollupAdmin):
+    list_display = ('date', 'carts', 'items', 'quantity', 'value')
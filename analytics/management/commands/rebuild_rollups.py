@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+from analytics.services import AnalyticsServices
+
+
+class Command(BaseCommand):
+    help = "Rebuild the sales analytics rollup tables from the orders tables."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--start', help="First day to rebuild (YYYY-MM-DD). Defaults to the first order.")
+        parser.add_argument('--end', help="Last day to rebuild (YYYY-MM-DD). Defaults to the last order.")
+
+    def handle(self, *args, **options):
+        start = self.parse_day(options['start'])
+        end = self.parse_day(options['end'])
+        if start and end and start > end:
+            raise CommandError("--start must not be after --end.")
+
+        written = AnalyticsServices.rebuild(start=start, end=end)
+        for table, rows in written.items():
+            self.stdout.write(f"{table}: {rows} rows")
+        self.stdout.write(self.style.SUCCESS("Rollups rebuilt."))
+
+    def parse_day(self, value):
+        if value is None:
+            return None
+        try:
+            day = parse_date(value)
+        except ValueError:
+            day = None
+        if day is None:
+            raise CommandError(f"Invalid date: {value}")
+        return day
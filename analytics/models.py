@@ -0,0 +1,71 @@
+from django.db import models
+from food_item.models import FoodItem, Category
+
+# Create your models here.
+
+# Rollup tables are maintained incrementally by analytics.services.AnalyticsServices
+# and can be rebuilt from scratch with `python manage.py rebuild_rollups`.
+# Revenue and item figures only count orders that are not canceled.
+
+
+class DailyRevenue(models.Model):
+    date = models.DateField(unique=True)
+    orders = models.IntegerField(default=0)
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    def __str__(self):
+        return f"{self.date}: {self.orders} orders - ${self.revenue}"
+
+
+class DailyOrderStatus(models.Model):
+    date = models.DateField()
+    status = models.CharField(max_length=20)
+    orders = models.IntegerField(default=0)
+
+    class Meta:
+        unique_together = [['date', 'status']]
+
+    def __str__(self):
+        return f"{self.date}: {self.orders} {self.status}"
+
+
+class DailyFoodItemSales(models.Model):
+    date = models.DateField()
+    food_item = models.ForeignKey(FoodItem, on_delete=models.CASCADE, related_name='daily_sales')
+    quantity = models.IntegerField(default=0)
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    class Meta:
+        unique_together = [['date', 'food_item']]
+
+    def __str__(self):
+        return f"{self.date}: {self.quantity} X food item {self.food_item_id}"
+
+
+class DailyCategorySales(models.Model):
+    date = models.DateField()
+    category = models.ForeignKey(Category, on_delete=models.CASCADE, related_name='daily_sales')
+    quantity = models.IntegerField(default=0)
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    class Meta:
+        unique_together = [['date', 'category']]
+
+    def __str__(self):
+        return f"{self.date}: {self.quantity} items of category {self.category_id}"
+
+
+class DailyAbandonedCarts(models.Model):
+    """
+    Carts deleted by the abandoned cart sweeper, by the day they were last changed. Written by
+    AnalyticsServices.record_abandoned_carts as carts are swept; the carts are gone afterwards,
+    so rebuild_rollups leaves this table alone.
+    """
+    date = models.DateField(unique=True)
+    carts = models.IntegerField(default=0)
+    items = models.IntegerField(default=0)
+    quantity = models.IntegerField(default=0)
+    value = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    def __str__(self):
+        return f"{self.date}: {self.carts} carts abandoned - ${self.value}"
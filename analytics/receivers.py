@@ -0,0 +1,13 @@
+from django.dispatch import receiver
+from orders.signals import order_placed, order_status_changed
+from analytics.services import AnalyticsServices
+
+
+@receiver(order_placed)
+def update_rollups_for_new_order(sender, order, items, **kwargs):
+    AnalyticsServices.record_order_placed(order=order, items=items)
+
+
+@receiver(order_status_changed)
+def update_rollups_for_status_change(sender, orders, previous_status, **kwargs):
+    AnalyticsServices.record_status_changes(orders=orders, previous_status=previous_status)
@@ -0,0 +1,43 @@
+from datetime import timedelta
+from django.utils import timezone
+from rest_framework import serializers
+from analytics.models import DailyRevenue, DailyOrderStatus
+
+
+class ReportRangeSerializer(serializers.Serializer):
+    start = serializers.DateField(required=False)
+    end = serializers.DateField(required=False)
+    limit = serializers.IntegerField(required=False, min_value=1, max_value=100, default=10)
+
+    def validate(self, attrs):
+        attrs.setdefault('end', timezone.localdate())
+        attrs.setdefault('start', attrs['end'] - timedelta(days=29))
+        if attrs['start'] > attrs['end']:
+            raise serializers.ValidationError("start must not be after end.")
+        return attrs
+
+
+class DailyRevenueSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = DailyRevenue
+        fields = ['date','orders','revenue']
+
+
+class DailyOrderStatusSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = DailyOrderStatus
+        fields = ['date','status','orders']
+
+
+class FoodItemSalesSerializer(serializers.Serializer):
+    food_item = serializers.IntegerField(source='food_item_id')
+    name = serializers.CharField(source='food_item__name')
+    quantity = serializers.IntegerField()
+    revenue = serializers.DecimalField(max_digits=14, decimal_places=2)
+
+
+class CategorySalesSerializer(serializers.Serializer):
+    category = serializers.IntegerField(source='category_id')
+    name = serializers.CharField(source='category__name')
+    quantity = serializers.IntegerField()
+    revenue = serializers.DecimalField(max_digits=14, decimal_places=2)
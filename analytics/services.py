@@ -0,0 +1,200 @@
+from collections import defaultdict
+from decimal import Decimal
+from django.db import transaction, IntegrityError
+from django.db.models import F, Sum, Count
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+from analytics.models import DailyRevenue, DailyOrderStatus, DailyFoodItemSales, DailyCategorySales, DailyAbandonedCarts
+from orders.models import CartItem, Order, OrderItem
+
+
+def counts_as_sale(status):
+    return status != Order.CANCELED
+
+
+class AnalyticsServices:
+
+
+    @staticmethod
+    def record_order_placed(order, items):
+        day = timezone.localdate(order.created_at)
+        lines = [
+            (item.food_item_id, item.food_item.category_id, item.quantity, item.total_price)
+            for item in items
+        ]
+
+        with transaction.atomic():
+            AnalyticsServices._increment(DailyOrderStatus, {'date': day, 'status': order.status}, orders=1)
+            if counts_as_sale(order.status):
+                AnalyticsServices._increment(DailyRevenue, {'date': day}, orders=1, revenue=order.total_price)
+                AnalyticsServices._apply_lines({day: lines}, sign=1)
+
+
+    @staticmethod
+    def record_status_changes(orders, previous_status):
+        """
+        Move the status counters of ``orders`` and, for orders that were canceled or
+        restored, take their revenue and line items out of (or back into) the rollups.
+        """
+        status_deltas = defaultdict(int)
+        revenue_deltas = defaultdict(lambda: [0, Decimal('0')])
+        sale_changes = {}
+
+        for order in orders:
+            old_status, new_status = previous_status[order.pk], order.status
+            if old_status == new_status:
+                continue
+            day = timezone.localdate(order.created_at)
+            status_deltas[(day, old_status)] -= 1
+            status_deltas[(day, new_status)] += 1
+
+            sign = counts_as_sale(new_status) - counts_as_sale(old_status)
+            if sign:
+                revenue_deltas[day][0] += sign
+                revenue_deltas[day][1] += sign * order.total_price
+                sale_changes[order.pk] = (day, sign)
+
+        if not status_deltas:
+            return
+
+        positive_lines, negative_lines = defaultdict(list), defaultdict(list)
+        if sale_changes:
+            order_items = OrderItem.objects.filter(order_id__in=sale_changes).values_list(
+                'order_id', 'food_item_id', 'food_item__category_id', 'quantity', 'total_price'
+            )
+            for order_id, food_item_id, category_id, quantity, total_price in order_items:
+                day, sign = sale_changes[order_id]
+                lines = positive_lines if sign > 0 else negative_lines
+                lines[day].append((food_item_id, category_id, quantity, total_price))
+
+        with transaction.atomic():
+            for (day, status), delta in status_deltas.items():
+                if delta:
+                    AnalyticsServices._increment(DailyOrderStatus, {'date': day, 'status': status}, orders=delta)
+            for day, (count, revenue) in revenue_deltas.items():
+                if count:
+                    AnalyticsServices._increment(DailyRevenue, {'date': day}, orders=count, revenue=revenue)
+            AnalyticsServices._apply_lines(positive_lines, sign=1)
+            AnalyticsServices._apply_lines(negative_lines, sign=-1)
+
+
+    @staticmethod
+    def record_abandoned_carts(carts):
+        """
+        Add the carts in the queryset ``carts``, which are about to be deleted, and their items
+        (valued at today's prices) to DailyAbandonedCarts, by the day each cart was last changed.
+        """
+        totals = defaultdict(lambda: [0, 0, 0, Decimal('0')])
+        for row in carts.annotate(day=TruncDate('updated_at')).values('day').annotate(count=Count('id')).order_by():
+            totals[row['day']][0] += row['count']
+        items = CartItem.objects.filter(cart__in=carts).annotate(day=TruncDate('cart__updated_at')).values('day').annotate(
+            count=Count('id'), total_quantity=Sum('quantity'), total_value=Sum(F('quantity') * F('food_item__price'))
+        ).order_by()
+        for row in items:
+            day = totals[row['day']]
+            day[1] += row['count']
+            day[2] += row['total_quantity']
+            day[3] += row['total_value']
+
+        with transaction.atomic():
+            for day, (count, item_count, quantity, value) in totals.items():
+                AnalyticsServices._increment(
+                    DailyAbandonedCarts, {'date': day}, carts=count, items=item_count, quantity=quantity, value=value
+                )
+
+
+    @staticmethod
+    def rebuild(start=None, end=None):
+        """
+        Recompute every rollup from the orders tables, optionally limited to the
+        ``start``..``end`` date range (inclusive). Returns the number of rows written per table.
+        """
+        orders = Order.objects.annotate(day=TruncDate('created_at'))
+        order_items = OrderItem.objects.exclude(order__status=Order.CANCELED).annotate(day=TruncDate('order__created_at'))
+        if start:
+            orders = orders.filter(day__gte=start)
+            order_items = order_items.filter(day__gte=start)
+        if end:
+            orders = orders.filter(day__lte=end)
+            order_items = order_items.filter(day__lte=end)
+
+        revenue = {}
+        statuses = []
+        for row in orders.values('day', 'status').annotate(count=Count('id'), revenue=Sum('total_price')).order_by():
+            statuses.append(DailyOrderStatus(date=row['day'], status=row['status'], orders=row['count']))
+            if counts_as_sale(row['status']):
+                daily = revenue.setdefault(row['day'], DailyRevenue(date=row['day']))
+                daily.orders += row['count']
+                daily.revenue += row['revenue']
+
+        food_items = []
+        categories = {}
+        lines = order_items.values('day', 'food_item_id', 'food_item__category_id').annotate(
+            quantity=Sum('quantity'), revenue=Sum('total_price')
+        ).order_by()
+        for row in lines:
+            food_items.append(DailyFoodItemSales(
+                date=row['day'], food_item_id=row['food_item_id'], quantity=row['quantity'], revenue=row['revenue']
+            ))
+            key = (row['day'], row['food_item__category_id'])
+            category = categories.setdefault(key, DailyCategorySales(date=key[0], category_id=key[1]))
+            category.quantity += row['quantity']
+            category.revenue += row['revenue']
+
+        with transaction.atomic():
+            for model in (DailyRevenue, DailyOrderStatus, DailyFoodItemSales, DailyCategorySales):
+                stale = model.objects.all()
+                if start:
+                    stale = stale.filter(date__gte=start)
+                if end:
+                    stale = stale.filter(date__lte=end)
+                stale.delete()
+
+            DailyRevenue.objects.bulk_create(revenue.values(), batch_size=1000)
+            DailyOrderStatus.objects.bulk_create(statuses, batch_size=1000)
+            DailyFoodItemSales.objects.bulk_create(food_items, batch_size=1000)
+            DailyCategorySales.objects.bulk_create(categories.values(), batch_size=1000)
+
+        return {
+            'DailyRevenue': len(revenue),
+            'DailyOrderStatus': len(statuses),
+            'DailyFoodItemSales': len(food_items),
+            'DailyCategorySales': len(categories),
+        }
+
+
+    @staticmethod
+    def _apply_lines(lines_by_day, sign):
+        food_items = defaultdict(lambda: [0, Decimal('0')])
+        categories = defaultdict(lambda: [0, Decimal('0')])
+        for day, lines in lines_by_day.items():
+            for food_item_id, category_id, quantity, total_price in lines:
+                for totals in (food_items[(day, food_item_id)], categories[(day, category_id)]):
+                    totals[0] += sign * quantity
+                    totals[1] += sign * total_price
+
+        for (day, food_item_id), (quantity, revenue) in food_items.items():
+            AnalyticsServices._increment(
+                DailyFoodItemSales, {'date': day, 'food_item_id': food_item_id}, quantity=quantity, revenue=revenue
+            )
+        for (day, category_id), (quantity, revenue) in categories.items():
+            AnalyticsServices._increment(
+                DailyCategorySales, {'date': day, 'category_id': category_id}, quantity=quantity, revenue=revenue
+            )
+
+
+    @staticmethod
+    def _increment(model, lookup, **deltas):
+        """
+        Add ``deltas`` to the rollup row identified by ``lookup`` with a single
+        `UPDATE ... SET x = x + n`, creating the row the first time the key is seen.
+        """
+        changes = {field: F(field) + value for field, value in deltas.items()}
+        if model.objects.filter(**lookup).update(**changes):
+            return
+        try:
+            with transaction.atomic():
+                model.objects.create(**lookup, **deltas)
+        except IntegrityError:
+            # Another transaction created the row first.
+            model.objects.filter(**lookup).update(**changes)
@@ -0,0 +1,183 @@
+from datetime import timedelta
+from decimal import Decimal
+from django.conf import settings
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+from analytics.models import DailyRevenue, DailyOrderStatus, DailyFoodItemSales, DailyCategorySales
+from analytics.services import AnalyticsServices
+from food_item.models import Category, FoodItem
+from orders.models import Cart, CartItem, Order
+from orders.services import OrderServices
+from users.models import User
+
+# Create your tests here.
+
+
+class AnalyticsTestCase(TestCase):
+    def setUp(self):
+        self.soups = Category.objects.create(name='Soups', details='Hot soups')
+        self.rice = Category.objects.create(name='Rice', details='Rice dishes')
+        self.soup = FoodItem.objects.create(name='Chicken Soup', category=self.soups, description='Soup', price='4.50', image='soup.jpg')
+        self.biryani = FoodItem.objects.create(name='Biryani', category=self.rice, description='Rice', price='8.00', image='rice.jpg')
+        self.customer = User.objects.create_user(email='customer@example.com')
+
+    def place_order(self, *lines):
+        """
+        Check out a cart holding (food_item, quantity) ``lines``, running the
+        order_placed receivers as the transaction commits.
+        """
+        cart = Cart.objects.create(user=self.customer)
+        for food_item, quantity in lines:
+            CartItem.objects.create(cart=cart, food_item=food_item, quantity=quantity)
+        with self.captureOnCommitCallbacks(execute=True):
+            return OrderServices.create_order(user=self.customer, cart_id=cart.id)
+
+    def update_status(self, order, status):
+        with self.captureOnCommitCallbacks(execute=True):
+            return OrderServices.update_status(order=order, status=status)
+
+
+class AnalyticsServicesTests(AnalyticsTestCase):
+
+    def rollups(self):
+        """
+        Every rollup row with a non zero count. Incremental updates leave zeroed rows
+        behind that a rebuild doesn't write.
+        """
+        return {
+            'revenue': set(DailyRevenue.objects.exclude(orders=0).values_list('date', 'orders', 'revenue')),
+            'statuses': set(DailyOrderStatus.objects.exclude(orders=0).values_list('date', 'status', 'orders')),
+            'food_items': set(DailyFoodItemSales.objects.exclude(quantity=0).values_list('date', 'food_item_id', 'quantity', 'revenue')),
+            'categories': set(DailyCategorySales.objects.exclude(quantity=0).values_list('date', 'category_id', 'quantity', 'revenue')),
+        }
+
+    def test_order_placed_increments_rollups(self):
+        today = timezone.localdate()
+        self.place_order((self.soup, 2), (self.biryani, 1))
+        self.place_order((self.soup, 1))
+
+        self.assertEqual(self.rollups(), {
+            'revenue': {(today, 2, Decimal('21.50'))},
+            'statuses': {(today, Order.PENDING, 2)},
+            'food_items': {(today, self.soup.id, 3, Decimal('13.50')), (today, self.biryani.id, 1, Decimal('8.00'))},
+            'categories': {(today, self.soups.id, 3, Decimal('13.50')), (today, self.rice.id, 1, Decimal('8.00'))},
+        })
+
+    def test_status_changes_move_counts(self):
+        today = timezone.localdate()
+        confirmed = self.place_order((self.soup, 2))
+        self.place_order((self.biryani, 1))
+        self.update_status(confirmed, Order.CONFIRMED)
+        self.update_status(confirmed, Order.DELIVERED)
+
+        self.assertEqual(self.rollups()['statuses'], {(today, Order.PENDING, 1), (today, Order.DELIVERED, 1)})
+        self.assertEqual(DailyOrderStatus.objects.get(date=today, status=Order.CONFIRMED).orders, 0)
+        self.assertEqual(self.rollups()['revenue'], {(today, 2, Decimal('17.00'))})
+
+    def test_cancellation_removes_revenue_and_items(self):
+        today = timezone.localdate()
+        kept = self.place_order((self.soup, 1))
+        canceled = self.place_order((self.soup, 2), (self.biryani, 1))
+        self.update_status(canceled, Order.CANCELED)
+
+        self.assertEqual(self.rollups(), {
+            'revenue': {(today, 1, Decimal('4.50'))},
+            'statuses': {(today, Order.PENDING, 1), (today, Order.CANCELED, 1)},
+            'food_items': {(today, self.soup.id, 1, Decimal('4.50'))},
+            'categories': {(today, self.soups.id, 1, Decimal('4.50'))},
+        })
+        self.assertEqual(DailyFoodItemSales.objects.get(date=today, food_item=self.biryani).quantity, 0)
+
+        self.update_status(kept, Order.CANCELED)
+        self.assertEqual(DailyRevenue.objects.get(date=today).revenue, 0)
+
+    def test_rebuild_matches_incremental_rollups(self):
+        orders = [self.place_order((self.soup, 2), (self.biryani, 1)) for _ in range(3)]
+        self.place_order((self.biryani, 4))
+        self.update_status(orders[0], Order.CONFIRMED)
+        self.update_status(orders[1], Order.CANCELED)
+        with self.captureOnCommitCallbacks(execute=True):
+            OrderServices.bulk_transition([orders[0].id, orders[2].id], Order.CONFIRMED)
+        incremental = self.rollups()
+
+        AnalyticsServices.rebuild()
+        self.assertEqual(self.rollups(), incremental)
+        self.assertFalse(DailyOrderStatus.objects.filter(orders=0).exists())
+
+    def test_rebuild_only_touches_the_date_range(self):
+        self.place_order((self.soup, 1))
+        last_week = timezone.localdate() - timedelta(days=7)
+        DailyRevenue.objects.create(date=last_week, orders=5, revenue='50.00')
+
+        written = AnalyticsServices.rebuild(start=timezone.localdate())
+        self.assertEqual(written['DailyRevenue'], 1)
+        self.assertEqual(DailyRevenue.objects.get(date=last_week).orders, 5)
+
+
+@override_settings(DATABASE_REPLICAS={**settings.DATABASE_REPLICAS, 'ALIASES': []})
+class ReportViewSetTests(AnalyticsTestCase):
+    report_urls = ['/api/v1/reports/revenue/', '/api/v1/reports/statuses/', '/api/v1/reports/food-items/', '/api/v1/reports/categories/']
+
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user(email='staff@example.com', is_staff=True))
+
+    def test_reports_are_admin_only(self):
+        client = APIClient()
+        for url in self.report_urls:
+            self.assertEqual(client.get(url).status_code, 401)
+        client.force_authenticate(self.customer)
+        for url in self.report_urls:
+            self.assertEqual(client.get(url).status_code, 403)
+
+    def test_revenue_in_date_range(self):
+        today = timezone.localdate()
+        self.place_order((self.soup, 2))
+        DailyRevenue.objects.create(date=today - timedelta(days=40), orders=3, revenue='30.00')
+        DailyRevenue.objects.create(date=today - timedelta(days=2), orders=1, revenue='8.00')
+
+        response = self.client.get('/api/v1/reports/revenue/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.data['orders'], response.data['revenue']), (2, Decimal('17.00')))
+        self.assertEqual([day['date'] for day in response.json()['days']], [str(today - timedelta(days=2)), str(today)])
+
+        response = self.client.get('/api/v1/reports/revenue/', {'start': today - timedelta(days=50), 'end': today - timedelta(days=30)})
+        self.assertEqual((response.data['orders'], response.data['revenue']), (3, Decimal('30.00')))
+
+    def test_invalid_range_is_rejected(self):
+        today = timezone.localdate()
+        response = self.client.get('/api/v1/reports/revenue/', {'start': today, 'end': today - timedelta(days=1)})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.client.get('/api/v1/reports/statuses/', {'start': 'yesterday'}).status_code, 400)
+        for limit in (0, 101):
+            self.assertEqual(self.client.get('/api/v1/reports/food-items/', {'limit': limit}).status_code, 400)
+
+    def test_statuses_skip_empty_counts(self):
+        order = self.place_order((self.soup, 1))
+        self.update_status(order, Order.CONFIRMED)
+
+        response = self.client.get('/api/v1/reports/statuses/')
+        self.assertEqual([(row['status'], row['orders']) for row in response.json()], [(Order.CONFIRMED, 1)])
+
+    def test_best_sellers_are_limited_and_ordered_by_revenue(self):
+        self.place_order((self.soup, 1), (self.biryani, 1))
+        self.place_order((self.soup, 3))
+
+        response = self.client.get('/api/v1/reports/food-items/')
+        self.assertEqual([(row['name'], row['quantity'], row['revenue']) for row in response.json()], [('Chicken Soup', 4, 18.0), ('Biryani', 1, 8.0)])
+        response = self.client.get('/api/v1/reports/food-items/', {'limit': 1})
+        self.assertEqual([row['food_item'] for row in response.json()], [self.soup.id])
+
+        response = self.client.get('/api/v1/reports/categories/', {'limit': 1})
+        self.assertEqual([(row['category'], row['quantity']) for row in response.json()], [(self.soups.id, 4)])
+
+    def test_canceled_sales_are_left_out(self):
+        self.place_order((self.soup, 1))
+        order = self.place_order((self.biryani, 2))
+        self.update_status(order, Order.CANCELED)
+        self.assertTrue(DailyFoodItemSales.objects.filter(food_item=self.biryani, quantity=0).exists())
+
+        self.assertEqual([row['name'] for row in self.client.get('/api/v1/reports/food-items/').json()], ['Chicken Soup'])
+        self.assertEqual([row['name'] for row in self.client.get('/api/v1/reports/categories/').json()], ['Soups'])
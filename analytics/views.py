@@ -0,0 +1,119 @@
+from django.db.models import Sum
+from rest_framework.viewsets import GenericViewSet
+from rest_framework.decorators import action
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from analytics.models import DailyRevenue, DailyOrderStatus, DailyFoodItemSales, DailyCategorySales
+from analytics.serializers import ReportRangeSerializer, DailyRevenueSerializer, DailyOrderStatusSerializer, FoodItemSalesSerializer, CategorySalesSerializer
+from nomino.docs import swagger_auto_schema
+from nomino.docs import openapi
+
+# Create your views here.
+
+
+class ReportViewSet(GenericViewSet):
+    """
+    API endpoint for sales reports, answered from the daily rollup tables.
+    """
+    permission_classes = [IsAdminUser]
+    serializer_class = ReportRangeSerializer
+
+    @swagger_auto_schema(
+        operation_summary="Return revenue and order count per day.",
+        operation_description="Defaults to the last 30 days. Canceled orders are not counted.",
+        query_serializer=ReportRangeSerializer,
+        responses={
+            200: openapi.Response(
+                description="Daily revenue",
+                schema=DailyRevenueSerializer(many=True)
+            ),
+            400: "Validation error",
+            403: "You do not have permission to perform this action."
+        }
+    )
+    @action(detail=False, methods=['get'])
+    def revenue(self, request):
+        params = self.get_range()
+        rows = DailyRevenue.objects.filter(date__range=(params['start'], params['end'])).order_by('date')
+        totals = rows.aggregate(orders=Sum('orders'), revenue=Sum('revenue'))
+        return Response({
+            'start': params['start'],
+            'end': params['end'],
+            'orders': totals['orders'] or 0,
+            'revenue': totals['revenue'] or 0,
+            'days': DailyRevenueSerializer(rows, many=True).data
+        })
+
+    @swagger_auto_schema(
+        operation_summary="Return order counts per day and status.",
+        operation_description="Defaults to the last 30 days.",
+        query_serializer=ReportRangeSerializer,
+        responses={
+            200: openapi.Response(
+                description="Daily order counts by status",
+                schema=DailyOrderStatusSerializer(many=True)
+            ),
+            400: "Validation error",
+            403: "You do not have permission to perform this action."
+        }
+    )
+    @action(detail=False, methods=['get'])
+    def statuses(self, request):
+        params = self.get_range()
+        rows = DailyOrderStatus.objects.filter(date__range=(params['start'], params['end'])).exclude(orders=0).order_by('date', 'status')
+        return Response(DailyOrderStatusSerializer(rows, many=True).data)
+
+    @swagger_auto_schema(
+        operation_summary="Return the best selling food items in a date range.",
+        operation_description="Ordered by revenue. Defaults to the top 10 of the last 30 days.",
+        query_serializer=ReportRangeSerializer,
+        responses={
+            200: openapi.Response(
+                description="Food item sales",
+                schema=FoodItemSalesSerializer(many=True)
+            ),
+            400: "Validation error",
+            403: "You do not have permission to perform this action."
+        }
+    )
+    @action(detail=False, methods=['get'], url_path='food-items')
+    def food_items(self, request):
+        params = self.get_range()
+        rows = (
+            DailyFoodItemSales.objects.filter(date__range=(params['start'], params['end']))
+            .values('food_item_id', 'food_item__name')
+            .annotate(quantity=Sum('quantity'), revenue=Sum('revenue'))
+            .filter(quantity__gt=0)
+            .order_by('-revenue', '-quantity')[:params['limit']]
+        )
+        return Response(FoodItemSalesSerializer(rows, many=True).data)
+
+    @swagger_auto_schema(
+        operation_summary="Return sales per category in a date range.",
+        operation_description="Ordered by revenue. Defaults to the top 10 of the last 30 days.",
+        query_serializer=ReportRangeSerializer,
+        responses={
+            200: openapi.Response(
+                description="Category sales",
+                schema=CategorySalesSerializer(many=True)
+            ),
+            400: "Validation error",
+            403: "You do not have permission to perform this action."
+        }
+    )
+    @action(detail=False, methods=['get'])
+    def categories(self, request):
+        params = self.get_range()
+        rows = (
+            DailyCategorySales.objects.filter(date__range=(params['start'], params['end']))
+            .values('category_id', 'category__name')
+            .annotate(quantity=Sum('quantity'), revenue=Sum('revenue'))
+            .filter(quantity__gt=0)
+            .order_by('-revenue', '-quantity')[:params['limit']]
+        )
+        return Response(CategorySalesSerializer(rows, many=True).data)
+
+    def get_range(self):
+        serializer = ReportRangeSerializer(data=self.request.query_params)
+        serializer.is_valid(raise_exception=True)
+        return serializer.validated_data
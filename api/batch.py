@@ -0,0 +1,131 @@
+import io
+import logging
+import orjson
+from django.conf import settings
+from django.core.handlers.wsgi import WSGIRequest
+from django.urls import Resolver404, resolve
+from rest_framework.permissions import SAFE_METHODS
+from api.workers import WorkerPool
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    'MAX_REQUESTS': 20,
+    'MAX_WORKERS': 4,
+    'PATH_PREFIX': '/api/v1/',
+    # Route names that can't run inside a batch: the batch endpoint itself and streams.
+    'EXCLUDED_ROUTES': ['batch', 'order-events'],
+}
+
+
+def get_setting(name):
+    return getattr(settings, 'BATCH_REQUESTS', {}).get(name, DEFAULTS[name])
+
+
+pool = WorkerPool('batch', lambda: get_setting('MAX_WORKERS'))
+
+
+class SubResponse:
+    __slots__ = ('status', 'body')
+
+    def __init__(self, status, body):
+        self.status = status
+        self.body = body
+
+    @classmethod
+    def error(cls, status, detail):
+        return cls(status, orjson.dumps({'detail': detail}))
+
+    @classmethod
+    def from_response(cls, response):
+        if response.streaming:
+            response.close()
+            return cls.error(400, "Streaming responses can't be batched.")
+        if not response.content:
+            return cls(response.status_code, b'null')
+        if response.get('Content-Type', '').startswith('application/json'):
+            return cls(response.status_code, response.content)
+        return cls(response.status_code, orjson.dumps(response.content.decode(response.charset, errors='replace')))
+
+    def encode(self):
+        return b'{"status":%d,"body":%s}' % (self.status, self.body)
+
+
+def build_request(request, method, path, body):
+    """
+    A request for ``path`` with ``body`` as JSON, made as ``request``'s user with its headers
+    (except the conditional ones).
+    """
+    path_info, _, query_string = path.partition('?')
+    content = orjson.dumps(body) if body is not None else b''
+    environ = {key: value for key, value in request.META.items() if not key.startswith(('HTTP_IF_', 'wsgi.'))}
+    environ.update({
+        'REQUEST_METHOD': method,
+        'SCRIPT_NAME': '',
+        'PATH_INFO': path_info,
+        'QUERY_STRING': query_string,
+        'CONTENT_TYPE': 'application/json',
+        'CONTENT_LENGTH': str(len(content)),
+        'HTTP_ACCEPT': 'application/json',
+        'wsgi.input': io.BytesIO(content),
+        'wsgi.url_scheme': request.scheme,
+    })
+    sub_request = WSGIRequest(environ)
+    # DRF authenticates the sub-request as the batch's user instead of decoding the token again.
+    sub_request._force_auth_user = request.user
+    sub_request._force_auth_token = request.auth
+    return sub_request
+
+
+def dispatch(request, item):
+    """
+    Run one sub-request ({'method', 'path', 'body'}) through the URL resolver and its view.
+    """
+    path = item['path']
+    try:
+        match = resolve(path.partition('?')[0])
+    except Resolver404:
+        return SubResponse.error(404, "Not found.")
+    if match.url_name in get_setting('EXCLUDED_ROUTES'):
+        return SubResponse.error(400, f"{path} can't be batched.")
+
+    try:
+        sub_request = build_request(request, item['method'], path, item.get('body'))
+        sub_request.resolver_match = match
+        response = match.func(sub_request, *match.args, **match.kwargs)
+        if hasattr(response, 'render') and callable(response.render):
+            response.render()
+    except Exception:
+        logger.exception("Batched %s %s failed", item['method'], path)
+        return SubResponse.error(500, "A server error occurred.")
+    return SubResponse.from_response(response)
+
+
+def plan(items):
+    """
+    Split ``items`` into the groups they run in, in order: consecutive reads run together,
+    and each write runs alone, after everything before it.
+    """
+    groups = []
+    for index, item in enumerate(items):
+        if item['method'] in SAFE_METHODS and groups and groups[-1][-1][1]['method'] in SAFE_METHODS:
+            groups[-1].append((index, item))
+        else:
+            groups.append([(index, item)])
+    return groups
+
+
+def run_batch(request, items):
+    """
+    Return the JSON response body for the sub-requests ``items``, one result per item in order.
+    """
+    results = [None] * len(items)
+    for group in plan(items):
+        if get_setting('MAX_WORKERS') and len(group) > 1:
+            futures = [(index, pool.submit(dispatch, request, item)) for index, item in group]
+            for index, future in futures:
+                results[index] = future.result()
+        else:
+            for index, item in group:
+                results[index] = dispatch(request, item)
+    return b'{"responses":[' + b','.join(result.encode() for result in results) + b']}'
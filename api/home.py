@@ -0,0 +1,158 @@
+import logging
+import time
+from concurrent.futures import TimeoutError
+from datetime import timedelta
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Sum
+from django.utils import timezone
+from analytics.models import DailyFoodItemSales
+from api.serializers import HomeCategorySerializer, LatestOrderSerializer
+from api.workers import DeadlineExceeded, WorkerPool
+from food_item.models import Category, FoodItem
+from food_item.serializers import FoodItemSerializer, SpecialFoodItemSerializer
+from orders.models import Cart, Order
+from orders.serializers import CartSerializer
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    'MAX_WORKERS': 4,
+    'TIMEOUT_SECONDS': 2,
+    # Seconds each section is cached for; 0 loads it on every request.
+    'CACHE_SECONDS': {
+        'categories': 300,
+        'specials': 60,
+        'bestsellers': 600,
+        'cart': 0,
+        'latest_order': 0,
+    },
+    'BESTSELLER_DAYS': 7,
+    'BESTSELLER_LIMIT': 10,
+}
+
+
+def get_setting(name):
+    return getattr(settings, 'HOME_SCREEN', {}).get(name, DEFAULTS[name])
+
+
+def load_categories(request):
+    return HomeCategorySerializer(Category.objects.order_by('name'), many=True).data
+
+
+def load_specials(request):
+    return SpecialFoodItemSerializer(FoodItem.objects.filter(is_special=True).order_by('id'), many=True).data
+
+
+def load_bestsellers(request):
+    """
+    The food items sold the most over the last BESTSELLER_DAYS, from the daily sales rollups.
+    """
+    today = timezone.localdate()
+    ids = list(
+        DailyFoodItemSales.objects.filter(date__range=(today - timedelta(days=get_setting('BESTSELLER_DAYS')), today))
+        .values('food_item_id')
+        .annotate(sold=Sum('quantity'))
+        .filter(sold__gt=0)
+        .order_by('-sold', 'food_item_id')
+        .values_list('food_item_id', flat=True)[:get_setting('BESTSELLER_LIMIT')]
+    )
+    food_items = FoodItem.objects.select_related('category').in_bulk(ids)
+    return FoodItemSerializer([food_items[pk] for pk in ids if pk in food_items], many=True).data
+
+
+def load_cart(request):
+    cart = Cart.objects.prefetch_related('items__food_item').filter(user_id=request.user.id).first()
+    return CartSerializer(cart).data if cart is not None else None
+
+
+def load_latest_order(request):
+    order = Order.objects.filter(user_id=request.user.id).order_by('-created_at').first()
+    return LatestOrderSerializer(order).data if order is not None else None
+
+
+class Section:
+    __slots__ = ('name', 'load', 'per_user')
+
+    def __init__(self, name, load, per_user=False):
+        self.name = name
+        self.load = load
+        self.per_user = per_user
+
+    def cache_key(self, request):
+        if self.per_user:
+            return f"home:{self.name}:{request.user.id}"
+        return f"home:{self.name}"
+
+    def cache_seconds(self):
+        return get_setting('CACHE_SECONDS').get(self.name, 0)
+
+
+SECTIONS = [
+    Section('categories', load_categories),
+    Section('specials', load_specials),
+    Section('bestsellers', load_bestsellers),
+    Section('cart', load_cart, per_user=True),
+    Section('latest_order', load_latest_order, per_user=True),
+]
+
+
+
+def invalidate_menu_sections():
+    """
+    Drop the cached sections built from the menu, after a category or food item changes.
+    """
+    cache.delete_many([section.cache_key(None) for section in SECTIONS if not section.per_user])
+
+pool = WorkerPool('home', lambda: get_setting('MAX_WORKERS'))
+
+
+def collect(section, load, unavailable):
+    """
+    Return ``load()``, or log the failure, add the section to ``unavailable`` and return None.
+    """
+    try:
+        return load()
+    except (TimeoutError, DeadlineExceeded):
+        logger.warning("Home section %s timed out", section.name)
+    except Exception:
+        logger.exception("Home section %s failed", section.name)
+    unavailable.append(section.name)
+    return None
+
+
+def load_home(request):
+    """
+    Return ({section name: data}, [names of the sections that failed]).
+
+    Cached sections are read with one cache call; the others load concurrently on the
+    worker pool (or in this thread when MAX_WORKERS is 0 or only one is missing). A section
+    that raises or takes longer than TIMEOUT_SECONDS is returned as None and listed as
+    unavailable, without failing the others. A timed-out section that hasn't started is
+    canceled; one that is running stops at its next database query (see WorkerPool).
+    """
+    keys = {section.name: section.cache_key(request) for section in SECTIONS if section.cache_seconds()}
+    cached = cache.get_many(keys.values()) if keys else {}
+
+    data, unavailable, missing = {}, [], []
+    for section in SECTIONS:
+        key = keys.get(section.name)
+        if key in cached:
+            data[section.name] = cached[key]
+        else:
+            missing.append(section)
+
+    if get_setting('MAX_WORKERS') and len(missing) > 1:
+        deadline = time.monotonic() + get_setting('TIMEOUT_SECONDS')
+        futures = [(section, pool.submit(section.load, request, deadline=deadline)) for section in missing]
+        for section, future in futures:
+            data[section.name] = collect(section, lambda: future.result(timeout=max(deadline - time.monotonic(), 0)), unavailable)
+            future.cancel()
+    else:
+        for section in missing:
+            data[section.name] = collect(section, lambda: section.load(request), unavailable)
+
+    for section in missing:
+        if section.name in keys and section.name not in unavailable:
+            cache.set(keys[section.name], data[section.name], section.cache_seconds())
+    return data, unavailable
@@ -0,0 +1,118 @@
+import io
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.test.utils import override_settings
+from nomino.backends.metrics import connection_wait_seconds, connections_opened, connections_reused
+from users.models import User
+from users.serializers import TokenObtainPairSerializer
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare requests per second with new connections per request, persistent connections "
+        "and (when configured) a connection pool, by sending requests through the WSGI handler."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--path', default='/api/v1/food_items/', help="Path to request.")
+        parser.add_argument('--email', help="Send the requests as this user.")
+        parser.add_argument('--requests', type=int, default=500, help="Requests per mode.")
+        parser.add_argument('--concurrency', type=int, default=1, help="Threads sending requests.")
+        parser.add_argument('--database', default='default', help="Database alias to tune.")
+
+    def handle(self, *args, **options):
+        settings_dict = connections[options['database']].settings_dict
+        pool = settings_dict['OPTIONS'].get('pool')
+        modes = {
+            'off': {'CONN_MAX_AGE': 0, 'CONN_HEALTH_CHECKS': False, 'pool': None},
+            'persistent': {'CONN_MAX_AGE': 60, 'CONN_HEALTH_CHECKS': True, 'pool': None},
+        }
+        if pool:
+            modes['pool'] = {'CONN_MAX_AGE': 0, 'CONN_HEALTH_CHECKS': False, 'pool': pool}
+        original = {key: settings_dict.get(key) for key in ('CONN_MAX_AGE', 'CONN_HEALTH_CHECKS')}
+
+        handler = WSGIHandler()
+        self.authorization = ''
+        if options['email']:
+            try:
+                user = User.objects.get(email=options['email'])
+            except User.DoesNotExist:
+                raise CommandError(f"No user with email {options['email']}")
+            self.authorization = f"JWT {TokenObtainPairSerializer.get_token(user).access_token}"
+        results = {'path': options['path'], 'requests': options['requests'], 'concurrency': options['concurrency']}
+        # Throttling state is kept in the cache; a dummy cache keeps the benchmark from being rate limited.
+        # Reads are sent to the benchmarked database even when replicas are configured, and DEBUG
+        # is off as in production (the debug toolbar and query logging would dominate the timings).
+        replicas = [] if options['database'] == 'default' else [options['database']]
+        with override_settings(
+            DEBUG=False,
+            CACHES={'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}},
+            DATABASE_REPLICAS={**settings.DATABASE_REPLICAS, 'ALIASES': replicas},
+        ):
+            try:
+                for mode, config in modes.items():
+                    settings_dict['CONN_MAX_AGE'] = config['CONN_MAX_AGE']
+                    settings_dict['CONN_HEALTH_CHECKS'] = config['CONN_HEALTH_CHECKS']
+                    settings_dict['OPTIONS'].pop('pool', None)
+                    if config['pool']:
+                        settings_dict['OPTIONS']['pool'] = config['pool']
+                    results[mode] = self.run(handler, options)
+            finally:
+                settings_dict.update(original)
+                if pool:
+                    settings_dict['OPTIONS']['pool'] = pool
+        self.stdout.write(json.dumps(results, indent=2))
+
+    def run(self, handler, options):
+        alias = options['database']
+        connections.close_all()
+        self.request(handler, options['path'])
+
+        opened = connections_opened.value(alias=alias, source='new') + connections_opened.value(alias=alias, source='pool')
+        reused = connections_reused.value(alias=alias)
+        waited = connection_wait_seconds.value(alias=alias)
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options['concurrency']) as executor:
+            statuses = list(executor.map(lambda _: self.request(handler, options['path']), range(options['requests'])))
+        elapsed = time.perf_counter() - started
+        if any(status >= 400 for status in statuses):
+            raise CommandError(f"{options['path']} returned {sorted(set(statuses))}")
+
+        opened = connections_opened.value(alias=alias, source='new') + connections_opened.value(alias=alias, source='pool') - opened
+        return {
+            'requests_per_second': round(options['requests'] / elapsed, 1),
+            'mean_ms': round(elapsed * 1000 / options['requests'] * options['concurrency'], 3),
+            'connections_opened': opened,
+            'connections_reused': connections_reused.value(alias=alias) - reused,
+            'mean_wait_ms': round((connection_wait_seconds.value(alias=alias) - waited) * 1000 / max(opened, 1), 3),
+        }
+
+    def request(self, handler, path):
+        environ = {
+            'REQUEST_METHOD': 'GET',
+            'PATH_INFO': path,
+            'QUERY_STRING': '',
+            'SERVER_NAME': '127.0.0.1',
+            'REMOTE_ADDR': '127.0.0.1',
+            'SERVER_PORT': '80',
+            'SERVER_PROTOCOL': 'HTTP/1.1',
+            'wsgi.url_scheme': 'http',
+            'wsgi.input': io.BytesIO(),
+            'wsgi.errors': io.StringIO(),
+            'HTTP_AUTHORIZATION': self.authorization,
+        }
+        status = []
+        response = handler(environ, lambda code, headers, exc_info=None: status.append(int(code.split()[0])))
+        try:
+            for _ in response:
+                pass
+        finally:
+            # Sends request_finished, which closes connections that should not be kept.
+            response.close()
+        return status[0]
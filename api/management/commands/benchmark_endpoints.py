@@ -0,0 +1,184 @@
+import json
+import re
+import subprocess
+import time
+import tracemalloc
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import override_settings
+from api.synthetic import EMAIL_DOMAIN, STAFF_EMAIL
+from food_item.models import FoodItem, Reviews
+from orders.models import Order, OrderItem
+from users.models import User
+from users.serializers import TokenObtainPairSerializer
+
+QUERIES = re.compile(r'db;[^,]*desc="(\d+) queries"')
+
+
+class Command(BaseCommand):
+    help = (
+        "Run the API endpoints through the test client against the current database (fill it with "
+        "generate_synthetic_data first) and report throughput, latency percentiles, query counts and "
+        "peak memory as JSON. Checkout creates real orders, so use a benchmark database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=50, help="Measured requests per endpoint.")
+        parser.add_argument('--max-seconds', type=float, default=30, help="Stop measuring an endpoint after this long.")
+        parser.add_argument('--only', help="Comma separated endpoint names to run.")
+        parser.add_argument('--skip', help="Comma separated endpoint names to skip.")
+        parser.add_argument('--output', help="Also write the results to this file.")
+        parser.add_argument('--compare', help="Results file of an earlier run to compare with.")
+        parser.add_argument('--use-replicas', action='store_true', help="Keep routing reads to the configured replicas.")
+
+    def handle(self, *args, **options):
+        customer = User.objects.filter(email__endswith=f'@{EMAIL_DOMAIN}', is_staff=False, orders__isnull=False).first()
+        staff = User.objects.filter(email=STAFF_EMAIL).first()
+        food_item = FoodItem.objects.filter(reviews__isnull=False).first()
+        if customer is None or staff is None or food_item is None:
+            raise CommandError("No synthetic data found. Run generate_synthetic_data first.")
+        order = Order.objects.filter(user=customer).first()
+
+        self.clients = {'customer': self.client_for(customer), 'staff': self.client_for(staff)}
+        endpoints = self.endpoints(food_item, order)
+        if options['only']:
+            endpoints = {name: endpoint for name, endpoint in endpoints.items() if name in options['only'].split(',')}
+        if options['skip']:
+            endpoints = {name: endpoint for name, endpoint in endpoints.items() if name not in options['skip'].split(',')}
+
+        results = {
+            'commit': self.commit(),
+            'database': connection.vendor,
+            'dataset': {
+                'food_items': FoodItem.objects.count(),
+                'reviews': Reviews.objects.count(),
+                'orders': Order.objects.count(),
+                'order_lines': OrderItem.objects.count(),
+            },
+            'endpoints': {},
+        }
+        # Throttling state lives in the cache, so a dummy cache keeps the runs from being rate limited.
+        # The data is generated on the primary, so reads stay there unless the replicas are kept.
+        # Query counts come from the Server-Timing header, which covers every database.
+        overrides = {
+            'DEBUG': False,
+            'CACHES': {'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}},
+            'PERFORMANCE': {**getattr(settings, 'PERFORMANCE', {}), 'SERVER_TIMING': True, 'SAMPLE_RATE': 0},
+        }
+        if not options['use_replicas']:
+            overrides['DATABASE_REPLICAS'] = {**getattr(settings, 'DATABASE_REPLICAS', {}), 'ALIASES': []}
+        with override_settings(**overrides):
+            for name, endpoint in endpoints.items():
+                results['endpoints'][name] = self.measure(endpoint, options)
+
+        output = json.dumps(results, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as file:
+                file.write(output)
+        self.stdout.write(output)
+        if options['compare']:
+            self.compare(results, options['compare'])
+
+    def endpoints(self, food_item, order):
+        """
+        Endpoint name -> function making one request (or one flow of requests) and returning the responses.
+        """
+        get = lambda role, path: lambda: [self.clients[role].get(path)]
+        return {
+            'food_items.list': get('customer', '/api/v1/food_items/'),
+            'food_items.search': get('customer', '/api/v1/food_items/?search=Chicken'),
+            'food_items.category': get('customer', f'/api/v1/food_items/?category={food_item.category_id}'),
+            'food_items.detail': get('customer', f'/api/v1/food_items/{food_item.id}/'),
+            'reviews.list': get('customer', f'/api/v1/food_items/{food_item.id}/reviews/'),
+            'special_foods.list': get('customer', '/api/v1/special_foods/'),
+            'categories.list': get('staff', '/api/v1/categories/'),
+            'carts.list': get('customer', '/api/v1/carts/'),
+            'orders.list': get('customer', '/api/v1/orders/'),
+            'orders.detail': get('customer', f'/api/v1/orders/{order.id}/'),
+            'orders.list_staff': get('staff', '/api/v1/orders/'),
+            'reports.revenue': get('staff', '/api/v1/reports/revenue/'),
+            'reports.statuses': get('staff', '/api/v1/reports/statuses/'),
+            'reports.food_items': get('staff', '/api/v1/reports/food-items/'),
+            'reports.categories': get('staff', '/api/v1/reports/categories/'),
+            'kitchen.queue': get('staff', '/api/v1/kitchen/'),
+            'checkout': lambda: self.checkout(food_item),
+        }
+
+    def checkout(self, food_item):
+        client = self.clients['customer']
+        cart = client.post('/api/v1/carts/')
+        responses = [cart]
+        if cart.status_code == 201:
+            responses.append(client.post(f"/api/v1/carts/{cart.json()['id']}/items/", {'food_item': food_item.id, 'quantity': 1}, content_type='application/json'))
+            responses.append(client.post('/api/v1/orders/', {'cart_id': cart.json()['id']}, content_type='application/json'))
+        return responses
+
+    def measure(self, request, options):
+        responses = request()
+        statuses = sorted({response.status_code for response in responses})
+        if statuses[-1] >= 400:
+            return {'error': f"status {statuses}"}
+
+        latencies = []
+        started = time.perf_counter()
+        while len(latencies) < options['requests'] and time.perf_counter() - started < options['max_seconds']:
+            request_started = time.perf_counter()
+            request()
+            latencies.append(time.perf_counter() - request_started)
+        elapsed = time.perf_counter() - started
+
+        tracemalloc.start()
+        request()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        latencies.sort()
+        return {
+            'requests': len(latencies),
+            'requests_per_second': round(len(latencies) / elapsed, 1),
+            'p50_ms': self.percentile_ms(latencies, 50),
+            'p95_ms': self.percentile_ms(latencies, 95),
+            'p99_ms': self.percentile_ms(latencies, 99),
+            'max_ms': round(latencies[-1] * 1000, 2),
+            'queries': sum(self.queries(response) for response in responses),
+            'response_bytes': sum(len(response.content) for response in responses),
+            'peak_memory_kb': round(peak / 1024, 1),
+        }
+
+    def queries(self, response):
+        match = QUERIES.search(response.get('Server-Timing', ''))
+        return int(match.group(1)) if match else 0
+
+    def percentile_ms(self, latencies, percentile):
+        index = min(len(latencies) - 1, round(percentile / 100 * (len(latencies) - 1)))
+        return round(latencies[index] * 1000, 2)
+
+    def compare(self, results, path):
+        with open(path) as file:
+            baseline = json.load(file)
+        self.stdout.write(f"\nCompared with {baseline.get('commit') or path}:")
+        for name, result in results['endpoints'].items():
+            before = baseline['endpoints'].get(name)
+            if not before or 'p50_ms' not in before or 'p50_ms' not in result:
+                continue
+            change = (result['p50_ms'] - before['p50_ms']) / before['p50_ms'] * 100 if before['p50_ms'] else 0
+            self.stdout.write(
+                f"{name:24} p50 {before['p50_ms']:>9} -> {result['p50_ms']:>9} ms ({change:+.0f}%)"
+                f"  queries {before['queries']} -> {result['queries']}"
+            )
+
+    def client_for(self, user):
+        token = TokenObtainPairSerializer.get_token(user).access_token
+        # Server errors are reported as an endpoint result instead of stopping the run.
+        return Client(
+            raise_request_exception=False,
+            HTTP_HOST=settings.ALLOWED_HOSTS[-1].lstrip('.'), HTTP_AUTHORIZATION=f"JWT {token}"
+        )
+
+    def commit(self):
+        try:
+            return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, cwd=settings.BASE_DIR).stdout.strip() or None
+        except OSError:
+            return None
@@ -0,0 +1,80 @@
+import io
+import json
+import random
+import time
+from decimal import Decimal
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from api.parsers import ORJSONParser
+from api.renderers import ORJSONRenderer
+from food_item.models import Category, FoodItem
+from food_item.serializers import FoodItemSerializer
+from orders.models import Order, OrderItem
+from orders.serializers import OrderSerializer
+from users.models import User
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare JSONRenderer/JSONParser with the orjson versions on OrderSerializer and "
+        "FoodItemSerializer list payloads. The sample rows are rolled back afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--orders', type=int, default=200, help="Orders in the order list payload.")
+        parser.add_argument('--food-items', type=int, default=200, help="Food items in the menu payload.")
+        parser.add_argument('--repeat', type=int, default=50, help="Renders per measurement.")
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            payloads = self.payloads(random.Random(options['seed']), options)
+            transaction.set_rollback(True)
+
+        results = {}
+        for name, data in payloads.items():
+            rendered = JSONRenderer().render(data)
+            if ORJSONRenderer().render(data) != rendered:
+                raise CommandError(f"ORJSONRenderer output differs from JSONRenderer for {name}")
+            results[name] = {
+                'bytes': len(rendered),
+                'render_json_ms': self.per_call_ms(lambda: JSONRenderer().render(data), options['repeat']),
+                'render_orjson_ms': self.per_call_ms(lambda: ORJSONRenderer().render(data), options['repeat']),
+                'parse_json_ms': self.per_call_ms(lambda: JSONParser().parse(io.BytesIO(rendered)), options['repeat']),
+                'parse_orjson_ms': self.per_call_ms(lambda: ORJSONParser().parse(io.BytesIO(rendered)), options['repeat']),
+            }
+            results[name]['render_speedup'] = round(results[name]['render_json_ms'] / results[name]['render_orjson_ms'], 1)
+        self.stdout.write(json.dumps(results, indent=2))
+
+    def payloads(self, rng, options):
+        category = Category.objects.create(name='Benchmark', details='Benchmark category')
+        food_items = FoodItem.objects.bulk_create([
+            FoodItem(
+                name=f"Food item {i}", category=category, description="Slow cooked, served with rice and salad. " * 3,
+                price=Decimal(rng.randint(100, 2500)) / 100, image=f"food_{i}.jpg", is_special=i % 10 == 0
+            )
+            for i in range(options['food_items'])
+        ])
+        user = User.objects.create_user(email='json-benchmark@example.com')
+        orders = Order.objects.bulk_create([
+            Order(user=user, address="12 Example Street, Dhaka", total_price=Decimal(0)) for _ in range(options['orders'])
+        ])
+        lines = []
+        for order in orders:
+            for food_item in rng.sample(food_items, min(3, len(food_items))):
+                quantity = rng.randint(1, 4)
+                lines.append(OrderItem(order=order, food_item=food_item, quantity=quantity, price=food_item.price, total_price=food_item.price * quantity))
+        OrderItem.objects.bulk_create(lines)
+
+        return {
+            'food_items': FoodItemSerializer(FoodItem.objects.select_related('category').filter(category=category), many=True).data,
+            'orders': OrderSerializer(Order.objects.filter(user=user).prefetch_related('items__food_item'), many=True).data,
+        }
+
+    def per_call_ms(self, func, repeat):
+        started = time.perf_counter()
+        for _ in range(repeat):
+            func()
+        return round((time.perf_counter() - started) * 1000 / repeat, 3)
@@ -0,0 +1,73 @@
+import io
+import json
+import time
+from django.conf import settings
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand
+from django.http import HttpResponse
+from django.test.utils import override_settings
+from django.urls import path
+
+
+def ping(request):
+    return HttpResponse(b'{}', content_type='application/json')
+
+
+# A view that does nothing, so the timings are the middleware's.
+urlpatterns = [
+    path('api/v1/ping/', ping),
+    path('admin-ping/', ping),
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure the per-request time spent in middleware with every middleware in MIDDLEWARE "
+        "(as before ScopedMiddleware) and with the scoped stack, for an API path and a non-API path."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=5000, help="Requests per measurement.")
+        parser.add_argument('--repeat', type=int, default=3, help="Measurements per case; the fastest is reported.")
+
+    def handle(self, *args, **options):
+        scoped = list(settings.MIDDLEWARE)
+        index = scoped.index('nomino.middleware.ScopedMiddleware')
+        flat = scoped[:index] + list(settings.SCOPED_MIDDLEWARE['MIDDLEWARE']) + scoped[index + 1:]
+
+        results = {'requests': options['requests']}
+        for name, middleware in (('flat', flat), ('scoped', scoped)):
+            with override_settings(MIDDLEWARE=middleware, ROOT_URLCONF=__name__, DEBUG=False):
+                handler = WSGIHandler()
+                results[name] = {
+                    'api_us': self.measure(handler, '/api/v1/ping/', options),
+                    'other_us': self.measure(handler, '/admin-ping/', options),
+                }
+        results['api_saved_us'] = round(results['flat']['api_us'] - results['scoped']['api_us'], 1)
+        self.stdout.write(json.dumps(results, indent=2))
+
+    def measure(self, handler, path, options):
+        best = None
+        for _ in range(options['repeat']):
+            started = time.perf_counter()
+            for _ in range(options['requests']):
+                self.request(handler, path)
+            elapsed = (time.perf_counter() - started) / options['requests']
+            best = elapsed if best is None else min(best, elapsed)
+        return round(best * 1_000_000, 1)
+
+    def request(self, handler, path):
+        environ = {
+            'REQUEST_METHOD': 'GET',
+            'PATH_INFO': path,
+            'QUERY_STRING': '',
+            'SERVER_NAME': '127.0.0.1',
+            'REMOTE_ADDR': '127.0.0.1',
+            'SERVER_PORT': '80',
+            'SERVER_PROTOCOL': 'HTTP/1.1',
+            'wsgi.url_scheme': 'http',
+            'wsgi.input': io.BytesIO(),
+            'wsgi.errors': io.StringIO(),
+        }
+        response = handler(environ, lambda status, headers, exc_info=None: None)
+        response.close()
@@ -0,0 +1,132 @@
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+from collections import Counter
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Runs in a new interpreter: load the WSGI application the way the server does, then send it requests.
+CHILD = """
+import io, json, sys, time
+started = time.perf_counter()
+from django.conf import settings
+settings.INSTALLED_APPS
+settings_loaded = time.perf_counter()
+from django.utils.module_loading import import_string
+app = import_string(settings.WSGI_APPLICATION)
+app_loaded = time.perf_counter()
+
+def request(path, authorization):
+    environ = {
+        'REQUEST_METHOD': 'GET', 'PATH_INFO': path, 'QUERY_STRING': '', 'SERVER_NAME': '127.0.0.1',
+        'REMOTE_ADDR': '127.0.0.1', 'SERVER_PORT': '80', 'SERVER_PROTOCOL': 'HTTP/1.1',
+        'wsgi.url_scheme': 'http', 'wsgi.input': io.BytesIO(), 'wsgi.errors': io.StringIO(),
+    }
+    if authorization:
+        environ['HTTP_AUTHORIZATION'] = authorization
+    status = []
+    response = app(environ, lambda code, headers, exc_info=None: status.append(int(code.split()[0])))
+    b''.join(response)
+    response.close()
+    return status[0]
+
+status = request(sys.argv[1], sys.argv[2])
+first_response = time.perf_counter()
+request(sys.argv[1], sys.argv[2])
+second_response = time.perf_counter()
+print(json.dumps({
+    'status': status,
+    'settings_ms': (settings_loaded - started) * 1000,
+    'application_ms': (app_loaded - settings_loaded) * 1000,
+    'first_response_ms': (first_response - app_loaded) * 1000,
+    'second_response_ms': (second_response - first_response) * 1000,
+    'time_to_first_response_ms': (first_response - started) * 1000,
+    'modules': len(sys.modules),
+}))
+"""
+
+IMPORT_TIME = re.compile(r'import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)')
+
+
+class Command(BaseCommand):
+    help = (
+        "Start the WSGI application in a new process (python -X importtime) and report the "
+        "time to load it and to answer the first request, and the import time per package and module."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--path', default='/api/v1/food_items/', help="Path of the first request.")
+        parser.add_argument(
+            '--user', metavar='EMAIL',
+            help="Send the requests with an access token for this user (default: the first active user)."
+        )
+        parser.add_argument('--anonymous', action='store_true', help="Send the requests without a token.")
+        parser.add_argument('--runs', type=int, default=5, help="Cold starts to measure; the median is reported.")
+        parser.add_argument('--top', type=int, default=20, help="Slowest packages and modules to list.")
+        parser.add_argument(
+            '--env', action='append', default=[], metavar='KEY=VALUE',
+            help="Environment for the started process, e.g. --env debug=False --env startup_warm_up=False."
+        )
+
+    def handle(self, *args, **options):
+        env = {**os.environ, 'DJANGO_SETTINGS_MODULE': os.environ.get('DJANGO_SETTINGS_MODULE', settings.SETTINGS_MODULE)}
+        for item in options['env']:
+            key, _, value = item.partition('=')
+            env[key] = value
+
+        authorization = '' if options['anonymous'] else self.authorization(options['user'])
+
+        runs, import_times = [], None
+        for _ in range(options['runs']):
+            process = subprocess.run(
+                [sys.executable, '-X', 'importtime', '-c', CHILD, options['path'], authorization],
+                capture_output=True, text=True, env=env, cwd=settings.BASE_DIR
+            )
+            if process.returncode:
+                raise CommandError(process.stderr[-2000:])
+            runs.append(json.loads(process.stdout.strip().splitlines()[-1]))
+            if import_times is None:
+                import_times = [IMPORT_TIME.match(line).groups() for line in process.stderr.splitlines() if IMPORT_TIME.match(line)]
+
+        packages = Counter()
+        for self_us, _, _, module in import_times:
+            packages[module.split('.')[0]] += int(self_us)
+        modules = sorted(import_times, key=lambda row: int(row[1]), reverse=True)
+
+        results = {
+            'path': options['path'],
+            'status': runs[0]['status'],
+            'authenticated': bool(authorization),
+            'runs': len(runs),
+            'env': options['env'],
+            **{
+                key: round(statistics.median(run[key] for run in runs), 1)
+                for key in ('settings_ms', 'application_ms', 'first_response_ms', 'second_response_ms', 'time_to_first_response_ms')
+            },
+            'modules_loaded': runs[0]['modules'],
+            'import_ms_by_package': {name: round(us / 1000, 1) for name, us in packages.most_common(options['top'])},
+            'slowest_imports_ms': {module: round(int(cumulative_us) / 1000, 1) for _, cumulative_us, _, module in modules[:options['top']]},
+        }
+        self.stdout.write(json.dumps(results, indent=2))
+        if results['status'] >= 400:
+            self.stderr.write(f"{options['path']} returned {results['status']}; the timings are for an error response.")
+
+    def authorization(self, email):
+        """
+        Authorization header with a new access token for ``email``, or for the first
+        active user. The menu and order endpoints only answer authenticated requests.
+        """
+        from django.contrib.auth import get_user_model
+        from rest_framework_simplejwt.settings import api_settings
+        from rest_framework_simplejwt.tokens import AccessToken
+
+        users = get_user_model().objects.filter(is_active=True)
+        user = users.filter(email=email).first() if email else users.order_by('pk').first()
+        if user is None:
+            raise CommandError(
+                f"No active user {email}." if email else "No active user to authenticate as; create one or pass --anonymous."
+            )
+        return f'{api_settings.AUTH_HEADER_TYPES[0]} {AccessToken.for_user(user)}'
@@ -0,0 +1,29 @@
+import hashlib
+from pathlib import Path
+from django.core.management.base import BaseCommand, CommandError
+from nomino.docs import generate_schema, schema_path
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate the OpenAPI document once, at deploy time, into the file the docs views serve "
+        "(API_SCHEMA['PATH']), so docs requests don't introspect the API."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', help="Write the document here instead of API_SCHEMA['PATH'].")
+        parser.add_argument('--check', action='store_true', help="Fail if the existing file is out of date instead of writing it.")
+
+    def handle(self, *args, **options):
+        path = Path(options['output']) if options['output'] else schema_path()
+        content = generate_schema()
+        if options['check']:
+            if not path.exists() or path.read_bytes() != content:
+                raise CommandError(f"{path} is out of date. Run `manage.py generate_schema`.")
+            self.stdout.write(f"{path} is up to date.")
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(content)
+        self.stdout.write(self.style.SUCCESS(
+            f"Wrote {path} ({len(content)} bytes, sha256 {hashlib.sha256(content).hexdigest()[:12]})."
+        ))
@@ -0,0 +1,53 @@
+import json
+import time
+from django.core.management.base import BaseCommand, CommandError
+from analytics.services import AnalyticsServices
+from api.synthetic import SyntheticData
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate categories, food items, users, reviews and orders for benchmarks with bulk inserts. "
+        "e.g. --food-items 100000 --reviews 1000000 --orders 1700000 for about 5M order lines."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--categories', type=int, default=20)
+        parser.add_argument('--food-items', type=int, default=1000)
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--reviews', type=int, default=10000)
+        parser.add_argument('--orders', type=int, default=10000)
+        parser.add_argument('--lines-per-order', type=int, default=3, help="Average order lines per order.")
+        parser.add_argument('--days', type=int, default=90, help="Spread the orders over this many past days.")
+        parser.add_argument('--batch-size', type=int, default=5000, help="Rows per bulk insert.")
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--clear', action='store_true', help="Delete previously generated rows first.")
+        parser.add_argument('--no-rollups', action='store_true', help="Don't rebuild the analytics rollups afterwards.")
+
+    def handle(self, *args, **options):
+        if options['lines_per_order'] < 1 or options['batch_size'] < 1:
+            raise CommandError("--lines-per-order and --batch-size must be positive.")
+        data = SyntheticData(seed=options['seed'], batch_size=options['batch_size'])
+        results = {}
+
+        if options['clear']:
+            results['clear'] = self.timed(data.clear)
+        results['categories'] = self.timed(data.categories, options['categories'])
+        results['food_items'] = self.timed(data.food_items, options['food_items'])
+        results['users'] = self.timed(data.users, options['users'])
+        if options['reviews']:
+            results['reviews'] = self.timed(data.reviews, options['reviews'])
+        if options['orders']:
+            results['order_lines'] = self.timed(data.orders, options['orders'], options['lines_per_order'], options['days'])
+            if not options['no_rollups']:
+                results['rollups'] = self.timed(AnalyticsServices.rebuild)
+        self.stdout.write(json.dumps(results, indent=2))
+
+    def timed(self, func, *args):
+        started = time.perf_counter()
+        rows = func(*args)
+        elapsed = time.perf_counter() - started
+        result = {'seconds': round(elapsed, 2)}
+        if isinstance(rows, int):
+            result.update(rows=rows, rows_per_second=round(rows / elapsed) if elapsed else None)
+        return result
@@ -0,0 +1,31 @@
+import io
+import re
+import orjson
+from rest_framework.parsers import JSONParser
+from api.renderers import ORJSONRenderer
+
+# orjson reads integers outside the 64-bit range as floats; those need at least 19 digits.
+LONG_DIGITS = re.compile(rb'\d{19}')
+
+
+class ORJSONParser(JSONParser):
+    """
+    JSONParser using orjson for UTF-8 request bodies. Anything orjson rejects is handed
+    to JSONParser, so invalid bodies get the same errors as before, and so are bodies with
+    19 or more digits in a row, which may hold integers orjson can't read exactly.
+    """
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', 'utf-8')
+        if not self.strict or encoding.lower().replace('_', '-') not in ('utf-8', 'utf8'):
+            return super().parse(stream, media_type, parser_context)
+
+        body = stream.read()
+        if LONG_DIGITS.search(body):
+            return super().parse(io.BytesIO(body), media_type, parser_context)
+        try:
+            return orjson.loads(body)
+        except orjson.JSONDecodeError:
+            return super().parse(io.BytesIO(body), media_type, parser_context)
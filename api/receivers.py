@@ -0,0 +1,12 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from api.home import invalidate_menu_sections
+from food_item.models import Category, FoodItem
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=FoodItem)
+@receiver(post_delete, sender=FoodItem)
+def invalidate_home_menu(sender, instance, **kwargs):
+    invalidate_menu_sections()
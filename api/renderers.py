@@ -0,0 +1,56 @@
+import math
+import orjson
+from rest_framework.renderers import JSONRenderer
+
+
+def has_non_finite_float(data):
+    """
+    Whether ``data`` (dicts, lists and tuples of JSON values) holds a NaN or infinite float,
+    which orjson would write as null.
+    """
+    stack = [data]
+    while stack:
+        value = stack.pop()
+        kind = type(value)
+        if kind is float:
+            if not math.isfinite(value):
+                return True
+        elif isinstance(value, dict):
+            stack.extend(value.values())
+        elif kind is list or kind is tuple:
+            stack.extend(value)
+    return False
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer producing the same bytes with orjson.
+
+    Values orjson has no native encoding for (Decimal, lazy strings, querysets, ...) and
+    datetimes go through DRF's JSONEncoder, so e.g. UTC datetimes still end in ``Z``.
+    Indented output (the browsable API, ``; indent=`` media types), the non-default
+    UNICODE_JSON / COMPACT_JSON settings and data holding NaN or Infinity (which
+    JSONRenderer refuses) are rendered by the stdlib implementation.
+    """
+    options = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        renderer_context = renderer_context or {}
+        if self.ensure_ascii or not self.compact or self.get_indent(accepted_media_type, renderer_context) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+        if self.strict and has_non_finite_float(data):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=self.encoder_class().default, option=self.options)
+        except TypeError:
+            # Integers over 64 bits and other values orjson rejects.
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Keep the output a strict javascript subset, like JSONRenderer.
+        if b'\xe2\x80' in ret:
+            ret = ret.replace('\u2028'.encode(), b'\\u2028').replace('\u2029'.encode(), b'\\u2029')
+        return ret
@@ -0,0 +1,59 @@
+from rest_framework import serializers
+from api import batch
+from food_item.models import Category
+from food_item.serializers import FoodItemSerializer, SpecialFoodItemSerializer
+from orders.models import Order
+from orders.serializers import CartSerializer
+
+
+class HomeCategorySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Category
+        fields = ['id','name']
+
+
+class LatestOrderSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Order
+        fields = ['id','status','total_price','created_at','updated_at']
+
+
+class HomeSerializer(serializers.Serializer):
+    """
+    Documents the home screen response; sections that failed to load are null and listed in ``unavailable``.
+    """
+    categories = HomeCategorySerializer(many=True, allow_null=True)
+    specials = SpecialFoodItemSerializer(many=True, allow_null=True)
+    bestsellers = FoodItemSerializer(many=True, allow_null=True)
+    cart = CartSerializer(allow_null=True)
+    latest_order = LatestOrderSerializer(allow_null=True)
+    unavailable = serializers.ListField(child=serializers.CharField())
+
+
+class SubRequestSerializer(serializers.Serializer):
+    method = serializers.ChoiceField(choices=['GET','POST','PUT','PATCH','DELETE'], default='GET')
+    path = serializers.CharField(help_text="Path of an API endpoint, with its query string, e.g. /api/v1/food_items/?page=2")
+    body = serializers.JSONField(required=False, allow_null=True)
+
+    def validate_path(self, path):
+        prefix = batch.get_setting('PATH_PREFIX')
+        if not path.startswith(prefix):
+            raise serializers.ValidationError(f"Only paths under {prefix} can be batched.")
+        return path
+
+
+class BatchSerializer(serializers.Serializer):
+    requests = SubRequestSerializer(many=True, allow_empty=False)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fields['requests'].max_length = batch.get_setting('MAX_REQUESTS')
+
+
+class SubResponseSerializer(serializers.Serializer):
+    status = serializers.IntegerField()
+    body = serializers.JSONField(allow_null=True)
+
+
+class BatchResponseSerializer(serializers.Serializer):
+    responses = SubResponseSerializer(many=True)
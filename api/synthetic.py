@@ -0,0 +1,145 @@
+import random
+from datetime import timedelta
+from decimal import Decimal
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.utils import timezone
+from food_item.models import Category, FoodItem, Reviews
+from nomino.uuids import uuid7_at
+from orders.models import Cart, Order, OrderItem
+from users.models import User
+
+EMAIL_DOMAIN = 'synthetic.nomino.test'
+STAFF_EMAIL = f'staff@{EMAIL_DOMAIN}'
+CATEGORY_PREFIX = 'Synthetic'
+
+WORDS = [
+    'Chicken', 'Beef', 'Mutton', 'Fish', 'Prawn', 'Vegetable', 'Egg', 'Paneer', 'Spicy', 'Grilled',
+    'Fried', 'Curry', 'Biryani', 'Kebab', 'Soup', 'Salad', 'Noodles', 'Rice', 'Burger', 'Pizza',
+]
+STATUS_WEIGHTS = {Order.DELIVERED: 70, Order.CANCELED: 10, Order.CONFIRMED: 10, Order.PENDING: 10}
+
+
+class SyntheticData:
+    """
+    Fills the database with generated rows for benchmarks, in ``batch_size`` bulk inserts.
+    Generated users have an @synthetic.nomino.test email and generated categories a
+    "Synthetic" name prefix, so ``clear()`` can remove everything that was generated.
+    """
+    def __init__(self, seed=0, batch_size=5000):
+        self.rng = random.Random(seed)
+        self.batch_size = batch_size
+
+    def batches(self, total):
+        for start in range(0, total, self.batch_size):
+            yield range(start, min(start + self.batch_size, total))
+
+    def categories(self, count):
+        offset = Category.objects.filter(name__startswith=CATEGORY_PREFIX).count()
+        Category.objects.bulk_create([
+            Category(name=f"{CATEGORY_PREFIX} {offset + i}", details="Generated category") for i in range(count)
+        ])
+        return count
+
+    def food_items(self, count):
+        categories = list(Category.objects.filter(name__startswith=CATEGORY_PREFIX).values_list('id', flat=True))
+        for batch in self.batches(count):
+            FoodItem.objects.bulk_create([
+                FoodItem(
+                    name=f"{self.rng.choice(WORDS)} {self.rng.choice(WORDS)} {i}",
+                    category_id=self.rng.choice(categories),
+                    description=" ".join(self.rng.choices(WORDS, k=20)),
+                    price=Decimal(self.rng.randint(100, 2500)) / 100,
+                    image=f"synthetic/food_{i}.jpg",
+                    is_special=self.rng.random() < 0.05,
+                )
+                for i in batch
+            ])
+        return count
+
+    def users(self, count):
+        offset = User.objects.filter(email__endswith=f'@{EMAIL_DOMAIN}').count()
+        password = make_password(None)
+        User.objects.get_or_create(email=STAFF_EMAIL, defaults={'password': password, 'is_staff': True})
+        for batch in self.batches(count):
+            User.objects.bulk_create([
+                User(email=f"customer{offset + i}@{EMAIL_DOMAIN}", password=password, address=f"{i} Example Road, Dhaka")
+                for i in batch
+            ])
+        return count
+
+    def reviews(self, count):
+        users = self.synthetic_user_ids()
+        food_items = self.synthetic_food_item_ids()
+        for batch in self.batches(count):
+            Reviews.objects.bulk_create([
+                Reviews(
+                    user_id=self.rng.choice(users),
+                    food_item_id=self.rng.choice(food_items),
+                    ratings=self.rng.randint(1, 5),
+                    comment=" ".join(self.rng.choices(WORDS, k=12)),
+                )
+                for _ in batch
+            ])
+        return count
+
+    def orders(self, count, lines_per_order=3, days=90):
+        """
+        Create ``count`` orders with 1 to 2 * ``lines_per_order`` - 1 lines each (``lines_per_order``
+        on average), each dated at a random moment of the last ``days`` days.
+        Returns the number of order lines.
+        """
+        users = self.synthetic_user_ids()
+        prices = dict(FoodItem.objects.filter(category__name__startswith=CATEGORY_PREFIX).values_list('id', 'price'))
+        food_items = list(prices)
+        statuses, weights = zip(*STATUS_WEIGHTS.items())
+        today = timezone.now()
+        lines = 0
+
+        for batch in self.batches(count):
+            orders, order_items = [], []
+            # Sorted so each batch is inserted in id order, like orders placed over time.
+            moments = sorted(today - timedelta(seconds=self.rng.uniform(0, days * 86400)) for _ in batch)
+            for created_at in moments:
+                # Ids follow the backdated created_at, as rekey_uuid7 would have made them.
+                order = Order(
+                    id=uuid7_at(created_at), user_id=self.rng.choice(users), address="Generated address",
+                    status=self.rng.choices(statuses, weights)[0]
+                )
+                total = Decimal(0)
+                for food_item_id in self.rng.sample(food_items, min(self.rng.randint(1, 2 * lines_per_order - 1), len(food_items))):
+                    quantity = self.rng.randint(1, 4)
+                    order_items.append(OrderItem(
+                        order=order, food_item_id=food_item_id, quantity=quantity,
+                        price=prices[food_item_id], total_price=prices[food_item_id] * quantity
+                    ))
+                    total += prices[food_item_id] * quantity
+                order.total_price = total
+                orders.append(order)
+
+            with transaction.atomic():
+                Order.objects.bulk_create(orders)
+                OrderItem.objects.bulk_create(order_items)
+                # created_at is auto_now_add, so it can only be backdated after the insert.
+                for order, created_at in zip(orders, moments):
+                    order.created_at = order.updated_at = created_at
+                Order.objects.bulk_update(orders, ['created_at', 'updated_at'])
+            lines += len(order_items)
+        return lines
+
+    def clear(self):
+        users = User.objects.filter(email__endswith=f'@{EMAIL_DOMAIN}')
+        categories = Category.objects.filter(name__startswith=CATEGORY_PREFIX)
+        OrderItem.objects.filter(order__user__in=users).delete()
+        OrderItem.objects.filter(food_item__category__in=categories).delete()
+        Order.objects.filter(user__in=users).delete()
+        Reviews.objects.filter(user__in=users).delete()
+        Cart.objects.filter(user__in=users).delete()
+        users.delete()
+        categories.delete()
+
+    def synthetic_user_ids(self):
+        return list(User.objects.filter(email__endswith=f'@{EMAIL_DOMAIN}', is_staff=False).values_list('id', flat=True))
+
+    def synthetic_food_item_ids(self):
+        return list(FoodItem.objects.filter(category__name__startswith=CATEGORY_PREFIX).values_list('id', flat=True))
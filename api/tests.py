@@ -1,3 +1,717 @@
-from django.test import TestCase
+import datetime
+import gzip
+import io
+import json
+import tempfile
+import threading
+import time
+import unittest
+import uuid
+from collections import Counter
+from decimal import Decimal
+from pathlib import Path
+from unittest import mock
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection, connections
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLResolver, reverse
+from django.utils.functional import SimpleLazyObject
+from django.utils import timezone
+from rest_framework import serializers
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework.throttling import SimpleRateThrottle
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from analytics.services import AnalyticsServices
+from delivery.models import Address, DeliveryZone
+from api import batch, home, urls as api_urls
+from api.parsers import ORJSONParser
+from api.renderers import ORJSONRenderer
+from api.synthetic import SyntheticData
+from api.workers import DeadlineExceeded
+from api.throttling import AnonTokenBucketThrottle, ScopedTokenBucketThrottle, TokenBucketThrottle, throttle_decisions
+from food_item.models import Category, FoodItem, Reviews
+from nomino.backends.metrics import ConnectionMetricsMixin, connections_reused
+from nomino.db_router import ReplicaRouter, ReplicaRoutingMiddleware, primary_key
+from nomino.performance import PerformanceMiddleware, fingerprint, repeated_queries, request_phase_duration
+from nomino.admin import EstimatedCountPaginator
+from nomino.uuids import uuid7, uuid7_at, uuid7_floor, uuid7_time
+from nomino.docs import reset_schema_document
+from orders.kitchen import kitchen_queue
+from orders.models import Cart, CartItem, Order, OrderItem
+from users.models import User
 
 # Create your tests here.
+
+
+class PingView(APIView):
+    authentication_classes = []
+    throttle_classes = [AnonTokenBucketThrottle, ScopedTokenBucketThrottle]
+    throttle_scope = 'ping'
+
+    def get(self, request):
+        return Response({'ok': True})
+
+
+RATES = {'anon': '100/min', 'ping': '3/min'}
+
+
+class TokenBucketThrottleTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.now = 1_000_000.0
+        timer = mock.patch.object(SimpleRateThrottle, 'timer', lambda throttle: self.now)
+        rates = mock.patch.object(SimpleRateThrottle, 'THROTTLE_RATES', RATES)
+        timer.start()
+        rates.start()
+        self.addCleanup(timer.stop)
+        self.addCleanup(rates.stop)
+
+    def get(self):
+        return PingView.as_view()(APIRequestFactory().get('/ping/'))
+
+    def test_burst_then_refill(self):
+        self.assertEqual([self.get().status_code for _ in range(3)], [200, 200, 200])
+        throttled = self.get()
+        self.assertEqual(throttled.status_code, 429)
+        self.assertEqual(throttled['Retry-After'], '20')
+
+        # One token comes back every 20 seconds.
+        self.now += 20
+        self.assertEqual(self.get().status_code, 200)
+        self.assertEqual(self.get().status_code, 429)
+
+        self.now += 3600
+        self.assertEqual([self.get().status_code for _ in range(4)], [200, 200, 200, 429])
+
+    def test_denied_requests_do_not_extend_the_wait(self):
+        for _ in range(10):
+            self.get()
+        self.now += 20
+        self.assertEqual(self.get().status_code, 200)
+
+    def test_requests_at_the_limit(self):
+        calls = mock.Mock(wraps=cache)
+
+        def ping_calls():
+            # touch() extends the expiry once per bucket's worth of requests and is left out.
+            return [name for name, args, _ in calls.method_calls if args[0].startswith('throttle_ping_') and name != 'touch']
+
+        with mock.patch.object(TokenBucketThrottle, 'cache', calls):
+            self.assertEqual(self.get().status_code, 200)
+            self.assertEqual(ping_calls(), ['incr', 'add'])
+
+            calls.reset_mock()
+            self.assertEqual([self.get().status_code for _ in range(2)], [200, 200])
+            self.assertEqual(ping_calls(), ['incr', 'incr'])
+
+            calls.reset_mock()
+            self.assertEqual(self.get().status_code, 429)
+            self.assertEqual(ping_calls(), ['incr', 'decr'])
+
+        # The token taken by the denied request was given back: the next one is due in 20s, not 40s.
+        self.now += 19
+        self.assertEqual(self.get().status_code, 429)
+        self.now += 1
+        self.assertEqual(self.get().status_code, 200)
+
+    def test_decisions_are_counted(self):
+        before = throttle_decisions.value(scope='ping', decision='throttled')
+        for _ in range(5):
+            self.get()
+        self.assertEqual(throttle_decisions.value(scope='ping', decision='throttled') - before, 2)
+
+
+# Replica aliases configured for this run (nomino/settings.py names them replica1..N from
+# replica_hosts). Only a replica that isn't a TEST mirror of the primary misses its writes.
+REPLICA_ALIASES = [alias for alias in settings.DATABASES if alias != 'default']
+UNMIRRORED_REPLICAS = [alias for alias in REPLICA_ALIASES if not settings.DATABASES[alias].get('TEST', {}).get('MIRROR')]
+REPLICA = (REPLICA_ALIASES or ['replica1'])[0]
+
+
+@override_settings(DATABASE_REPLICAS={'ALIASES': [REPLICA], 'PATH_PREFIXES': ['/api/v1/food_items/'], 'STICKY_SECONDS': 15})
+class ReplicaRoutingTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(email='customer@example.com')
+
+    def route(self, method, path, user=None, status=200):
+        """
+        Pass a request through the middleware and return the database a read made by the view would use.
+        """
+        databases = []
+
+        def view(request):
+            # Like DRF after authentication.
+            request.user = AnonymousUser() if user is None else user
+            databases.append(ReplicaRouter().db_for_read(Category))
+            return HttpResponse(status=status)
+
+        ReplicaRoutingMiddleware(view)(getattr(RequestFactory(), method)(path))
+        return databases[0]
+
+    def test_safe_requests_on_listed_paths_read_from_replica(self):
+        self.assertEqual(self.route('get', '/api/v1/food_items/'), REPLICA)
+        self.assertEqual(self.route('get', '/api/v1/food_items/', self.user), REPLICA)
+        self.assertEqual(self.route('get', '/api/v1/carts/', self.user), 'default')
+        self.assertEqual(self.route('post', '/api/v1/food_items/', self.user), 'default')
+
+    def test_user_reads_from_primary_after_writing(self):
+        self.route('post', '/api/v1/carts/', self.user, status=400)
+        self.assertEqual(self.route('get', '/api/v1/food_items/', self.user), REPLICA)
+
+        self.route('post', '/api/v1/carts/', self.user, status=201)
+        self.assertEqual(self.route('get', '/api/v1/food_items/', self.user), 'default')
+        self.assertEqual(self.route('get', '/api/v1/food_items/'), REPLICA)
+
+    def test_unknown_user_reads_from_primary(self):
+        self.assertEqual(self.route('get', '/api/v1/food_items/', SimpleLazyObject(lambda: self.user)), 'default')
+
+
+@unittest.skipUnless(UNMIRRORED_REPLICAS, "Needs a replica alias that isn't a TEST mirror of 'default'.")
+@override_settings(DATABASE_REPLICAS={'ALIASES': UNMIRRORED_REPLICAS[:1], 'PATH_PREFIXES': ['/api/v1/food_items/'], 'STICKY_SECONDS': 15})
+class ReplicaDatabaseTests(TestCase):
+    """
+    Runs against a separate (not mirrored) replica database, e.g. a second SQLite file,
+    so rows written to the primary are missing from the replica.
+    """
+    # The runner sets up the databases of skipped tests too, so only name configured aliases.
+    databases = {'default', *REPLICA_ALIASES}
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user(email='customer@example.com'))
+        category = Category.objects.create(name='Soups', details='Hot soups')
+        FoodItem.objects.create(name='Chicken Soup', category=category, description='Soup', price='4.50', image='soup.jpg')
+
+    def test_reads_switch_to_primary_after_a_write(self):
+        self.assertEqual(self.client.get('/api/v1/food_items/').data['count'], 0)
+
+        self.assertEqual(self.client.post('/api/v1/carts/').status_code, 201)
+        self.assertEqual(self.client.get('/api/v1/food_items/').data['count'], 1)
+
+
+@unittest.skipUnless(isinstance(connections['default'], ConnectionMetricsMixin), "Needs a nomino.backends database engine.")
+class ConnectionMetricsTests(TestCase):
+
+    def test_reuse_is_counted_once_per_request(self):
+        before = connections_reused.value(alias=connection.alias)
+        # Django checks its connections when a request starts, ending the previous unit of work.
+        connection._reuse_counted = False
+
+        Category.objects.count()
+        Category.objects.count()
+        self.assertEqual(connections_reused.value(alias=connection.alias) - before, 1)
+
+
+class ORJSONTests(TestCase):
+    data = {
+        'id': uuid.UUID('0b0e8bb9-5a43-4b42-9b0c-4b8f0a3c2a11'),
+        'total_price': Decimal('12.50'),
+        'created_at': datetime.datetime(2025, 5, 1, 12, 30, 15, 250000, tzinfo=datetime.timezone.utc),
+        'date': datetime.date(2025, 5, 1),
+        'items': [{'name': 'Café\u2028special', 'quantity': 2, 'price': Decimal('4.25')}],
+        1: None,
+        'huge': 2 ** 70,
+    }
+
+    def test_renders_like_json_renderer(self):
+        for data in (self.data, {key: value for key, value in self.data.items() if key != 'huge'}, [], None):
+            self.assertEqual(ORJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_indented_output_uses_json_renderer(self):
+        rendered = ORJSONRenderer().render(self.data, 'application/json; indent=4')
+        self.assertEqual(rendered, JSONRenderer().render(self.data, 'application/json; indent=4'))
+
+    def test_parses_like_json_parser(self):
+        for body in (b'{"name": "Caf\xc3\xa9", "quantity": 2, "price": 4.25}', b'[1, -2.5e-3, true, null, "\\u2028"]'):
+            self.assertEqual(ORJSONParser().parse(io.BytesIO(body)), JSONParser().parse(io.BytesIO(body)))
+
+        for body in (b'{"price": NaN}', b'{"name": '):
+            with self.assertRaises(ParseError):
+                ORJSONParser().parse(io.BytesIO(body))
+
+    def test_big_integers_are_parsed_exactly(self):
+        for body in (b'{"id": 123456789012345678901234567890}', b'[18446744073709551616, -9223372036854775809]'):
+            parsed = ORJSONParser().parse(io.BytesIO(body))
+            self.assertEqual(parsed, JSONParser().parse(io.BytesIO(body)))
+            self.assertTrue(all(type(value) is int for value in (parsed.values() if isinstance(parsed, dict) else parsed)))
+
+    def test_non_finite_floats_fail_like_json_renderer(self):
+        for value in (float('nan'), float('inf'), -float('inf')):
+            data = {'items': [{'rating': value}]}
+            with self.assertRaisesMessage(ValueError, 'Out of range float values are not JSON compliant'):
+                JSONRenderer().render(data)
+            with self.assertRaisesMessage(ValueError, 'Out of range float values are not JSON compliant'):
+                ORJSONRenderer().render(data)
+
+
+@override_settings(PERFORMANCE={'SAMPLE_RATE': 1, 'SERVER_TIMING': True, 'REPEATED_QUERY_THRESHOLD': 5, 'METRICS_TOKEN': 'secret'})
+class PerformanceMiddlewareTests(TestCase):
+
+    def test_server_timing(self):
+        client = APIClient()
+        client.force_authenticate(User.objects.create_user(email='customer@example.com'))
+
+        timing = client.get('/api/v1/carts/')['Server-Timing']
+        self.assertEqual([metric.split(';')[0] for metric in timing.split(', ')], ['db', 'view', 'serialize', 'render', 'total'])
+        self.assertIn('desc="1 queries"', timing)
+
+    def test_serialization_is_timed_apart_from_the_view(self):
+        class SlowSerializer(serializers.Serializer):
+            name = serializers.SerializerMethodField()
+
+            def get_name(self, instance):
+                time.sleep(0.02)
+                return instance
+
+        class SlowView(APIView):
+            authentication_classes = []
+            permission_classes = []
+
+            def get(self, request):
+                return Response(SlowSerializer(['soup', 'rice'], many=True).data)
+
+        def handler(request):
+            middleware.process_view(request, SlowView.as_view(), (), {})
+            response = middleware.process_template_response(request, SlowView.as_view()(request))
+            return response.render()
+
+        middleware = PerformanceMiddleware(handler)
+        before = request_phase_duration.count(view='unmatched', method='GET', phase='serialize')
+        response = middleware(RequestFactory().get('/'))
+
+        timings = dict(metric.split(';dur=') for metric in response['Server-Timing'].split(', ') if 'desc=' not in metric)
+        self.assertGreaterEqual(float(timings['serialize']), 40)
+        self.assertLess(float(timings['view']), 40)
+        self.assertEqual(request_phase_duration.count(view='unmatched', method='GET', phase='serialize') - before, 1)
+
+    def test_repeated_queries_are_reported(self):
+        self.assertEqual(
+            fingerprint('SELECT * FROM "food_item_fooditem" WHERE "id" IN (%s, %s, %s) AND "name" = \'Soup\' LIMIT 21'),
+            'SELECT * FROM "food_item_fooditem" WHERE "id" IN (...) AND "name" = ? LIMIT ?',
+        )
+
+        def view(request):
+            for pk in range(6):
+                Category.objects.filter(pk=pk).exists()
+            return HttpResponse()
+
+        before = repeated_queries.value(view='unmatched')
+        with self.assertLogs('nomino.performance', 'WARNING') as logs:
+            PerformanceMiddleware(view)(RequestFactory().get('/'))
+        self.assertIn('ran the same query 6 times', logs.output[0])
+        self.assertEqual(repeated_queries.value(view='unmatched') - before, 1)
+
+    def test_metrics_need_the_token(self):
+        self.client.get('/api/v1/')
+        self.assertEqual(self.client.get('/metrics/').status_code, 403)
+
+        response = self.client.get('/metrics/', HTTP_AUTHORIZATION='Bearer secret')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('nomino_request_duration_seconds_bucket{view="api-root",method="GET",le="+Inf"}', response.content.decode())
+
+
+class APISchemaTests(TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = Path(directory.name) / 'openapi.json'
+        schema_settings = override_settings(API_SCHEMA={'PATH': self.path, 'MAX_AGE': 300})
+        schema_settings.enable()
+        self.addCleanup(schema_settings.disable)
+        reset_schema_document()
+        self.addCleanup(reset_schema_document)
+
+    def test_serves_the_prebuilt_document(self):
+        call_command('generate_schema', stdout=io.StringIO())
+        call_command('generate_schema', '--check', stdout=io.StringIO())
+
+        with mock.patch('nomino.docs.generate_schema') as generate:
+            response = self.client.get('/swagger/?format=openapi', HTTP_ACCEPT_ENCODING='gzip, br')
+            self.assertEqual(self.client.get('/swagger/').status_code, 200)
+            self.assertEqual(self.client.get('/redoc/').status_code, 200)
+        generate.assert_not_called()
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(response.content), self.path.read_bytes())
+        self.assertIn('/food_items/', json.loads(self.path.read_bytes())['paths'])
+
+        not_modified = self.client.get('/openapi.json', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(not_modified.status_code, 304)
+
+    def test_generates_once_without_a_prebuilt_document(self):
+        with self.assertLogs('nomino.docs', 'WARNING'):
+            first = self.client.get('/openapi.json')
+        with mock.patch('nomino.docs.generate_schema') as generate:
+            second = self.client.get('/redoc/?format=openapi')
+        generate.assert_not_called()
+        self.assertEqual(first.content, second.content)
+        self.assertEqual(first['ETag'], second['ETag'])
+
+
+class DeployedSchemaTests(TestCase):
+
+    def test_committed_document_is_up_to_date(self):
+        # Vercel deploys the committed openapi.json; regenerate it when the API changes.
+        call_command('generate_schema', '--check', stdout=io.StringIO())
+
+
+class ScopedMiddlewareTests(TestCase):
+
+    def test_api_requests_skip_sessions_and_csrf(self):
+        client = APIClient()
+        client.force_authenticate(User.objects.create_user(email='customer@example.com'))
+        response = client.get('/api/v1/carts/')
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(hasattr(response.wsgi_request, 'session'))
+        self.assertNotIn('X-Frame-Options', response)
+
+        self.assertEqual(self.client.get('/api/v1/food_items/', HTTP_ACCEPT='text/html').status_code, 401)
+
+    def test_admin_runs_the_full_stack(self):
+        client = self.client_class(enforce_csrf_checks=True)
+        response = client.get('/admin/login/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['X-Frame-Options'], 'DENY')
+        self.assertIn('csrftoken', response.cookies)
+
+        self.assertEqual(client.post('/admin/login/', {'username': 'a', 'password': 'b'}).status_code, 403)
+        response = client.post('/admin/login/', {
+            'username': 'a', 'password': 'b', 'csrfmiddlewaretoken': response.cookies['csrftoken'].value,
+        })
+        self.assertEqual(response.status_code, 200)
+
+
+QUERY_BUDGETS = Path(__file__).with_name('query_budgets.json')
+
+
+def api_route_names(patterns=None):
+    """
+    Names of the routes in api/urls.py, including the nested and included ones.
+    """
+    names = set()
+    for pattern in api_urls.urlpatterns if patterns is None else patterns:
+        if isinstance(pattern, URLResolver):
+            names |= api_route_names(pattern.url_patterns)
+        elif pattern.name:
+            names.add(pattern.name)
+    return names
+
+
+class QueryBudgetData:
+    """
+    Data the API routes return, grown in steps so query counts can be compared at two sizes.
+    """
+    def __init__(self):
+        self.size = 0
+        self.customer = User.objects.create_user(email='customer@example.com')
+        self.staff = User.objects.create_user(email='staff@example.com', is_staff=True)
+        self.category = Category.objects.create(name='Soups', details='Hot soups')
+        self.food_item = self.add_food_item(is_special=True)
+        self.special_food = self.food_item
+        self.cart = Cart.objects.create(user=self.customer)
+        self.cart_item = CartItem.objects.create(cart=self.cart, food_item=self.food_item, quantity=1)
+        self.review = Reviews.objects.create(user=self.customer, food_item=self.food_item, ratings=5, comment='Good')
+        self.zone = DeliveryZone.objects.create(name='Dhanmondi', boundary=[[90.36, 23.73], [90.40, 23.73], [90.40, 23.77], [90.36, 23.77]])
+        self.address = Address.objects.create(user=self.customer, street='Road 27', area='Dhanmondi', city='Dhaka', latitude=23.75, longitude=90.38, is_default=True)
+        self.order = self.add_order(Order.CONFIRMED)
+
+    def add_food_item(self, is_special=False):
+        category = Category.objects.create(name=f'Category {Category.objects.count()}', details='Generated')
+        return FoodItem.objects.create(
+            name=f'Food {FoodItem.objects.count()}', category=category, description='Generated',
+            price='4.50', image='food.jpg', is_special=is_special
+        )
+
+    def add_order(self, status):
+        order = Order.objects.create(user=self.customer, status=status, total_price='9.00', address='Dhaka', delivery_zone=self.zone)
+        for food_item in FoodItem.objects.all()[:5]:
+            OrderItem.objects.create(order=order, food_item=food_item, quantity=2, price='4.50', total_price='9.00')
+        return order
+
+    def grow_to(self, size):
+        for _ in range(self.size, size):
+            food_item = self.add_food_item(is_special=True)
+            CartItem.objects.create(cart=self.cart, food_item=food_item, quantity=1)
+            user = User.objects.create_user(email=f'reviewer{User.objects.count()}@example.com')
+            Reviews.objects.create(user=user, food_item=self.food_item, ratings=4, comment='Fine')
+            self.add_order(Order.CONFIRMED)
+            self.add_order(Order.DELIVERED)
+            DeliveryZone.objects.create(name=f'Zone {DeliveryZone.objects.count()}', boundary=[[90.0, 23.0], [90.1, 23.0], [90.1, 23.1]])
+            Address.objects.create(user=self.customer, street='Generated', city='Dhaka', latitude=23.0, longitude=90.0)
+        self.size = size
+        AnalyticsServices.rebuild()
+        # Orders created above bypass the status signals, so the kitchen queue reloads.
+        kitchen_queue.loaded_at = None
+
+
+# The home screen sections load in the request thread, so their queries are counted.
+@override_settings(DATABASE_REPLICAS={**settings.DATABASE_REPLICAS, 'ALIASES': []}, HOME_SCREEN={'MAX_WORKERS': 0})
+class QueryBudgetTests(TestCase):
+    """
+    Every GET route in api/urls.py must stay within the query budget declared in
+    api/query_budgets.json, and make the same number of queries whatever the size of the result.
+    """
+    sizes = (2, 6)
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        with open(QUERY_BUDGETS) as file:
+            cls.budgets = json.load(file)['endpoints']
+
+    def test_every_route_has_a_budget(self):
+        self.assertEqual(sorted(api_route_names() - set(self.budgets)), [], "Add these routes to api/query_budgets.json")
+        self.assertEqual(sorted(set(self.budgets) - api_route_names()), [], "Remove these routes from api/query_budgets.json")
+
+    def test_query_counts(self):
+        data = QueryBudgetData()
+        endpoints = {name: budget for name, budget in self.budgets.items() if 'skip' not in budget}
+        queries = {name: [] for name in endpoints}
+        for size in self.sizes:
+            data.grow_to(size)
+            for name, budget in endpoints.items():
+                queries[name].append(self.capture(data, name, budget))
+
+        for name, budget in endpoints.items():
+            small, large = queries[name]
+            with self.subTest(name):
+                self.assertLessEqual(len(large), budget['max_queries'], self.report(name, large))
+                self.assertEqual(len(small), len(large), self.report(name, large, small))
+
+    def capture(self, data, name, budget):
+        client = APIClient()
+        if budget['user'] != 'anonymous':
+            client.force_authenticate(getattr(data, budget['user']))
+        kwargs = {key: getattr(data, value).pk for key, value in budget.get('kwargs', {}).items()}
+        url = reverse(name, kwargs=kwargs)
+        if 'query' in budget:
+            url = f"{url}?{budget['query']}"
+
+        cache.clear()
+        # The first request fills per-process caches (content types, the kitchen queue).
+        client.get(url)
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(url)
+            if response.streaming:
+                b''.join(response.streaming_content)
+        self.assertEqual(response.status_code, 200, f"GET {url}")
+        return [query['sql'] for query in queries.captured_queries]
+
+    def report(self, name, queries, smaller=None):
+        counts = Counter(fingerprint(sql) for sql in queries)
+        if smaller is not None:
+            counts.subtract(Counter(fingerprint(sql) for sql in smaller))
+        lines = [f"{count} x {sql}" for sql, count in counts.most_common() if count > 0]
+        return f"{name} made {len(queries)} queries:\n" + "\n".join(lines)
+
+
+@override_settings(DATABASE_REPLICAS={**settings.DATABASE_REPLICAS, 'ALIASES': []}, HOME_SCREEN={'MAX_WORKERS': 0})
+class HomeScreenTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(email='customer@example.com')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        category = Category.objects.create(name='Soups', details='Hot soups')
+        self.food_item = FoodItem.objects.create(
+            name='Chicken Soup', category=category, description='Soup', price='4.50', image='soup.jpg', is_special=True
+        )
+
+    def test_returns_every_section(self):
+        cart = Cart.objects.create(user=self.user)
+        CartItem.objects.create(cart=cart, food_item=self.food_item, quantity=2)
+        order = Order.objects.create(user=self.user, status=Order.CONFIRMED, total_price='9.00', address='Dhaka')
+        OrderItem.objects.create(order=order, food_item=self.food_item, quantity=2, price='4.50', total_price='9.00')
+        AnalyticsServices.rebuild()
+
+        response = self.client.get('/api/v1/home/')
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data['categories'], [{'id': self.food_item.category_id, 'name': 'Soups'}])
+        self.assertEqual([item['name'] for item in data['specials']], ['Chicken Soup'])
+        self.assertEqual([item['id'] for item in data['bestsellers']], [self.food_item.id])
+        self.assertEqual(data['cart']['items'][0]['quantity'], 2)
+        self.assertEqual(data['latest_order']['status'], Order.CONFIRMED)
+        self.assertEqual(data['unavailable'], [])
+
+    def test_shared_sections_are_cached_until_the_menu_changes(self):
+        self.client.get('/api/v1/home/')
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get('/api/v1/home/')
+        # Only the cart and latest order are loaded again.
+        self.assertEqual(len(queries), 2)
+
+        FoodItem.objects.create(name='Tomato Soup', category=self.food_item.category, description='Soup', price='3.50', image='soup.jpg', is_special=True)
+        data = self.client.get('/api/v1/home/').json()
+        self.assertEqual([item['name'] for item in data['specials']], ['Chicken Soup', 'Tomato Soup'])
+
+    def test_failing_section_is_unavailable(self):
+        sections = [home.Section('categories', home.load_categories), home.Section('specials', mock.Mock(side_effect=RuntimeError))]
+        with mock.patch.object(home, 'SECTIONS', sections), self.assertLogs('api.home', 'ERROR'):
+            response = self.client.get('/api/v1/home/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {'categories': [{'id': self.food_item.category_id, 'name': 'Soups'}], 'specials': None, 'unavailable': ['specials']})
+        self.assertIsNone(cache.get('home:specials'))
+
+    @override_settings(HOME_SCREEN={'MAX_WORKERS': 2, 'TIMEOUT_SECONDS': 0.2, 'CACHE_SECONDS': {}})
+    def test_sections_load_concurrently_within_the_timeout(self):
+        released, stopped = threading.Event(), threading.Event()
+
+        def load_slow(request):
+            released.wait(5)
+            try:
+                return Category.objects.count()
+            except DeadlineExceeded:
+                stopped.set()
+                raise
+
+        sections = [home.Section('fast', lambda request: 'fast'), home.Section('slow', load_slow)]
+        try:
+            with mock.patch.object(home, 'SECTIONS', sections), self.assertLogs('api.home', 'WARNING'):
+                started = time.monotonic()
+                data, unavailable = home.load_home(APIRequestFactory().get('/api/v1/home/'))
+        finally:
+            released.set()
+
+        self.assertLess(time.monotonic() - started, 2)
+        self.assertEqual(data, {'fast': 'fast', 'slow': None})
+        self.assertEqual(unavailable, ['slow'])
+        # The abandoned section stops at its next query instead of holding the worker.
+        self.assertTrue(stopped.wait(5))
+
+
+@override_settings(DATABASE_REPLICAS={**settings.DATABASE_REPLICAS, 'ALIASES': []}, BATCH_REQUESTS={'MAX_REQUESTS': 5, 'MAX_WORKERS': 0})
+class BatchTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='customer@example.com')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        category = Category.objects.create(name='Soups', details='Hot soups')
+        self.food_item = FoodItem.objects.create(name='Chicken Soup', category=category, description='Soup', price='4.50', image='soup.jpg')
+
+    def batch(self, *requests):
+        return self.client.post('/api/v1/batch/', {'requests': list(requests)}, format='json')
+
+    def test_runs_every_request_in_order(self):
+        response = self.batch(
+            {'method': 'POST', 'path': '/api/v1/carts/'},
+            {'path': '/api/v1/carts/'},
+            {'path': f'/api/v1/food_items/{self.food_item.id}/'},
+            {'path': '/api/v1/food_items/?search=tomato'},
+            {'path': '/api/v1/missing/'},
+        )
+
+        self.assertEqual(response.status_code, 200)
+        responses = response.json()['responses']
+        self.assertEqual([item['status'] for item in responses], [201, 200, 200, 200, 404])
+        cart_id = responses[0]['body']['id']
+        self.assertEqual([cart['id'] for cart in responses[1]['body']], [cart_id])
+        self.assertEqual(responses[2]['body']['name'], 'Chicken Soup')
+        self.assertEqual(responses[3]['body']['results'], [])
+
+    def test_sub_requests_keep_their_errors(self):
+        response = self.batch(
+            {'method': 'PATCH', 'path': f'/api/v1/food_items/{self.food_item.id}/', 'body': {'price': '1.00'}},
+            {'path': '/api/v1/orders/events/'},
+        )
+
+        responses = response.json()['responses']
+        self.assertEqual(responses[0]['status'], 403)
+        self.assertEqual(responses[1]['status'], 400)
+        self.food_item.refresh_from_db()
+        self.assertEqual(self.food_item.price, Decimal('4.50'))
+
+    def test_batch_is_limited(self):
+        self.assertEqual(self.batch(*[{'path': '/api/v1/'}] * 6).status_code, 400)
+        self.assertEqual(self.batch({'path': '/admin/'}).status_code, 400)
+        self.assertEqual(self.batch().status_code, 400)
+        self.assertEqual(APIClient().post('/api/v1/batch/', {'requests': [{'path': '/api/v1/'}]}, format='json').status_code, 401)
+
+    def test_consecutive_reads_are_grouped(self):
+        items = [{'method': method} for method in ['GET', 'GET', 'POST', 'DELETE', 'GET', 'GET', 'GET']]
+        self.assertEqual([[index for index, _ in group] for group in batch.plan(items)], [[0, 1], [2], [3], [4, 5, 6]])
+
+    def test_only_writes_pin_reads_to_the_primary(self):
+        cache.clear()
+        self.batch({'path': '/api/v1/carts/'}, {'path': '/api/v1/'})
+        self.assertIsNone(cache.get(primary_key(self.user.pk)))
+
+        self.batch({'path': '/api/v1/carts/'}, {'method': 'POST', 'path': '/api/v1/carts/'})
+        self.assertTrue(cache.get(primary_key(self.user.pk)))
+
+    @override_settings(BATCH_REQUESTS={'MAX_WORKERS': 2})
+    def test_reads_run_on_the_worker_pool(self):
+        with mock.patch.object(batch.pool, 'submit', wraps=batch.pool.submit) as submit:
+            response = self.batch({'path': '/api/v1/'}, {'path': '/api/v1/'})
+
+        self.assertEqual(submit.call_count, 2)
+        self.assertEqual([item['status'] for item in response.json()['responses']], [200, 200])
+
+
+class EstimatedCountPaginatorTests(TestCase):
+    def setUp(self):
+        for index in range(3):
+            User.objects.create_user(email=f'user{index}@example.com')
+
+    def test_counts_exactly_outside_postgresql(self):
+        with mock.patch.object(EstimatedCountPaginator, 'estimate') as estimate:
+            self.assertEqual(EstimatedCountPaginator(User.objects.all(), 2).count, 3)
+        estimate.assert_not_called()
+
+    @override_settings(ADMIN_PAGINATION={'ESTIMATED_COUNT_THRESHOLD': 1000})
+    def test_uses_large_planner_estimates(self):
+        with mock.patch.object(connection, 'vendor', 'postgresql'):
+            with mock.patch.object(EstimatedCountPaginator, 'estimate', return_value=250000):
+                self.assertEqual(EstimatedCountPaginator(User.objects.all(), 2).count, 250000)
+            with mock.patch.object(EstimatedCountPaginator, 'estimate', return_value=10):
+                self.assertEqual(EstimatedCountPaginator(User.objects.all(), 2).count, 3)
+
+
+class SyntheticDataTests(TestCase):
+
+    def test_orders_are_spread_over_the_window(self):
+        data = SyntheticData(batch_size=20)
+        data.categories(2)
+        data.food_items(5)
+        data.users(3)
+        data.orders(50, days=30)
+
+        orders = list(Order.objects.values_list('id', 'created_at', 'updated_at'))
+        self.assertEqual(len(orders), 50)
+        moments = [created_at for _, created_at, _ in orders]
+        self.assertEqual(len(set(moments)), 50)
+        self.assertGreater(max(moments) - min(moments), datetime.timedelta(days=7))
+        self.assertGreaterEqual(min(moments), timezone.now() - datetime.timedelta(days=30))
+        for order_id, created_at, updated_at in orders:
+            self.assertEqual(updated_at, created_at)
+            self.assertEqual(uuid7_time(order_id), created_at.replace(microsecond=created_at.microsecond // 1000 * 1000))
+
+
+class UUID7Tests(unittest.TestCase):
+    def test_ids_sort_in_the_order_they_are_made(self):
+        ids = [uuid7() for _ in range(5000)]
+        self.assertEqual(sorted(ids), ids)
+        self.assertEqual(sorted(str(value) for value in ids), [str(value) for value in ids])
+        self.assertEqual({(value.version, value.variant) for value in ids}, {(7, uuid.RFC_4122)})
+
+    def test_time_bounds(self):
+        moment = datetime.datetime(2026, 3, 1, 12, 30, tzinfo=datetime.timezone.utc)
+        self.assertEqual(uuid7_time(uuid7_at(moment)), moment)
+        self.assertLessEqual(uuid7_floor(moment), uuid7_at(moment))
+        self.assertLess(uuid7_at(moment), uuid7_floor(moment + datetime.timedelta(milliseconds=1)))
+        self.assertIsNone(uuid7_time(uuid.uuid4()))
@@ -0,0 +1,135 @@
+import math
+from rest_framework.throttling import SimpleRateThrottle
+from nomino.metrics import registry
+
+throttle_decisions = registry.counter(
+    'nomino_throttle_decisions_total', "Requests allowed or throttled, by throttle scope.", ['scope', 'decision']
+)
+
+
+class TokenBucketThrottle(SimpleRateThrottle):
+    """
+    Token bucket throttle backed by the Django cache, implemented as GCRA.
+
+    A rate of ``N/period`` is a bucket holding N tokens that refills at N per period.
+    The cache stores one integer per client: the theoretical arrival time (TAT, in
+    microseconds) at which the bucket would be full again. Each request moves it
+    forward by period/N with an atomic ``cache.incr``, so limits hold across
+    processes sharing the cache, and an allowed request costs one cache call (two
+    round trips on Django's Redis backend, whose incr checks the key exists first).
+
+    When an idle client comes back, its TAT is reset to now with a plain ``set``.
+    Requests from that client racing on the reset in other processes are each let
+    through with a single token, so the first burst after idling can exceed N by the
+    number of racing processes.
+    """
+    cache_format = 'throttle_%(scope)s_%(ident)s'
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        self.now = self.timer()
+        duration = self.duration * 1_000_000
+        interval = duration // self.num_requests
+        now = int(self.now * 1_000_000)
+
+        tat = self.take(now, interval, duration)
+        if tat - now > duration:
+            # Over the limit: give the token back so denied requests don't push the TAT further.
+            try:
+                self.cache.decr(self.key, interval)
+            except ValueError:
+                pass
+            self.wait_seconds = (tat - now - duration) / 1_000_000
+            throttle_decisions.inc(scope=self.scope, decision='throttled')
+            return False
+
+        throttle_decisions.inc(scope=self.scope, decision='allowed')
+        return True
+
+    def take(self, now, interval, duration):
+        """
+        Add one request to the bucket and return the new TAT.
+        """
+        # An entry is only needed while its TAT is in the future (the bucket is not full),
+        # which is never more than ``duration`` away.
+        timeout = 2 * self.duration
+        try:
+            tat = self.cache.incr(self.key, interval)
+        except ValueError:
+            # First request, or the bucket refilled and the entry expired.
+            if self.cache.add(self.key, now + interval, timeout):
+                return now + interval
+            # Another process created the entry in the meantime.
+            tat = self.cache.incr(self.key, interval)
+
+        previous = tat - interval
+        if previous < now:
+            # Idle client: the bucket has refilled completely, so restart from now. Not atomic,
+            # see the class docstring.
+            self.cache.set(self.key, now + interval, timeout)
+            return now + interval
+        if previous // duration != tat // duration:
+            # incr() keeps the original expiry. Extend it each time the TAT crosses a multiple
+            # of ``duration``, which happens at most once per bucket's worth of requests.
+            self.cache.touch(self.key, timeout)
+        return tat
+
+    def wait(self):
+        return math.ceil(getattr(self, 'wait_seconds', 0)) or None
+
+
+class UserTokenBucketThrottle(TokenBucketThrottle):
+    """
+    Limits authenticated users by user id.
+    """
+    scope = 'user'
+
+    def get_cache_key(self, request, view):
+        if not request.user or not request.user.is_authenticated:
+            return None
+        return self.cache_format % {'scope': self.scope, 'ident': request.user.pk}
+
+
+class AnonTokenBucketThrottle(TokenBucketThrottle):
+    """
+    Limits anonymous requests by client IP.
+    """
+    scope = 'anon'
+
+    def get_cache_key(self, request, view):
+        if request.user and request.user.is_authenticated:
+            return None
+        return self.cache_format % {'scope': self.scope, 'ident': self.get_ident(request)}
+
+
+class ScopedTokenBucketThrottle(TokenBucketThrottle):
+    """
+    Limits each user (or IP for anonymous requests) per endpoint class, using the
+    ``throttle_scope`` attribute of the view. Views without one are not limited.
+    """
+    scope_attr = 'throttle_scope'
+
+    def __init__(self):
+        # The rate depends on the view, so it is resolved in allow_request().
+        pass
+
+    def allow_request(self, request, view):
+        self.scope = getattr(view, self.scope_attr, None)
+        if not self.scope:
+            return True
+        self.rate = self.get_rate()
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+        return super().allow_request(request, view)
+
+    def get_cache_key(self, request, view):
+        if request.user and request.user.is_authenticated:
+            ident = request.user.pk
+        else:
+            ident = self.get_ident(request)
+        return self.cache_format % {'scope': self.scope, 'ident': ident}
@@ -2,7 +2,10 @@ from django.urls import path,include
 from rest_framework_nested import routers
 
 from food_item.views import FoodItemViewSet, CategoryViewSet, ReviewViewSet, SpecialFoodItemViewSet
-from orders.views import CartViewSet, CartItemViewSet, OrderViewSet
+from orders.views import CartViewSet, CartItemViewSet, OrderViewSet, KitchenQueueViewSet, order_events
+from analytics.views import ReportViewSet
+from api.views import BatchView, HomeViewSet
+from delivery.views import AddressViewSet, DeliveryZoneViewSet
 
 router = routers.DefaultRouter()
 router.register('food_items', FoodItemViewSet, basename='food_item')
@@ -10,6 +13,11 @@ router.register('categories', CategoryViewSet, basename='category')
 router.register('carts', CartViewSet, basename='cart')
 router.register('orders', OrderViewSet, basename='order')
 router.register('special_foods', SpecialFoodItemViewSet, basename='special-food')
+router.register('reports', ReportViewSet, basename='report')
+router.register('kitchen', KitchenQueueViewSet, basename='kitchen')
+router.register('home', HomeViewSet, basename='home')
+router.register('addresses', AddressViewSet, basename='address')
+router.register('delivery_zones', DeliveryZoneViewSet, basename='delivery-zone')
 # router.register('reviews', ReviewViewSet, basename='review')
 
 food_item_router = routers.NestedDefaultRouter(router, 'food_items', lookup='food_item')
@@ -18,6 +26,8 @@ cart_router = routers.NestedDefaultRouter(router,'carts', lookup='cart')
 cart_router.register('items',CartItemViewSet, basename='cart-item')
 
 urlpatterns = [
+    path('orders/events/', order_events, name='order-events'),
+    path('batch/', BatchView.as_view(), name='batch'),
     path('',include(router.urls)),
     path('', include(food_item_router.urls)),
     path('', include(cart_router.urls)),
@@ -1,3 +1,77 @@
 from django.shortcuts import render
+from django.http import HttpResponse
+from rest_framework.views import APIView
+from rest_framework.viewsets import GenericViewSet
+from rest_framework.permissions import IsAuthenticated, SAFE_METHODS
+from rest_framework.response import Response
+from api.batch import run_batch
+from api.home import load_home
+from api.serializers import BatchSerializer, BatchResponseSerializer, HomeSerializer
+from nomino.docs import swagger_auto_schema
+from nomino.docs import openapi
+from nomino.db_router import skip_pin_to_primary
+from users.authentication import ClaimsOnlyReadsMixin
 
 # Create your views here.
+
+
+class HomeViewSet(ClaimsOnlyReadsMixin, GenericViewSet):
+    """
+    API endpoint for the app's home screen: everything the landing view shows, in one request.
+    """
+    permission_classes = [IsAuthenticated]
+    serializer_class = HomeSerializer
+    throttle_scope = 'menu'
+
+    @swagger_auto_schema(
+        operation_summary="Return the categories, specials, bestsellers, cart and latest order.",
+        operation_description=(
+            "Sections are loaded concurrently and cached for HOME_SCREEN['CACHE_SECONDS']. "
+            "A section that fails or times out is returned as null and listed in `unavailable`."
+        ),
+        responses={
+            200: openapi.Response(
+                description="Home screen sections",
+                schema=HomeSerializer()
+            ),
+            401: "Authentication credentials were not provided."
+        }
+    )
+    def list(self, request, *args, **kwargs):
+        data, unavailable = load_home(request)
+        return Response({**data, 'unavailable': unavailable})
+
+
+class BatchView(APIView):
+    """
+    API endpoint running several API requests in one round trip.
+    """
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_summary="Run a list of API requests and return all their responses.",
+        operation_description=(
+            "Each sub-request runs as the authenticated user through the API's own views. "
+            "Consecutive GET requests run concurrently; a write runs after every request before it "
+            "and before any after it. Each response has its own status, and a failing sub-request "
+            "doesn't stop the others. At most BATCH_REQUESTS['MAX_REQUESTS'] requests per batch. "
+            "Only a batch with a write keeps the user's later reads on the primary database."
+        ),
+        request_body=BatchSerializer,
+        responses={
+            200: openapi.Response(
+                description="Responses in the order of the requests",
+                schema=BatchResponseSerializer()
+            ),
+            400: "Validation error",
+            401: "Authentication credentials were not provided."
+        }
+    )
+    def post(self, request, *args, **kwargs):
+        serializer = BatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        items = serializer.validated_data['requests']
+        # The batch is a POST, but only its writes should pin the user's reads to the primary.
+        if all(item['method'] in SAFE_METHODS for item in items):
+            skip_pin_to_primary(request._request)
+        return HttpResponse(run_batch(request, items), content_type='application/json')
@@ -0,0 +1,65 @@
+import contextvars
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from functools import partial
+from django.db import close_old_connections, connections
+
+
+class DeadlineExceeded(Exception):
+    """
+    Raised in a pool task that starts or queries the database after its deadline.
+    """
+
+
+def check_deadline(deadline, execute, sql, params, many, context):
+    if time.monotonic() >= deadline:
+        raise DeadlineExceeded("The task's deadline passed before this query.")
+    return execute(sql, params, many, context)
+
+
+class WorkerPool:
+    """
+    A thread pool created on first use, for work a request fans out (home screen sections,
+    batched sub-requests). Tasks run in a copy of the submitting context, so database routing
+    follows the request, and expire their thread's database connections the way Django does
+    around each request.
+
+    A thread can't be interrupted, so a task submitted with a ``deadline`` (a time.monotonic()
+    value) raises DeadlineExceeded when it starts or sends a query after it. A task the
+    submitter stopped waiting for then frees its worker at its next query instead of running
+    to the end; a query already running still finishes.
+
+    ``max_workers`` is a callable returning the pool size, read when the pool is created.
+    """
+    def __init__(self, name, max_workers):
+        self.name = name
+        self.max_workers = max_workers
+        self._lock = threading.Lock()
+        self._executor = None
+
+    def get_executor(self):
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self.max_workers(), thread_name_prefix=self.name)
+        return self._executor
+
+    def submit(self, fn, *args, deadline=None):
+        return self.get_executor().submit(contextvars.copy_context().run, self.run, fn, args, deadline)
+
+    @staticmethod
+    def run(fn, args, deadline):
+        close_old_connections()
+        try:
+            if deadline is None:
+                return fn(*args)
+            if time.monotonic() >= deadline:
+                raise DeadlineExceeded("The task's deadline passed before it started.")
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(partial(check_deadline, deadline)))
+                return fn(*args)
+        finally:
+            close_old_connections()
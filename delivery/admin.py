@@ -0,0 +1,20 @@
+from django.contrib import admin
+from delivery.models import Address, DeliveryZone
+from nomino.admin import LargeTableAdminMixin
+
+# Register your models here.
+
+
+@admin.register(DeliveryZone)
+class DeliveryZoneAdmin(admin.ModelAdmin):
+    list_display = ('name', 'is_active', 'created_at')
+    list_filter = ('is_active',)
+    search_fields = ['name']
+
+
+@admin.register(Address)
+class AddressAdmin(LargeTableAdminMixin, admin.ModelAdmin):
+    list_display = ('id', 'user', 'street', 'area', 'city', 'postal_code', 'is_default')
+    list_select_related = ('user',)
+    autocomplete_fields = ['user']
+    search_fields = ['=user__email', 'postal_code']
@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class DeliveryConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'delivery'
+
+    def ready(self):
+        import delivery.receivers  # noqa: F401
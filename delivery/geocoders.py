@@ -0,0 +1,80 @@
+import abc
+import functools
+import re
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+# Centres of the areas the offline geocoder knows: (name, postal code, latitude, longitude).
+DHAKA_AREAS = [
+    ('Motijheel', '1000', 23.7330, 90.4172),
+    ('Dhanmondi', '1205', 23.7465, 90.3760),
+    ('Mohammadpur', '1207', 23.7662, 90.3589),
+    ('Gulshan', '1212', 23.7925, 90.4078),
+    ('Banani', '1213', 23.7937, 90.4066),
+    ('Mirpur', '1216', 23.8223, 90.3654),
+    ('Uttara', '1230', 23.8759, 90.3795),
+]
+
+DEFAULTS = {
+    'GEOCODER': 'delivery.geocoders.OfflineGeocoder',
+    'PLACES': DHAKA_AREAS,
+}
+
+
+def get_setting(name):
+    return getattr(settings, 'DELIVERY', {}).get(name, DEFAULTS[name])
+
+
+class Geocoder(abc.ABC):
+    """
+    Turns an address into a (latitude, longitude) point. Subclass it to use a geocoding
+    service and name the subclass in DELIVERY['GEOCODER'].
+    """
+    @abc.abstractmethod
+    def geocode(self, text, postal_code=''):
+        """
+        Return (latitude, longitude) for the address ``text``, or None when it can't be placed.
+        """
+
+
+COORDINATES = re.compile(r'^\s*(-?\d{1,2}(?:\.\d+)?)\s*,\s*(-?\d{1,3}(?:\.\d+)?)\s*$')
+POSTAL_CODE = re.compile(r'\b(\d{4,6})\b')
+
+
+class OfflineGeocoder(Geocoder):
+    """
+    Stand-in for a geocoding service that needs no network: places "latitude, longitude"
+    text as given, and other addresses at the centre of their postal code or of the first
+    area named in them, from DELIVERY['PLACES'].
+    """
+    def __init__(self, places=None):
+        places = get_setting('PLACES') if places is None else places
+        self.by_postal_code = {postal_code: (latitude, longitude) for _, postal_code, latitude, longitude in places}
+        self.by_name = [(re.compile(rf'\b{re.escape(name.lower())}\b'), (latitude, longitude)) for name, _, latitude, longitude in places]
+
+    def geocode(self, text, postal_code=''):
+        text = text or ''
+        match = COORDINATES.match(text)
+        if match:
+            latitude, longitude = float(match.group(1)), float(match.group(2))
+            if -90 <= latitude <= 90 and -180 <= longitude <= 180:
+                return latitude, longitude
+
+        for code in [postal_code, *POSTAL_CODE.findall(text)]:
+            if code in self.by_postal_code:
+                return self.by_postal_code[code]
+
+        lowered = text.lower()
+        for pattern, point in self.by_name:
+            if pattern.search(lowered):
+                return point
+        return None
+
+
+@functools.cache
+def load_geocoder(path):
+    return import_string(path)()
+
+
+def get_geocoder():
+    return load_geocoder(get_setting('GEOCODER'))
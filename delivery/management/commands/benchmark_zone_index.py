@@ -0,0 +1,63 @@
+import json
+import math
+import random
+import time
+from django.core.management.base import BaseCommand
+from delivery.spatial import ZoneIndex, point_in_polygon
+
+
+class Command(BaseCommand):
+    help = "Benchmark delivery zone lookups on synthetic zones against a linear scan. Does not touch the database."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--zones', type=int, default=200, help="Zones, tiled across the city.")
+        parser.add_argument('--vertices', type=int, default=40, help="Points in each zone's outline.")
+        parser.add_argument('--lookups', type=int, default=20000)
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        side = math.ceil(math.sqrt(options['zones']))
+        # Irregular outlines around the centres of a grid of 0.02 degree (about 2 km) squares.
+        zones = []
+        for zone_id in range(1, options['zones'] + 1):
+            centre_x = 90.30 + ((zone_id - 1) % side) * 0.02 + 0.01
+            centre_y = 23.70 + ((zone_id - 1) // side) * 0.02 + 0.01
+            ring = []
+            for vertex in range(options['vertices']):
+                angle = 2 * math.pi * vertex / options['vertices']
+                radius = rng.uniform(0.006, 0.01)
+                ring.append([centre_x + radius * math.cos(angle), centre_y + radius * math.sin(angle)])
+            zones.append((zone_id, ring))
+        points = [
+            (rng.uniform(23.70, 23.70 + side * 0.02), rng.uniform(90.30, 90.30 + side * 0.02))
+            for _ in range(options['lookups'])
+        ]
+
+        index = ZoneIndex()
+        results = {'zones': options['zones'], 'vertices': options['vertices'], 'lookups': options['lookups']}
+
+        started = time.perf_counter()
+        index.load(zones)
+        results['load_ms'] = self.elapsed_ms(started)
+
+        started = time.perf_counter()
+        indexed = [index.locate(latitude, longitude) for latitude, longitude in points]
+        results['index_us'] = round(self.elapsed_ms(started) * 1000 / len(points), 2)
+
+        started = time.perf_counter()
+        scanned = [self.scan(zones, latitude, longitude) for latitude, longitude in points]
+        results['linear_scan_us'] = round(self.elapsed_ms(started) * 1000 / len(points), 2)
+
+        results['mismatches'] = sum(1 for a, b in zip(indexed, scanned) if a != b)
+        results['in_a_zone'] = sum(1 for zone_id in indexed if zone_id is not None)
+        self.stdout.write(json.dumps(results, indent=2))
+
+    def scan(self, zones, latitude, longitude):
+        for zone_id, ring in zones:
+            if point_in_polygon(longitude, latitude, ring):
+                return zone_id
+        return None
+
+    def elapsed_ms(self, started):
+        return round((time.perf_counter() - started) * 1000, 3)
@@ -0,0 +1,64 @@
+import math
+from django.core.exceptions import ValidationError
+from django.db import models
+from users.models import User
+
+# Create your models here.
+
+
+def validate_boundary(boundary):
+    """
+    A zone boundary is a list of at least three [longitude, latitude] points, as in a GeoJSON
+    polygon ring. The ring doesn't need to repeat its first point at the end. Its bounding box
+    may span at most DELIVERY['MAX_ZONE_CELLS'] grid cells.
+    """
+    if not isinstance(boundary, list) or len(boundary) < 3:
+        raise ValidationError("A boundary needs at least three [longitude, latitude] points.")
+    for point in boundary:
+        if (
+            not isinstance(point, (list, tuple)) or len(point) != 2
+            or not all(isinstance(value, (int, float)) and not isinstance(value, bool) for value in point)
+        ):
+            raise ValidationError("Boundary points must be [longitude, latitude] pairs of numbers.")
+        longitude, latitude = point
+        if not (-180 <= longitude <= 180 and -90 <= latitude <= 90):
+            raise ValidationError(f"{point} is not a valid [longitude, latitude] point.")
+
+    # The zone index tests every cell of the bounding box against every edge when it loads.
+    from delivery.spatial import get_setting
+    size = get_setting('GRID_CELL_DEGREES')
+    columns = math.floor(max(x for x, _ in boundary) / size) - math.floor(min(x for x, _ in boundary) / size) + 1
+    rows = math.floor(max(y for _, y in boundary) / size) - math.floor(min(y for _, y in boundary) / size) + 1
+    if columns * rows > get_setting('MAX_ZONE_CELLS'):
+        raise ValidationError(
+            f"The boundary spans {columns * rows} grid cells of {size} degrees, more than the "
+            f"{get_setting('MAX_ZONE_CELLS')} allowed. Split it into smaller zones."
+        )
+
+
+class DeliveryZone(models.Model):
+    name = models.CharField(max_length=100, unique=True)
+    # [longitude, latitude] points of the zone's outline, see validate_boundary.
+    boundary = models.JSONField(validators=[validate_boundary])
+    is_active = models.BooleanField(default=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    def __str__(self):
+        return self.name
+    
+    
+class Address(models.Model):
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='addresses')
+    label = models.CharField(max_length=50, blank=True)
+    street = models.CharField(max_length=250)
+    area = models.CharField(max_length=100, blank=True)
+    city = models.CharField(max_length=100)
+    postal_code = models.CharField(max_length=20, blank=True)
+    # Set by the geocoder when the address is saved, unless the client sent them.
+    latitude = models.FloatField(null=True, blank=True)
+    longitude = models.FloatField(null=True, blank=True)
+    is_default = models.BooleanField(default=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    def __str__(self):
+        return ", ".join(part for part in (self.street, self.area, self.city, self.postal_code) if part)
@@ -0,0 +1,10 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from delivery.models import DeliveryZone
+from delivery.spatial import zone_index
+
+
+@receiver(post_save, sender=DeliveryZone)
+@receiver(post_delete, sender=DeliveryZone)
+def reload_zone_index(sender, instance, **kwargs):
+    zone_index.loaded_at = None
@@ -0,0 +1,52 @@
+from rest_framework import serializers
+from delivery.models import Address, DeliveryZone, validate_boundary
+from delivery.services import DeliveryServices
+from delivery.spatial import get_zone_index
+from nomino.docs import swagger_serializer_method
+
+
+class DeliveryZoneSerializer(serializers.ModelSerializer):
+    boundary = serializers.JSONField(validators=[validate_boundary], help_text="[longitude, latitude] points of the zone's outline, as in a GeoJSON polygon ring.")
+    class Meta:
+        model = DeliveryZone
+        fields = ['id','name','boundary','is_active']
+    
+    
+class ZoneLocationSerializer(serializers.Serializer):
+    latitude = serializers.FloatField(min_value=-90, max_value=90)
+    longitude = serializers.FloatField(min_value=-180, max_value=180)
+    
+    
+class AddressSerializer(serializers.ModelSerializer):
+    zone = serializers.SerializerMethodField(method_name='get_zone')
+    class Meta:
+        model = Address
+        fields = ['id','label','street','area','city','postal_code','latitude','longitude','is_default','zone']
+        extra_kwargs = {
+            'latitude': {'min_value': -90, 'max_value': 90},
+            'longitude': {'min_value': -180, 'max_value': 180},
+        }
+    
+    @swagger_serializer_method(serializer_or_field=serializers.IntegerField(allow_null=True))
+    def get_zone(self, instance):
+        if instance.latitude is None or instance.longitude is None:
+            return None
+        return get_zone_index().locate(instance.latitude, instance.longitude)
+    
+    def validate(self, attrs):
+        if ('latitude' in attrs) != ('longitude' in attrs):
+            raise serializers.ValidationError("Send both latitude and longitude, or neither.")
+        return attrs
+    
+    def create(self, validated_data):
+        address = Address(user=self.context['user'], **validated_data)
+        return DeliveryServices.save_address(address, geocode='latitude' not in validated_data)
+    
+    def update(self, instance, validated_data):
+        moved = any(
+            field in validated_data and validated_data[field] != getattr(instance, field)
+            for field in ('street', 'area', 'city', 'postal_code')
+        )
+        for field, value in validated_data.items():
+            setattr(instance, field, value)
+        return DeliveryServices.save_address(instance, geocode=moved and 'latitude' not in validated_data)
@@ -0,0 +1,62 @@
+from django.db import transaction
+from delivery.geocoders import get_geocoder
+from delivery.models import Address
+from delivery.spatial import get_zone_index
+
+# Order.address for users who have no address at all.
+NO_ADDRESS = "User doesn't have any address yet!"
+
+
+class DeliveryPoint:
+    __slots__ = ('text', 'latitude', 'longitude', 'zone_id')
+
+    def __init__(self, text, latitude=None, longitude=None, zone_id=None):
+        self.text = text
+        self.latitude = latitude
+        self.longitude = longitude
+        self.zone_id = zone_id
+
+
+class DeliveryServices:
+    
+    
+    @staticmethod
+    def save_address(address, geocode=True):
+        """
+        Save ``address``, placing it with the geocoder when ``geocode`` is set. The user's
+        first address, or one saved with is_default, becomes their only default address.
+        """
+        if geocode:
+            point = get_geocoder().geocode(str(address), address.postal_code)
+            address.latitude, address.longitude = point if point is not None else (None, None)
+        
+        with transaction.atomic():
+            others = Address.objects.filter(user_id=address.user_id)
+            if not address.is_default and not others.exclude(pk=address.pk).exists():
+                address.is_default = True
+            address.save()
+            if address.is_default:
+                others.exclude(pk=address.pk).filter(is_default=True).update(is_default=False)
+        return address
+    
+    
+    @staticmethod
+    def delivery_point(user, address=None):
+        """
+        Where an order placed by ``user`` goes: ``address``, else their default (or latest)
+        address, else the free-text User.address placed by the geocoder. The zone comes from
+        the in-memory zone index.
+        """
+        if address is None:
+            address = Address.objects.filter(user_id=user.pk).order_by('-is_default', '-created_at').first()
+        
+        if address is not None:
+            point = DeliveryPoint(str(address), address.latitude, address.longitude)
+        elif getattr(user, 'address', None):
+            point = DeliveryPoint(user.address, *(get_geocoder().geocode(user.address) or (None, None)))
+        else:
+            return DeliveryPoint(NO_ADDRESS)
+        
+        if point.latitude is not None and point.longitude is not None:
+            point.zone_id = get_zone_index().locate(point.latitude, point.longitude)
+        return point
@@ -0,0 +1,127 @@
+import math
+import threading
+import time
+from django.conf import settings
+from delivery.models import DeliveryZone
+
+DEFAULTS = {
+    'GRID_CELL_DEGREES': 0.01,
+    'MAX_ZONE_CELLS': 10000,
+    'RESYNC_SECONDS': 60,
+}
+
+
+def get_setting(name):
+    return getattr(settings, 'DELIVERY', {}).get(name, DEFAULTS[name])
+
+
+def point_in_polygon(longitude, latitude, ring):
+    """
+    Ray casting test of whether the point is inside ``ring``, a list of [longitude, latitude] points.
+    """
+    inside = False
+    x, y = longitude, latitude
+    x1, y1 = ring[-1]
+    for x2, y2 in ring:
+        if (y1 > y) != (y2 > y) and x < (x2 - x1) * (y - y1) / (y2 - y1) + x1:
+            inside = not inside
+        x1, y1 = x2, y2
+    return inside
+
+
+def segment_crosses_box(start, end, box):
+    """
+    Whether the segment from ``start`` to ``end`` touches ``box`` (min_x, min_y, max_x, max_y).
+    """
+    (x1, y1), (x2, y2) = start, end
+    min_x, min_y, max_x, max_y = box
+    low, high = 0.0, 1.0
+    for delta, distance_low, distance_high in ((x2 - x1, x1 - min_x, max_x - x1), (y2 - y1, y1 - min_y, max_y - y1)):
+        if delta == 0:
+            if distance_low < 0 or distance_high < 0:
+                return False
+            continue
+        enter, leave = -distance_low / delta, distance_high / delta
+        if enter > leave:
+            enter, leave = leave, enter
+        low, high = max(low, enter), min(high, leave)
+        if low > high:
+            return False
+    return True
+
+
+# A grid cell either lies entirely inside a zone, or only partly and needs the polygon test.
+FULL, PARTIAL = True, False
+
+
+class ZoneIndex:
+    """
+    Delivery zones bucketed by the grid cells (GRID_CELL_DEGREES square) they overlap, so a
+    lookup tests at most the few zones around one cell. Cells entirely inside a zone answer
+    without a polygon test. Where zones overlap, the one loaded first wins.
+    """
+    def __init__(self, cell_degrees=None):
+        self.cell_degrees = cell_degrees or get_setting('GRID_CELL_DEGREES')
+        self._lock = threading.Lock()
+        self._cells = {}
+        self._zones = {}
+        self.loaded_at = None
+
+    def __len__(self):
+        return len(self._zones)
+
+    def load(self, zones):
+        """
+        Replace the indexed zones with ``zones``: (zone_id, boundary) pairs, in priority order.
+        """
+        cells, boundaries = {}, {}
+        for zone_id, boundary in zones:
+            ring = [(float(longitude), float(latitude)) for longitude, latitude in boundary]
+            boundaries[zone_id] = ring
+            for cell, coverage in self._cover(ring):
+                cells.setdefault(cell, []).append((zone_id, coverage))
+        with self._lock:
+            # Lookups read the old or the new dicts, never a mix.
+            self._cells, self._zones = cells, boundaries
+            self.loaded_at = time.monotonic()
+
+    def locate(self, latitude, longitude):
+        """
+        Return the id of the zone containing the point, or None.
+        """
+        cells, zones = self._cells, self._zones
+        for zone_id, coverage in cells.get(self._cell(longitude, latitude), ()):
+            if coverage is FULL or point_in_polygon(longitude, latitude, zones[zone_id]):
+                return zone_id
+        return None
+
+    def _cell(self, longitude, latitude):
+        return math.floor(longitude / self.cell_degrees), math.floor(latitude / self.cell_degrees)
+
+    def _cover(self, ring):
+        size = self.cell_degrees
+        min_x, min_y = self._cell(min(x for x, _ in ring), min(y for _, y in ring))
+        max_x, max_y = self._cell(max(x for x, _ in ring), max(y for _, y in ring))
+        edges = list(zip([ring[-1], *ring[:-1]], ring))
+        for cell_x in range(min_x, max_x + 1):
+            for cell_y in range(min_y, max_y + 1):
+                box = (cell_x * size, cell_y * size, (cell_x + 1) * size, (cell_y + 1) * size)
+                if any(segment_crosses_box(start, end, box) for start, end in edges):
+                    yield (cell_x, cell_y), PARTIAL
+                # No edge touches the cell, so it is all inside or all outside, like its centre.
+                elif point_in_polygon(box[0] + size / 2, box[1] + size / 2, ring):
+                    yield (cell_x, cell_y), FULL
+
+
+zone_index = ZoneIndex()
+
+
+def get_zone_index():
+    """
+    Return the process-wide index of active zones, (re)loading it when it is older than
+    DELIVERY['RESYNC_SECONDS']. Zone changes made in this process reload it on the next lookup.
+    """
+    resync = get_setting('RESYNC_SECONDS')
+    if zone_index.loaded_at is None or time.monotonic() - zone_index.loaded_at > resync:
+        zone_index.load(DeliveryZone.objects.filter(is_active=True).order_by('id').values_list('id', 'boundary'))
+    return zone_index
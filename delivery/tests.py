@@ -0,0 +1,169 @@
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+from delivery.geocoders import OfflineGeocoder
+from delivery.models import Address, DeliveryZone
+from delivery.services import NO_ADDRESS
+from delivery.spatial import ZoneIndex, point_in_polygon, zone_index
+from food_item.models import Category, FoodItem
+from orders.models import Cart, CartItem
+from orders.services import OrderServices
+from users.models import User
+
+# Create your tests here.
+
+DHANMONDI = [[90.36, 23.73], [90.40, 23.73], [90.40, 23.77], [90.36, 23.77]]
+GULSHAN = [[90.40, 23.77], [90.43, 23.77], [90.43, 23.81], [90.40, 23.81]]
+
+
+class GeocoderTests(TestCase):
+    def setUp(self):
+        self.geocoder = OfflineGeocoder()
+
+    def test_coordinates_are_used_as_given(self):
+        self.assertEqual(self.geocoder.geocode("23.75, 90.38"), (23.75, 90.38))
+
+    def test_postal_code_wins_over_area_name(self):
+        self.assertEqual(self.geocoder.geocode("House 4, Gulshan", postal_code='1205'), (23.7465, 90.3760))
+        self.assertEqual(self.geocoder.geocode("House 4, Gulshan 1212"), (23.7925, 90.4078))
+
+    def test_area_name(self):
+        self.assertEqual(self.geocoder.geocode("Road 27, Dhanmondi, Dhaka"), (23.7465, 90.3760))
+        self.assertIsNone(self.geocoder.geocode("Somewhere else"))
+
+
+class ZoneIndexTests(TestCase):
+    def test_locate(self):
+        index = ZoneIndex(cell_degrees=0.01)
+        index.load([(1, DHANMONDI), (2, GULSHAN)])
+
+        self.assertEqual(index.locate(23.75, 90.38), 1)
+        self.assertEqual(index.locate(23.79, 90.415), 2)
+        self.assertIsNone(index.locate(23.70, 90.38))
+
+    def test_agrees_with_the_polygon_test_inside_a_notch(self):
+        # A thin notch cut through the middle of the square crosses cells without a vertex in them.
+        notched = [[0, 0], [0.1, 0], [0.1, 0.1], [0.0505, 0.1], [0.0505, -0.05], [0.0495, -0.05], [0.0495, 0.1], [0, 0.1]]
+        index = ZoneIndex(cell_degrees=0.02)
+        index.load([(1, notched)])
+
+        for step in range(200):
+            longitude = step * 0.0005
+            for latitude in (0.005, 0.05, 0.095):
+                expected = 1 if point_in_polygon(longitude, latitude, notched) else None
+                self.assertEqual(index.locate(latitude, longitude), expected, (latitude, longitude))
+
+    def test_zone_changes_reload_the_shared_index(self):
+        zone = DeliveryZone.objects.create(name='Dhanmondi', boundary=DHANMONDI)
+        client = APIClient()
+        client.force_authenticate(User.objects.create_user(email='customer@example.com'))
+        url = '/api/v1/delivery_zones/locate/?latitude=23.75&longitude=90.38'
+        self.assertEqual(client.get(url).json(), {'zone': zone.id})
+
+        zone.is_active = False
+        zone.save()
+        self.assertEqual(client.get(url).json(), {'zone': None})
+
+
+class DeliveryZoneApiTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_only_staff_can_change_zones(self):
+        self.client.force_authenticate(User.objects.create_user(email='customer@example.com'))
+        response = self.client.post('/api/v1/delivery_zones/', {'name': 'Dhanmondi', 'boundary': DHANMONDI}, format='json')
+        self.assertEqual(response.status_code, 403)
+
+    def test_boundary_is_validated(self):
+        self.client.force_authenticate(User.objects.create_user(email='staff@example.com', is_staff=True))
+        response = self.client.post('/api/v1/delivery_zones/', {'name': 'Line', 'boundary': [[90.36, 23.73], [90.40, 23.73]]}, format='json')
+        self.assertEqual(response.status_code, 400)
+        response = self.client.post('/api/v1/delivery_zones/', {'name': 'Dhanmondi', 'boundary': DHANMONDI}, format='json')
+        self.assertEqual(response.status_code, 201)
+
+    @override_settings(DELIVERY={'MAX_ZONE_CELLS': 100})
+    def test_oversized_boundary_is_rejected(self):
+        self.client.force_authenticate(User.objects.create_user(email='staff@example.com', is_staff=True))
+        # 10 x 11 cells of 0.01 degrees.
+        boundary = [[90.300, 23.700], [90.395, 23.700], [90.395, 23.805], [90.300, 23.805]]
+        response = self.client.post('/api/v1/delivery_zones/', {'name': 'Dhaka', 'boundary': boundary}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('110 grid cells', str(response.data['boundary']))
+
+        boundary = [[90.300, 23.700], [90.395, 23.700], [90.395, 23.795], [90.300, 23.795]]
+        response = self.client.post('/api/v1/delivery_zones/', {'name': 'Dhaka', 'boundary': boundary}, format='json')
+        self.assertEqual(response.status_code, 201)
+
+
+class AddressTests(TestCase):
+    def setUp(self):
+        zone_index.loaded_at = None
+        self.zone = DeliveryZone.objects.create(name='Dhanmondi', boundary=DHANMONDI)
+        self.user = User.objects.create_user(email='customer@example.com')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_new_address_is_geocoded_and_zoned(self):
+        response = self.client.post('/api/v1/addresses/', {'street': 'Road 27', 'area': 'Dhanmondi', 'city': 'Dhaka'}, format='json')
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual((response.json()['latitude'], response.json()['longitude']), (23.7465, 90.3760))
+        self.assertEqual(response.json()['zone'], self.zone.id)
+        self.assertTrue(response.json()['is_default'])
+
+    def test_one_default_address(self):
+        first = self.client.post('/api/v1/addresses/', {'street': 'Road 27', 'city': 'Dhaka'}, format='json').json()
+        second = self.client.post('/api/v1/addresses/', {'street': 'Road 11', 'city': 'Dhaka', 'is_default': True}, format='json').json()
+
+        defaults = list(Address.objects.filter(user=self.user, is_default=True).values_list('id', flat=True))
+        self.assertEqual(defaults, [second['id']])
+        self.assertNotEqual(first['id'], second['id'])
+
+    def test_latitude_needs_longitude(self):
+        response = self.client.post('/api/v1/addresses/', {'street': 'Road 27', 'latitude': 23.75}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+
+@override_settings(DATABASE_REPLICAS={'ALIASES': []})
+class CheckoutZoneTests(TestCase):
+    def setUp(self):
+        zone_index.loaded_at = None
+        self.zone = DeliveryZone.objects.create(name='Dhanmondi', boundary=DHANMONDI)
+        self.user = User.objects.create_user(email='customer@example.com')
+        category = Category.objects.create(name='Soups', details='Hot soups')
+        food_item = FoodItem.objects.create(name='Chicken Soup', category=category, description='Soup', price='4.50', image='soup.jpg')
+        self.cart = Cart.objects.create(user=self.user)
+        CartItem.objects.create(cart=self.cart, food_item=food_item, quantity=1)
+
+    def test_order_goes_to_the_default_address_zone(self):
+        Address.objects.create(user=self.user, street='Road 27', city='Dhaka', latitude=23.75, longitude=90.38, is_default=True)
+
+        order = OrderServices.create_order(user=self.user, cart_id=self.cart.id)
+
+        self.assertEqual(order.delivery_zone_id, self.zone.id)
+        self.assertEqual((order.latitude, order.longitude), (23.75, 90.38))
+        self.assertEqual(order.address, 'Road 27, Dhaka')
+
+    def test_chosen_address_outside_every_zone(self):
+        Address.objects.create(user=self.user, street='Road 27', city='Dhaka', latitude=23.75, longitude=90.38, is_default=True)
+        far = Address.objects.create(user=self.user, street='Sector 7', area='Uttara', city='Dhaka', latitude=23.8759, longitude=90.3795)
+        client = APIClient()
+        client.force_authenticate(self.user)
+
+        response = client.post('/api/v1/orders/', {'cart_id': str(self.cart.id), 'address_id': far.id}, format='json')
+
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertIsNone(response.json()['delivery_zone'])
+
+    def test_someone_elses_address_is_rejected(self):
+        other = User.objects.create_user(email='other@example.com')
+        address = Address.objects.create(user=other, street='Road 27', city='Dhaka', latitude=23.75, longitude=90.38)
+        client = APIClient()
+        client.force_authenticate(self.user)
+
+        response = client.post('/api/v1/orders/', {'cart_id': str(self.cart.id), 'address_id': address.id}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_without_an_address(self):
+        order = OrderServices.create_order(user=self.user, cart_id=self.cart.id)
+        self.assertEqual(order.address, NO_ADDRESS)
+        self.assertIsNone(order.delivery_zone_id)
@@ -0,0 +1,234 @@
+from django.shortcuts import render
+from rest_framework.viewsets import ModelViewSet
+from rest_framework.decorators import action
+from rest_framework.permissions import IsAuthenticated, IsAdminUser, SAFE_METHODS
+from rest_framework.response import Response
+from delivery.models import Address, DeliveryZone
+from delivery.serializers import AddressSerializer, DeliveryZoneSerializer, ZoneLocationSerializer
+from delivery.spatial import get_zone_index
+from nomino.docs import swagger_auto_schema
+from nomino.docs import openapi
+
+# Create your views here.
+
+
+class DeliveryZoneViewSet(ModelViewSet):
+    """
+    API endpoint for managing delivery zones.
+    """
+    serializer_class = DeliveryZoneSerializer
+    queryset = DeliveryZone.objects.order_by('name')
+    
+    @swagger_auto_schema(
+        operation_summary="Return all delivery zones.",
+        responses={
+            200: openapi.Response(
+                description="List of delivery zones",
+                schema=DeliveryZoneSerializer(many=True)
+            ),
+            401: "Authentication credentials were not provided."
+        }
+    )
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+    
+    @swagger_auto_schema(
+        operation_summary="Create a delivery zone.",
+        operation_description="Only admin users can create delivery zones.",
+        responses={
+            201: openapi.Response(
+                description="Delivery zone created successfully",
+                schema=DeliveryZoneSerializer()
+            ),
+            400: "Validation error",
+            403: "You do not have permission to perform this action."
+        }
+    )
+    def create(self, request, *args, **kwargs):
+        return super().create(request, *args, **kwargs)
+
+    @swagger_auto_schema(
+        operation_summary="Return a delivery zone instance.",
+        responses={
+            200: openapi.Response(
+                description="Delivery zone details",
+                schema=DeliveryZoneSerializer()
+            ),
+            404: "Delivery zone not found."
+        }
+    )
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+    
+    @swagger_auto_schema(
+        operation_summary="Update a delivery zone.",
+        operation_description="Only admin users can update delivery zones.",
+        responses={
+            200: openapi.Response(
+                description="Delivery zone updated successfully",
+                schema=DeliveryZoneSerializer()
+            ),
+            400: "Validation error",
+            403: "You do not have permission to perform this action.",
+            404: "Delivery zone not found."
+        }
+    )
+    def update(self, request, *args, **kwargs):
+        return super().update(request, *args, **kwargs)
+    
+    @swagger_auto_schema(
+        operation_summary="Update a delivery zone with partial data.",
+        operation_description="Only admin users can partially update delivery zones.",
+        responses={
+            200: openapi.Response(
+                description="Delivery zone updated successfully",
+                schema=DeliveryZoneSerializer()
+            ),
+            400: "Validation error",
+            403: "You do not have permission to perform this action.",
+            404: "Delivery zone not found."
+        }
+    )
+    def partial_update(self, request, *args, **kwargs):
+        return super().partial_update(request, *args, **kwargs)
+    
+    @swagger_auto_schema(
+        operation_summary="Delete a delivery zone.",
+        operation_description="Only admin users can delete delivery zones.",
+        responses={
+            204: "Delivery zone deleted successfully.",
+            403: "You do not have permission to perform this action.",
+            404: "Delivery zone not found."
+        }
+    )
+    def destroy(self, request, *args, **kwargs):
+        return super().destroy(request, *args, **kwargs)
+    
+    @swagger_auto_schema(
+        operation_summary="Return the delivery zone containing a point.",
+        operation_description="`zone` is null when the point is outside every active zone.",
+        query_serializer=ZoneLocationSerializer,
+        responses={
+            200: openapi.Response(
+                description="Zone id, or null",
+                schema=openapi.Schema(
+                    type=openapi.TYPE_OBJECT,
+                    properties={
+                        'zone': openapi.Schema(type=openapi.TYPE_INTEGER, x_nullable=True)
+                    }
+                )
+            ),
+            400: "Validation error",
+        }
+    )
+    @action(detail=False, methods=['get'])
+    def locate(self, request):
+        serializer = ZoneLocationSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        point = serializer.validated_data
+        return Response({'zone': get_zone_index().locate(point['latitude'], point['longitude'])})
+    
+    def get_permissions(self):
+        if self.request.method in SAFE_METHODS:
+            return [IsAuthenticated()]
+        return [IsAdminUser()]
+    
+    def get_serializer_class(self):
+        if self.action == "locate":
+            return ZoneLocationSerializer
+        return DeliveryZoneSerializer
+    
+    
+class AddressViewSet(ModelViewSet):
+    """
+    API endpoint for managing the authenticated user's delivery addresses.
+    """
+    serializer_class = AddressSerializer
+    permission_classes = [IsAuthenticated]
+    
+    @swagger_auto_schema(
+        operation_summary="Return the authenticated user's addresses.",
+        responses={
+            200: openapi.Response(
+                description="List of addresses",
+                schema=AddressSerializer(many=True)
+            ),
+            401: "Authentication credentials were not provided."
+        }
+    )
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+    
+    @swagger_auto_schema(
+        operation_summary="Add an address.",
+        operation_description="Addresses sent without latitude and longitude are placed by the geocoder. The first address becomes the default.",
+        responses={
+            201: openapi.Response(
+                description="Address created successfully",
+                schema=AddressSerializer()
+            ),
+            400: "Validation error",
+            401: "Authentication credentials were not provided."
+        }
+    )
+    def create(self, request, *args, **kwargs):
+        return super().create(request, *args, **kwargs)
+
+    @swagger_auto_schema(
+        operation_summary="Return an address instance.",
+        responses={
+            200: openapi.Response(
+                description="Address details",
+                schema=AddressSerializer()
+            ),
+            404: "Address not found."
+        }
+    )
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+    
+    @swagger_auto_schema(
+        operation_summary="Update an address.",
+        responses={
+            200: openapi.Response(
+                description="Address updated successfully",
+                schema=AddressSerializer()
+            ),
+            400: "Validation error",
+            404: "Address not found."
+        }
+    )
+    def update(self, request, *args, **kwargs):
+        return super().update(request, *args, **kwargs)
+    
+    @swagger_auto_schema(
+        operation_summary="Update an address with partial data.",
+        responses={
+            200: openapi.Response(
+                description="Address updated successfully",
+                schema=AddressSerializer()
+            ),
+            400: "Validation error",
+            404: "Address not found."
+        }
+    )
+    def partial_update(self, request, *args, **kwargs):
+        return super().partial_update(request, *args, **kwargs)
+    
+    @swagger_auto_schema(
+        operation_summary="Delete an address.",
+        responses={
+            204: "Address deleted successfully.",
+            404: "Address not found."
+        }
+    )
+    def destroy(self, request, *args, **kwargs):
+        return super().destroy(request, *args, **kwargs)
+    
+    def get_queryset(self):
+        if getattr(self, 'swagger_fake_view', False):
+            return Address.objects.none()
+        return Address.objects.filter(user_id=self.request.user.id).order_by('-is_default', '-created_at')
+    
+    def get_serializer_context(self):
+        return {**super().get_serializer_context(), 'user': self.request.user}
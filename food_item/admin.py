@@ -1,8 +1,56 @@
 from django.contrib import admin
-from food_item.models import FoodItem, Category, Reviews
+from api.home import invalidate_menu_sections
+from food_item.models import FoodItem, Category, Reviews, FoodItemStock
+from nomino.admin import LargeTableAdminMixin
 
 # Register your models here.
 
-admin.site.register(FoodItem)
-admin.site.register(Category)
-admin.site.register(Reviews)
+
+@admin.register(Category)
+class CategoryAdmin(admin.ModelAdmin):
+    list_display = ('name', 'created_at')
+    search_fields = ['name']
+
+
+@admin.register(FoodItem)
+class FoodItemAdmin(LargeTableAdminMixin, admin.ModelAdmin):
+    list_display = ('name', 'category', 'price', 'is_special', 'created_at')
+    list_select_related = ('category',)
+    list_filter = ('is_special',)
+    autocomplete_fields = ['category']
+    search_fields = ['name']
+    actions = ['mark_special', 'unmark_special']
+
+    @admin.action(description="Mark selected food items as special")
+    def mark_special(self, request, queryset):
+        self.set_special(request, queryset, True)
+
+    @admin.action(description="Remove selected food items from the specials")
+    def unmark_special(self, request, queryset):
+        self.set_special(request, queryset, False)
+
+    def set_special(self, request, queryset, is_special):
+        updated = queryset.update(is_special=is_special)
+        # update() sends no post_save, so the home screen's cached menu is dropped here.
+        invalidate_menu_sections()
+        self.message_user(request, f"{updated} food items updated.")
+
+
+@admin.register(Reviews)
+class ReviewsAdmin(LargeTableAdminMixin, admin.ModelAdmin):
+    list_display = ('id', 'user', 'food_item', 'ratings', 'created_at')
+    list_select_related = ('user', 'food_item')
+    list_filter = ('ratings',)
+    autocomplete_fields = ['user', 'food_item']
+    search_fields = ['=user__email']
+    date_hierarchy = 'created_at'
+    ordering = ('-created_at',)
+
+
+@admin.register(FoodItemStock)
+class FoodItemStockAdmin(LargeTableAdminMixin, admin.ModelAdmin):
+    list_display = ('food_item', 'date', 'shard', 'quantity')
+    list_select_related = ('food_item',)
+    autocomplete_fields = ['food_item']
+    search_fields = ['food_item__name']
+    ordering = ('-date', 'food_item', 'shard')
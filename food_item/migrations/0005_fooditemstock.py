@@ -0,0 +1,28 @@
+# Generated by Django 5.2 on 2026-10-19 11:21
+
+import django.core.validators
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('food_item', '0004_alter_fooditem_image'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FoodItemStock',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('shard', models.PositiveSmallIntegerField(default=0)),
+                ('quantity', models.IntegerField(validators=[django.core.validators.MinValueValidator(0)])),
+                ('food_item', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='stock', to='food_item.fooditem')),
+            ],
+            options={
+                'unique_together': {('food_item', 'date', 'shard')},
+            },
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2 on 2026-10-19 12:06
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('food_item', '0005_fooditemstock'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='reviews',
+            index=models.Index(fields=['created_at'], name='food_item_r_created_61cb69_idx'),
+        ),
+    ]
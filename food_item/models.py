@@ -40,10 +40,27 @@ class Reviews(models.Model):
     comment = models.TextField()
     created_at = models.DateField(auto_now_add=True)
     
+    class Meta:
+        indexes = [models.Index(fields=['created_at'])]
+    
     def __str__(self):
         return f"Review by {self.user.first_name} on {self.food_item.name} ({self.ratings}/5)"
-    
-
 
 
+class FoodItemStock(models.Model):
+    """
+    Portions of a food item that can still be sold on a given day.
+    Items without a row for the day are not limited. Hot items can split their
+    stock across several shard rows so concurrent checkouts lock different rows.
+    """
+    food_item = models.ForeignKey(FoodItem, on_delete=models.CASCADE, related_name='stock')
+    date = models.DateField()
+    shard = models.PositiveSmallIntegerField(default=0)
+    quantity = models.IntegerField(validators=[MinValueValidator(0)])
     
+    class Meta:
+        unique_together = [['food_item', 'date', 'shard']]
+    
+    def __str__(self):
+        return f"{self.quantity} X food item {self.food_item_id} on {self.date} (shard {self.shard})"
+
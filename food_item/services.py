@@ -0,0 +1,91 @@
+import random
+from collections import defaultdict
+from django.db import transaction
+from django.db.models import F
+from food_item.models import FoodItemStock
+
+
+class StockServices:
+
+
+    @staticmethod
+    def set_daily_stock(food_item, date, quantity, shards=1):
+        """
+        Replace the stock of ``food_item`` on ``date``, spread evenly over ``shards`` rows.
+        """
+        base, extra = divmod(quantity, shards)
+        with transaction.atomic():
+            FoodItemStock.objects.filter(food_item=food_item, date=date).delete()
+            FoodItemStock.objects.bulk_create([
+                FoodItemStock(food_item=food_item, date=date, shard=shard, quantity=base + (1 if shard < extra else 0))
+                for shard in range(shards)
+            ])
+
+
+    @staticmethod
+    def reserve(lines, date):
+        """
+        Take ``lines`` ((food_item, quantity) pairs) out of the stock of ``date``.
+        Must run inside the checkout transaction, which rolls every reservation
+        back if any item is sold out. Returns the ids of the food items that had
+        limited stock and were reserved.
+        """
+        shards = defaultdict(list)
+        rows = FoodItemStock.objects.filter(date=date, food_item__in=[food_item for food_item, _ in lines]).values_list('food_item_id', 'shard')
+        for food_item_id, shard in rows:
+            shards[food_item_id].append(shard)
+
+        reserved = set()
+        for food_item, quantity in sorted(lines, key=lambda line: line[0].id):
+            if food_item.id not in shards:
+                continue
+            if not StockServices._take(food_item.id, date, shards[food_item.id], quantity):
+                raise ValueError(f"Sorry, {food_item.name} is sold out for today.")
+            reserved.add(food_item.id)
+        return reserved
+
+
+    @staticmethod
+    def release(lines, date):
+        """
+        Put ``lines`` ((food_item_id, quantity) pairs) back into the stock of ``date``.
+        """
+        quantities = defaultdict(int)
+        for food_item_id, quantity in lines:
+            quantities[food_item_id] += quantity
+        shards = defaultdict(list)
+        for food_item_id, pk in FoodItemStock.objects.filter(date=date, food_item_id__in=quantities).values_list('food_item_id', 'pk'):
+            shards[food_item_id].append(pk)
+
+        for food_item_id in sorted(shards):
+            FoodItemStock.objects.filter(pk=random.choice(shards[food_item_id])).update(
+                quantity=F('quantity') + quantities[food_item_id]
+            )
+
+
+    @staticmethod
+    def _take(food_item_id, date, shards, quantity):
+        # Fast path: a conditional `UPDATE ... SET quantity = quantity - n WHERE quantity >= n`
+        # on one shard, starting from a random one so checkouts spread over the shard rows.
+        shards = random.sample(shards, len(shards))
+        for shard in shards:
+            taken = FoodItemStock.objects.filter(
+                food_item_id=food_item_id, date=date, shard=shard, quantity__gte=quantity
+            ).update(quantity=F('quantity') - quantity)
+            if taken:
+                return True
+        if len(shards) == 1:
+            return False
+
+        # No single shard holds enough: lock them all and take what is left across them.
+        rows = list(FoodItemStock.objects.select_for_update().filter(food_item_id=food_item_id, date=date).order_by('shard'))
+        if sum(row.quantity for row in rows) < quantity:
+            return False
+        for row in rows:
+            taken = min(row.quantity, quantity)
+            if taken:
+                FoodItemStock.objects.filter(pk=row.pk).update(quantity=F('quantity') - taken)
+                quantity -= taken
+            if not quantity:
+                break
+        return True
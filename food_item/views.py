@@ -8,13 +8,14 @@ from food_item.filters import MenuFilter
 from rest_framework.permissions import IsAuthenticated, IsAdminUser, SAFE_METHODS
 from rest_framework.mixins import RetrieveModelMixin, ListModelMixin, UpdateModelMixin
 from food_item.pagination import DefaultPagination
-from drf_yasg.utils import swagger_auto_schema
-from drf_yasg import openapi
+from nomino.docs import swagger_auto_schema
+from nomino.docs import openapi
+from users.authentication import ClaimsOnlyReadsMixin
 
 # Create your views here.
 
 
-class FoodItemViewSet(ModelViewSet):
+class FoodItemViewSet(ClaimsOnlyReadsMixin, ModelViewSet):
     """
     API endpoint for managing food items.
 
@@ -23,6 +24,7 @@ class FoodItemViewSet(ModelViewSet):
     filter_backends = [DjangoFilterBackend, SearchFilter]
     serializer_class = FoodItemSerializer
     queryset = FoodItem.objects.select_related('category').all().order_by('id')
+    throttle_scope = 'menu'
     filterset_class = MenuFilter
     pagination_class = DefaultPagination
     search_fields = ['name']
@@ -332,12 +334,13 @@ class ReviewViewSet(ModelViewSet):
     
     
     
-class SpecialFoodItemViewSet(GenericViewSet,ListModelMixin,RetrieveModelMixin,UpdateModelMixin):
+class SpecialFoodItemViewSet(ClaimsOnlyReadsMixin, GenericViewSet,ListModelMixin,RetrieveModelMixin,UpdateModelMixin):
     """
     API endpoint for managing special food items.
     """
     permission_classes = [IsAuthenticated]
     queryset = FoodItem.objects.filter(is_special=True)
+    throttle_scope = 'menu'
 
     @swagger_auto_schema(
         operation_summary="Return all special food items.",
@@ -0,0 +1,46 @@
+import time
+from nomino.metrics import registry
+
+connections_opened = registry.counter(
+    'nomino_db_connections_opened_total',
+    "Database connections opened, or checked out when a connection pool is configured.",
+    ['alias', 'source'],
+)
+connections_reused = registry.counter(
+    'nomino_db_connections_reused_total',
+    "Requests (or other units of work) served by an already open connection.",
+    ['alias'],
+)
+connection_wait_seconds = registry.counter(
+    'nomino_db_connection_wait_seconds_total',
+    "Time spent connecting to the database or waiting for a pooled connection.",
+    ['alias'],
+)
+
+
+class ConnectionMetricsMixin:
+    """
+    DatabaseWrapper mixin counting opened and reused connections and the time spent getting one.
+    A unit of work ends whenever Django checks its connections, i.e. at the start and end of each request.
+    """
+    _reuse_counted = False
+
+    def get_new_connection(self, conn_params):
+        started = time.perf_counter()
+        connection = super().get_new_connection(conn_params)
+        connection_wait_seconds.inc(time.perf_counter() - started, alias=self.alias)
+        connections_opened.inc(alias=self.alias, source='pool' if getattr(self, 'pool', None) else 'new')
+        self._reuse_counted = True
+        return connection
+
+    def ensure_connection(self):
+        if self.connection is not None and not self._reuse_counted:
+            self._reuse_counted = True
+            connections_reused.inc(alias=self.alias)
+        super().ensure_connection()
+
+    def close_if_unusable_or_obsolete(self):
+        # The check itself uses the connection; that is not a reuse.
+        self._reuse_counted = True
+        super().close_if_unusable_or_obsolete()
+        self._reuse_counted = False
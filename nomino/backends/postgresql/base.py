@@ -0,0 +1,6 @@
+from django.db.backends.postgresql import base
+from nomino.backends.metrics import ConnectionMetricsMixin
+
+
+class DatabaseWrapper(ConnectionMetricsMixin, base.DatabaseWrapper):
+    pass
@@ -0,0 +1,6 @@
+from django.db.backends.sqlite3 import base
+from nomino.backends.metrics import ConnectionMetricsMixin
+
+
+class DatabaseWrapper(ConnectionMetricsMixin, base.DatabaseWrapper):
+    pass
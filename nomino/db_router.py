@@ -0,0 +1,102 @@
+import contextvars
+import random
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.functional import LazyObject
+from rest_framework.permissions import SAFE_METHODS
+
+DEFAULTS = {
+    'ALIASES': [],
+    'PATH_PREFIXES': [],
+    'STICKY_SECONDS': 15,
+}
+
+
+def get_setting(name):
+    return getattr(settings, 'DATABASE_REPLICAS', {}).get(name, DEFAULTS[name])
+
+
+# The request whose reads may go to a replica, set by ReplicaRoutingMiddleware.
+_replica_request = contextvars.ContextVar('replica_request', default=None)
+
+
+def primary_key(user_id):
+    return f"db-primary:{user_id}"
+
+
+def pin_to_primary(user):
+    """
+    Send ``user``'s reads to the primary for STICKY_SECONDS, so they see their own writes
+    before the replicas catch up.
+    """
+    cache.set(primary_key(user.pk), True, get_setting('STICKY_SECONDS'))
+
+
+def skip_pin_to_primary(request):
+    """
+    Keep ``request``'s user on the replicas after ``request``, an unsafe request that doesn't
+    write (e.g. a batch of reads).
+    """
+    request._pin_to_primary = False
+
+
+class ReplicaRouter:
+    """
+    Sends reads to a replica while ReplicaRoutingMiddleware allows it, and everything
+    else to ``default``.
+    """
+    def db_for_read(self, model, **hints):
+        request = _replica_request.get()
+        aliases = get_setting('ALIASES')
+        if request is None or not aliases or not self.replica_allowed(request):
+            return 'default'
+        return random.choice(aliases)
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def replica_allowed(self, request):
+        decision = request.__dict__.get('_replica_allowed')
+        if decision is not None:
+            return decision
+
+        # DRF stores the authenticated user on the Django request. Until it has (or while
+        # authentication itself is querying), the user is unknown: stay on the primary.
+        user = request.__dict__.get('user')
+        if user is None or isinstance(user, LazyObject):
+            return False
+
+        decision = not (user.is_authenticated and cache.get(primary_key(user.pk)))
+        request._replica_allowed = decision
+        return decision
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Lets safe (GET, HEAD, OPTIONS) requests under DATABASE_REPLICAS['PATH_PREFIXES'] read
+    from a replica, and pins users to the primary after each successful write, unless the view
+    called skip_pin_to_primary.
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if request.method not in SAFE_METHODS:
+            response = self.get_response(request)
+            user = request.__dict__.get('user')
+            pin = request.__dict__.get('_pin_to_primary', True)
+            if pin and response.status_code < 400 and user is not None and user.is_authenticated:
+                pin_to_primary(user)
+            return response
+
+        if not get_setting('ALIASES') or not request.path.startswith(tuple(get_setting('PATH_PREFIXES'))):
+            return self.get_response(request)
+
+        token = _replica_request.set(request)
+        try:
+            return self.get_response(request)
+        finally:
+            _replica_request.reset(token)
@@ -0,0 +1,216 @@
+import functools
+import gzip
+import hashlib
+import logging
+import threading
+from pathlib import Path
+from django.conf import settings
+from django.http import HttpRequest, HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    'PATH': None,
+    'MAX_AGE': 300,
+}
+
+
+def get_setting(name):
+    return getattr(settings, 'API_SCHEMA', {}).get(name, DEFAULTS[name])
+
+
+class _Deferred:
+    """
+    A ``drf_yasg.openapi`` attribute, or a call of one, looked up when the schema is generated.
+    """
+    def __init__(self, name, args=(), kwargs=None, called=False):
+        self.name, self.args, self.kwargs, self.called = name, args, kwargs or {}, called
+
+    def __call__(self, *args, **kwargs):
+        return _Deferred(self.name, args, kwargs, called=True)
+
+    def resolve(self):
+        from drf_yasg import openapi as drf_yasg_openapi
+        value = getattr(drf_yasg_openapi, self.name)
+        return value(*_resolve(self.args), **_resolve(self.kwargs)) if self.called else value
+
+
+class _DeferredModule:
+    def __getattr__(self, name):
+        return _Deferred(name)
+
+
+def _resolve(value):
+    if isinstance(value, _Deferred):
+        return value.resolve()
+    if isinstance(value, (list, tuple)):
+        return type(value)(_resolve(item) for item in value)
+    if isinstance(value, dict):
+        return {key: _resolve(item) for key, item in value.items()}
+    return value
+
+
+# Stand-ins for drf_yasg's ``openapi`` module and decorators, so the views don't import drf-yasg
+# when they load: the decorators are recorded and applied by apply_schema_decorators() the
+# first time the schema is generated.
+openapi = _DeferredModule()
+_decorators = []
+_decorators_lock = threading.Lock()
+
+
+def _deferred_decorator(name):
+    def decorator_factory(*args, **kwargs):
+        def decorator(function):
+            with _decorators_lock:
+                _decorators.append((name, function, args, kwargs))
+            return function
+        return decorator
+    return decorator_factory
+
+
+swagger_auto_schema = _deferred_decorator('swagger_auto_schema')
+swagger_serializer_method = _deferred_decorator('swagger_serializer_method')
+
+
+def apply_schema_decorators():
+    """
+    Apply the recorded drf_yasg decorators, in the order they were recorded, once every view is loaded.
+    """
+    from django.urls import get_resolver
+    from drf_yasg import utils
+
+    get_resolver().url_patterns
+    with _decorators_lock:
+        for name, function, args, kwargs in _decorators:
+            getattr(utils, name)(*_resolve(args), **_resolve(kwargs))(function)
+        _decorators.clear()
+
+
+def schema_path():
+    return Path(get_setting('PATH') or settings.BASE_DIR / 'openapi.json')
+
+
+def get_info():
+    from drf_yasg import openapi
+    return openapi.Info(
+        title="Nomino - E-commerce API",
+        default_version='v1',
+        description="API documentation for Nomino E-commerce project",
+        terms_of_service="https://www.google.com/policies/terms/",
+        contact=openapi.Contact(email="contact@nomino.com"),
+        license=openapi.License(name="BSD License"),
+    )
+
+
+def generate_schema():
+    """
+    Introspect every API view and return the OpenAPI document as JSON bytes.
+    """
+    from drf_yasg.codecs import OpenAPICodecJson
+    from drf_yasg.generators import OpenAPISchemaGenerator
+    from rest_framework.request import Request
+
+    apply_schema_decorators()
+    # The views inspect the request (method, user), so they get an anonymous GET request.
+    request = HttpRequest()
+    request.method = 'GET'
+    # With a url the generator doesn't take the host from the request; the document leaves the
+    # host and scheme out so clients use the ones it was served from.
+    schema = OpenAPISchemaGenerator(get_info(), url='http://localhost').get_schema(Request(request), public=True)
+    schema.pop('host', None)
+    schema.pop('schemes', None)
+    return OpenAPICodecJson(validators=[]).encode(schema)
+
+
+class SchemaDocument:
+    """
+    The OpenAPI document with its gzipped body and ETag, built once per process.
+    """
+    def __init__(self, content):
+        self.content = content
+        self.compressed = gzip.compress(content, mtime=0)
+        self.etag = f'"{hashlib.sha256(content).hexdigest()[:32]}"'
+
+
+_lock = threading.Lock()
+_document = None
+
+
+def get_schema_document():
+    """
+    The document prebuilt by `manage.py generate_schema`, or generated in memory on first use
+    when there is no prebuilt file.
+    """
+    global _document
+    if _document is None:
+        with _lock:
+            if _document is None:
+                path = schema_path()
+                if path.exists():
+                    _document = SchemaDocument(path.read_bytes())
+                else:
+                    logger.warning("No prebuilt API schema at %s, generating it. Run `manage.py generate_schema` when deploying.", path)
+                    _document = SchemaDocument(generate_schema())
+    return _document
+
+
+def reset_schema_document():
+    global _document
+    with _lock:
+        _document = None
+
+
+def openapi_json(request, *args, **kwargs):
+    """
+    The OpenAPI document, gzipped for clients that accept it, and revalidated with its ETag.
+    """
+    document = get_schema_document()
+    response = get_conditional_response(request, etag=document.etag)
+    if response is None:
+        if 'gzip' in request.headers.get('Accept-Encoding', ''):
+            response = HttpResponse(document.compressed, content_type='application/json')
+            response['Content-Encoding'] = 'gzip'
+        else:
+            response = HttpResponse(document.content, content_type='application/json')
+    response['ETag'] = document.etag
+    patch_vary_headers(response, ['Accept-Encoding'])
+    patch_cache_control(response, public=True, max_age=get_setting('MAX_AGE'))
+    return response
+
+
+@functools.cache
+def schema_ui_view(renderer):
+    """
+    The drf-yasg UI page, created on the first docs request rather than when the URLconf is
+    imported. The page only shows the title and version, so it is rendered without
+    introspecting the API; the browser then loads the document from `?format=openapi`.
+    """
+    from drf_yasg import openapi
+    from drf_yasg.generators import OpenAPISchemaGenerator
+    from drf_yasg.views import get_schema_view
+    from rest_framework import permissions
+
+    class InfoOnlyGenerator(OpenAPISchemaGenerator):
+        def get_schema(self, request=None, public=False):
+            return openapi.Swagger(info=self.info, _prefix='/', _version=self.version, paths=openapi.Paths({}))
+
+    view = get_schema_view(
+        get_info(),
+        public=True,
+        permission_classes=(permissions.AllowAny,),
+        generator_class=InfoOnlyGenerator,
+    )
+    return view.with_ui(renderer, cache_timeout=0)
+
+
+def swagger(request, *args, **kwargs):
+    if request.GET.get('format') == 'openapi':
+        return openapi_json(request)
+    return schema_ui_view('swagger')(request, *args, **kwargs)
+
+
+def redoc(request, *args, **kwargs):
+    if request.GET.get('format') == 'openapi':
+        return openapi_json(request)
+    return schema_ui_view('redoc')(request, *args, **kwargs)
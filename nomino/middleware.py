@@ -0,0 +1,80 @@
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.handlers.exception import convert_exception_to_response
+from django.utils.module_loading import import_string
+
+DEFAULTS = {
+    'LEAN_PREFIXES': [],
+    'MIDDLEWARE': [],
+}
+
+
+def get_setting(name):
+    return getattr(settings, 'SCOPED_MIDDLEWARE', {}).get(name, DEFAULTS[name])
+
+
+class ScopedMiddleware:
+    """
+    Runs the middleware listed in SCOPED_MIDDLEWARE['MIDDLEWARE'] (sessions, CSRF, auth,
+    messages) for every request except those under SCOPED_MIDDLEWARE['LEAN_PREFIXES'], which
+    skip them. The JWT API authenticates in DRF and uses none of them, while the admin and the
+    browsable API login still get the full stack.
+
+    The wrapped middleware are chained the way Django chains MIDDLEWARE, and their
+    process_view (the CSRF check), process_template_response and process_exception hooks are
+    called from this middleware's hooks, at its position in MIDDLEWARE.
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.lean_prefixes = tuple(get_setting('LEAN_PREFIXES'))
+        self.view_middleware = []
+        self.template_response_middleware = []
+        self.exception_middleware = []
+
+        handler = convert_exception_to_response(get_response)
+        for middleware_path in reversed(get_setting('MIDDLEWARE')):
+            middleware = import_string(middleware_path)
+            try:
+                instance = middleware(handler)
+            except MiddlewareNotUsed:
+                continue
+            if hasattr(instance, 'process_view'):
+                self.view_middleware.insert(0, instance.process_view)
+            if hasattr(instance, 'process_template_response'):
+                self.template_response_middleware.append(instance.process_template_response)
+            if hasattr(instance, 'process_exception'):
+                self.exception_middleware.append(instance.process_exception)
+            handler = convert_exception_to_response(instance)
+        self.full_stack = handler
+
+    def is_lean(self, request):
+        return request.path_info.startswith(self.lean_prefixes)
+
+    def __call__(self, request):
+        if self.is_lean(request):
+            return self.get_response(request)
+        return self.full_stack(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if self.is_lean(request):
+            return None
+        for process_view in self.view_middleware:
+            response = process_view(request, view_func, view_args, view_kwargs)
+            if response is not None:
+                return response
+        return None
+
+    def process_template_response(self, request, response):
+        if not self.is_lean(request):
+            for process_template_response in self.template_response_middleware:
+                response = process_template_response(request, response)
+        return response
+
+    def process_exception(self, request, exception):
+        if self.is_lean(request):
+            return None
+        for process_exception in self.exception_middleware:
+            response = process_exception(request, exception)
+            if response is not None:
+                return response
+        return None
@@ -0,0 +1,187 @@
+import contextvars
+import logging
+import random
+import re
+import time
+from collections import Counter
+from django.conf import settings
+from django.db import connections
+from rest_framework.serializers import BaseSerializer
+from nomino.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    'SAMPLE_RATE': 0.1,
+    'SERVER_TIMING': True,
+    'REPEATED_QUERY_THRESHOLD': 5,
+    'METRICS_TOKEN': '',
+}
+
+
+def get_setting(name):
+    return getattr(settings, 'PERFORMANCE', {}).get(name, DEFAULTS[name])
+
+
+requests_total = registry.counter(
+    'nomino_requests_total', "Requests handled, by view, method and status code.", ['view', 'method', 'status']
+)
+request_duration = registry.histogram(
+    'nomino_request_duration_seconds', "Time to handle sampled requests.", ['view', 'method']
+)
+request_db_duration = registry.histogram(
+    'nomino_request_db_duration_seconds', "Database time of sampled requests.", ['view', 'method']
+)
+request_phase_duration = registry.histogram(
+    'nomino_request_phase_duration_seconds', "Time sampled requests spent in the view, serializing and rendering.",
+    ['view', 'method', 'phase']
+)
+request_db_queries = registry.histogram(
+    'nomino_request_db_queries', "Database queries made by sampled requests.", ['view', 'method'],
+    buckets=(0, 1, 2, 5, 10, 20, 50, 100)
+)
+repeated_queries = registry.counter(
+    'nomino_repeated_queries_total', "Sampled requests that ran the same query repeatedly (N+1).", ['view']
+)
+
+# Lists of placeholders have a length that depends on the data: `IN (%s, %s)` -> `IN (...)`.
+PLACEHOLDER_LIST = re.compile(r'\((?:%s|\?)(?:, ?(?:%s|\?))*\)')
+NUMBER = re.compile(r'\b\d+\b')
+STRING = re.compile(r"'(?:[^']|'')*'")
+
+
+def fingerprint(sql):
+    """
+    The query with its literal values removed, so the same query with different parameters matches.
+    """
+    return PLACEHOLDER_LIST.sub('(...)', NUMBER.sub('?', STRING.sub('?', sql)))
+
+
+# The timings of the request being handled, for instrumented code that has no request at hand.
+_current_performance = contextvars.ContextVar('current_performance', default=None)
+_serializing = contextvars.ContextVar('serializing', default=False)
+
+
+def instrument_serializers():
+    """
+    Time every top-level evaluation of a DRF ``serializer.data`` into the current request's
+    ``serialize`` phase. Nested serializers are counted with the one that contains them.
+    """
+    data = BaseSerializer.data.fget
+    if getattr(data, 'instrumented', False):
+        return
+
+    def timed_data(serializer):
+        performance = _current_performance.get()
+        if performance is None or _serializing.get():
+            return data(serializer)
+        token = _serializing.set(True)
+        started = time.perf_counter()
+        try:
+            return data(serializer)
+        finally:
+            # Sections serialized concurrently (e.g. by the home screen's worker pool) add up.
+            performance['serialize'] = performance.get('serialize', 0) + time.perf_counter() - started
+            _serializing.reset(token)
+
+    timed_data.instrumented = True
+    BaseSerializer.data = property(timed_data)
+
+
+class QueryRecorder:
+    """
+    Database execute wrapper counting queries and their time, and their fingerprints when sampled.
+    """
+    def __init__(self, fingerprints):
+        self.count = 0
+        self.duration = 0
+        self.fingerprints = Counter() if fingerprints else None
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - started
+            self.count += 1
+            if self.fingerprints is not None:
+                self.fingerprints[fingerprint(sql)] += 1
+
+
+class PerformanceMiddleware:
+    """
+    Measures each request: total time, database queries and their time, time spent in the
+    view, serializing (evaluating DRF ``serializer.data``) and rendering the response. The
+    view time excludes serialization. The timings are sent back in a ``Server-Timing`` header.
+
+    A sample of requests (PERFORMANCE['SAMPLE_RATE']) is also added to per-view histograms,
+    exposed on the metrics endpoint, and checked for repeated queries (N+1), which are logged.
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+        instrument_serializers()
+
+    def __call__(self, request):
+        started = time.perf_counter()
+        sampled = random.random() < get_setting('SAMPLE_RATE')
+        recorder = QueryRecorder(fingerprints=sampled)
+        request._performance = {}
+        token = _current_performance.set(request._performance)
+
+        # Same as connection.execute_wrapper() for every database, without the context manager overhead.
+        wrappers = [connections[alias].execute_wrappers for alias in connections]
+        for execute_wrappers in wrappers:
+            execute_wrappers.append(recorder)
+        try:
+            response = self.get_response(request)
+        finally:
+            for execute_wrappers in wrappers:
+                execute_wrappers.remove(recorder)
+            _current_performance.reset(token)
+
+        total = time.perf_counter() - started
+        match = request.resolver_match
+        view = match.view_name if match else 'unmatched'
+        requests_total.inc(view=view, method=request.method, status=response.status_code)
+
+        phases = list(self.phases(request._performance))
+        if get_setting('SERVER_TIMING'):
+            timings = [f'db;dur={recorder.duration * 1000:.2f};desc="{recorder.count} queries"']
+            timings.extend(f'{name};dur={duration * 1000:.2f}' for name, duration in phases)
+            timings.append(f'total;dur={total * 1000:.2f}')
+            response['Server-Timing'] = ', '.join(timings)
+
+        if sampled:
+            request_duration.observe(total, view=view, method=request.method)
+            request_db_duration.observe(recorder.duration, view=view, method=request.method)
+            request_db_queries.observe(recorder.count, view=view, method=request.method)
+            for name, duration in phases:
+                request_phase_duration.observe(duration, view=view, method=request.method, phase=name)
+            self.check_repeated_queries(request, view, recorder.fingerprints)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request._performance['view_started'] = time.perf_counter()
+
+    def process_template_response(self, request, response):
+        # Runs after the view returns and right before the response (e.g. a DRF Response) is rendered.
+        performance = request._performance
+        performance['render_started'] = time.perf_counter()
+        response.add_post_render_callback(lambda response: performance.__setitem__('render_finished', time.perf_counter()))
+        return response
+
+    def phases(self, performance):
+        if 'view_started' in performance and 'render_started' in performance:
+            serialize = performance.get('serialize', 0)
+            yield 'view', max(performance['render_started'] - performance['view_started'] - serialize, 0)
+            yield 'serialize', serialize
+            if 'render_finished' in performance:
+                yield 'render', performance['render_finished'] - performance['render_started']
+
+    def check_repeated_queries(self, request, view, fingerprints):
+        threshold = get_setting('REPEATED_QUERY_THRESHOLD')
+        repeated = [(sql, count) for sql, count in fingerprints.most_common(3) if count >= threshold]
+        if repeated:
+            repeated_queries.inc(view=view)
+            for sql, count in repeated:
+                logger.warning("%s %s ran the same query %d times: %s", request.method, request.path, count, sql)
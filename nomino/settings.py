@@ -10,10 +10,10 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+from importlib.util import find_spec
 from pathlib import Path
 from datetime import timedelta
-from decouple import config
-import cloudinary
+from decouple import config, Csv
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -25,7 +25,7 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 SECRET_KEY = 'django-insecure-q*(zy3+vy(ku936(o5u48+7@twuyf5+3)$g=ut%iw*)qu0t!26'
 
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
+DEBUG = config('debug', default=False, cast=bool)
 
 
 AUTH_USER_MODEL = 'users.User'
@@ -43,34 +43,81 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
-    'drf_yasg',
     'rest_framework',
     'djoser',
-    'debug_toolbar',
     'api',
     'food_item',
     'orders',
-    'users'
+    'users',
+    'analytics',
+    'notifications',
+    'delivery'
 ]
 
 MIDDLEWARE = [
+    'nomino.performance.PerformanceMiddleware',
     'django.middleware.security.SecurityMiddleware',
     "whitenoise.middleware.WhiteNoiseMiddleware",
-    'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
-    'django.middleware.csrf.CsrfViewMiddleware',
-    'django.contrib.auth.middleware.AuthenticationMiddleware',
-    'django.contrib.messages.middleware.MessageMiddleware',
-    'django.middleware.clickjacking.XFrameOptionsMiddleware',
-    "debug_toolbar.middleware.DebugToolbarMiddleware",
+    'nomino.middleware.ScopedMiddleware',
+    'nomino.db_router.ReplicaRoutingMiddleware',
 ]
 
+# The JWT API doesn't use sessions, CSRF (DRF views are exempt), Django's auth middleware
+# (DRF authenticates) or messages, so requests under LEAN_PREFIXES skip these. The admin,
+# the browsable API login (/api-auth/) and every other path run them as usual.
+SCOPED_MIDDLEWARE = {
+    'LEAN_PREFIXES': ['/api/v1/'],
+    'MIDDLEWARE': [
+        'django.contrib.sessions.middleware.SessionMiddleware',
+        'django.middleware.csrf.CsrfViewMiddleware',
+        'django.contrib.auth.middleware.AuthenticationMiddleware',
+        'django.contrib.messages.middleware.MessageMiddleware',
+        'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    ],
+}
+
+# These checks look for the middleware directly in MIDDLEWARE; they run from ScopedMiddleware.
+SILENCED_SYSTEM_CHECKS = ['admin.E408', 'admin.E409', 'admin.E410', 'security.W002', 'security.W003']
+
+# The debug toolbar is a development tool only.
+if DEBUG:
+    INSTALLED_APPS.append('debug_toolbar')
+    MIDDLEWARE.append('debug_toolbar.middleware.DebugToolbarMiddleware')
+
+# Per-request timings (Server-Timing header) and sampled per-view metrics, served on
+# /metrics/ to requests with `Authorization: Bearer <metrics_token>`.
+PERFORMANCE = {
+    'SAMPLE_RATE': 0.1,
+    'SERVER_TIMING': True,
+    'REPEATED_QUERY_THRESHOLD': 5,
+    'METRICS_TOKEN': config('metrics_token', default=''),
+}
+
+# The WSGI entry point loads the URLconf, API views and DRF classes while the process starts
+# instead of on the first request. The API docs are loaded on their first request.
+STARTUP = {
+    'WARM_UP': config('startup_warm_up', default=True, cast=bool),
+    'CONNECT_DATABASE': config('startup_connect_database', default=False, cast=bool),
+}
+
+# /swagger/ and /redoc/ serve the OpenAPI document written by `manage.py generate_schema` at
+# deploy time; without the file it is generated once per process on the first docs request.
+API_SCHEMA = {
+    'PATH': BASE_DIR / 'openapi.json',
+    'MAX_AGE': 300,
+}
+
 ROOT_URLCONF = 'nomino.urls'
 
+# drf-yasg is only imported when the API docs are first requested (see nomino/docs.py), so it
+# isn't an installed app; its templates and static files are found from the package directory.
+DRF_YASG_DIR = Path(find_spec('drf_yasg').submodule_search_locations[0])
+
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
-        'DIRS': [],
+        'DIRS': [DRF_YASG_DIR / 'templates'],
         'APP_DIRS': True,
         'OPTIONS': {
             'context_processors': [
@@ -101,7 +148,7 @@ MEDIA_ROOT = BASE_DIR / 'media'
 
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.postgresql',
+        'ENGINE': 'nomino.backends.postgresql',
         'NAME': config('dbname'),
         'USER': config('user'),
         'PASSWORD': config('password'),
@@ -110,12 +157,55 @@ DATABASES = {
     }
 }
 
-cloudinary.config( 
-    cloud_name = config('cloud_name'), 
-    api_key = config('cloudinary_api_key'), 
-    api_secret = config('api_secret'), 
-    secure=True
-)
+# How database connections are handled, set with `db_pooling`:
+# - off: open a new connection for every request.
+# - persistent: keep each worker's connection open for `db_conn_max_age` seconds and
+#   check that it still works before reusing it.
+# - pool: share a psycopg connection pool between the threads of a worker (e.g. ASGI).
+#   Requires psycopg 3 with the pool extra (`pip install "psycopg[binary,pool]"`).
+DB_POOLING = config('db_pooling', default='persistent')
+if DB_POOLING == 'persistent':
+    DATABASES['default']['CONN_MAX_AGE'] = config('db_conn_max_age', default=60, cast=int)
+    DATABASES['default']['CONN_HEALTH_CHECKS'] = True
+elif DB_POOLING == 'pool':
+    DATABASES['default']['OPTIONS'] = {
+        'pool': {
+            'min_size': config('db_pool_min_size', default=2, cast=int),
+            'max_size': config('db_pool_max_size', default=10, cast=int),
+            'timeout': config('db_pool_timeout', default=10, cast=int),
+        }
+    }
+
+# Read replicas of the default database, one alias per host in `replica_hosts`.
+# Safe requests under PATH_PREFIXES read from them (see nomino.db_router); a user's
+# reads stay on the primary for STICKY_SECONDS after they write.
+DATABASE_REPLICAS = {
+    'ALIASES': [],
+    'PATH_PREFIXES': [
+        '/api/v1/food_items/',
+        '/api/v1/special_foods/',
+        '/api/v1/categories/',
+        '/api/v1/orders/',
+        '/api/v1/reports/',
+    ],
+    'STICKY_SECONDS': 15,
+}
+for index, replica_host in enumerate(config('replica_hosts', default='', cast=Csv())):
+    alias = f'replica{index + 1}'
+    DATABASES[alias] = {**DATABASES['default'], 'HOST': replica_host, 'TEST': {'MIRROR': 'default'}}
+    DATABASE_REPLICAS['ALIASES'].append(alias)
+
+DATABASE_ROUTERS = ['nomino.db_router.ReplicaRouter']
+
+# Read by the Cloudinary SDK itself when it is first imported (by the food_item models), so
+# importing the settings doesn't import the SDK. CLOUDINARY_URL in the process environment
+# takes precedence, as documented by the SDK.
+CLOUDINARY = {
+    'cloud_name': config('cloud_name'),
+    'api_key': config('cloudinary_api_key'),
+    'api_secret': config('api_secret'),
+    'secure': True,
+}
 CLOUDINARY_URL = config("CLOUDINARY_URL")
 
 
@@ -166,6 +256,7 @@ INTERNAL_IPS = [
 
 STATIC_URL = 'static/'
 STATIC_ROOT = BASE_DIR / "staticfiles"
+STATICFILES_DIRS = [DRF_YASG_DIR / 'static']
 # STATIC_FILES_DIR = BASE_DIR / "statcic"
 
 STATICFILES_STORAGE = "whitenoise.storage.CompressedStaticFilesStorage"
@@ -191,9 +282,31 @@ DJOSER = {
 
 REST_FRAMEWORK = {
     'COERCE_DECIMAL_TO_STRING' : False,
+    'DEFAULT_RENDERER_CLASSES': (
+        'api.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'api.parsers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'users.authentication.CachedJWTAuthentication',
+    ),
+    'DEFAULT_THROTTLE_CLASSES': (
+        'api.throttling.AnonTokenBucketThrottle',
+        'api.throttling.UserTokenBucketThrottle',
+        'api.throttling.ScopedTokenBucketThrottle',
     ),
+    # Token buckets: "N/period" allows bursts of N requests, refilled at N per period.
+    # Scoped rates apply per user (or IP) to views with a matching throttle_scope.
+    'DEFAULT_THROTTLE_RATES': {
+        'anon': '60/min',
+        'user': '600/min',
+        'menu': '120/min',
+        'orders': '120/min',
+    },
 }
 
 
@@ -201,10 +314,117 @@ SIMPLE_JWT = {
     'AUTH_HEADER_TYPES': ('JWT',),
     "ACCESS_TOKEN_LIFETIME": timedelta(days=5),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=1),
+    "TOKEN_OBTAIN_SERIALIZER": "users.serializers.TokenObtainPairSerializer",
+}
+
+
+JWT_USER_CACHE = {
+    'LOCAL_TTL_SECONDS': 5,
+    'SHARED_TTL_SECONDS': 60,
+}
+
+
+# Shared cache for cached users and other cross-process state.
+# Set REDIS_URL (requires the redis package) to share it between workers; defaults to per-process memory.
+REDIS_URL = config('REDIS_URL', default='')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+
+ORDER_EVENTS = {
+    'BROKER': 'orders.events.InMemoryOrderEventBroker',
+    'HEARTBEAT_SECONDS': 15,
+    'QUEUE_SIZE': 100,
 }
 
 
-EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
+KITCHEN_QUEUE = {
+    'PREP_MINUTES': 20,
+    'RESYNC_SECONDS': 30,
+}
+
+
+# GET /api/v1/home/ loads its sections concurrently on MAX_WORKERS threads, each cached for
+# CACHE_SECONDS[section] (0: never cached). Sections slower than TIMEOUT_SECONDS come back as null.
+HOME_SCREEN = {
+    'MAX_WORKERS': 4,
+    'TIMEOUT_SECONDS': 2,
+    'CACHE_SECONDS': {
+        'categories': 300,
+        'specials': 60,
+        'bestsellers': 600,
+        'cart': 0,
+        'latest_order': 0,
+    },
+}
+
+
+# POST /api/v1/batch/ runs up to MAX_REQUESTS API requests; consecutive reads run on MAX_WORKERS threads.
+BATCH_REQUESTS = {
+    'MAX_REQUESTS': 20,
+    'MAX_WORKERS': 4,
+}
+
+
+# Admin changelists take their row counts from the PostgreSQL planner estimate once it
+# reaches this many rows, instead of running COUNT(*).
+ADMIN_PAGINATION = {
+    'ESTIMATED_COUNT_THRESHOLD': 100000,
+}
+
+
+# Orders and carts get time-ordered (version 7 UUID) ids. Once `manage.py rekey_uuid7` has
+# rewritten the older random ids, RANGE_BY_ID lets created_at ranges be read by id as well.
+ORDER_IDS = {
+    'RANGE_BY_ID': False,
+    'CLOCK_SKEW_SECONDS': 60,
+    'REKEY_BATCH_SIZE': 1000,
+}
+
+
+# `manage.py sweep_abandoned_carts` deletes carts unchanged for IDLE_DAYS, BATCH_SIZE carts
+# per transaction, adding them to the DailyAbandonedCarts rollup first when RECORD_STATS is on.
+ABANDONED_CARTS = {
+    'IDLE_DAYS': 30,
+    'BATCH_SIZE': 500,
+    'RECORD_STATS': True,
+}
+
+
+# Addresses are placed by GEOCODER (the offline stand-in knows the areas in PLACES) and
+# matched to delivery zones with an in-memory grid of GRID_CELL_DEGREES cells, reloaded
+# every RESYNC_SECONDS to pick up zones changed by other processes.
+DELIVERY = {
+    'GEOCODER': 'delivery.geocoders.OfflineGeocoder',
+    'GRID_CELL_DEGREES': 0.01,
+    # Zones whose bounding box spans more cells are rejected; 10000 cells is about 110 km square.
+    'MAX_ZONE_CELLS': 10000,
+    'RESYNC_SECONDS': 60,
+}
+
+
+# Emails are queued in the database and delivered by `python manage.py send_queued_emails`,
+# so requests never wait on the mail server.
+EMAIL_BACKEND = 'notifications.backends.QueuedEmailBackend'
+EMAIL_DELIVERY_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
+EMAIL_QUEUE = {
+    'BATCH_SIZE': 100,
+    'MAX_ATTEMPTS': 5,
+    'RETRY_SECONDS': 60,
+    # An email claimed by a worker that died is sent again after this long.
+    'CLAIM_SECONDS': 300,
+}
 EMAIL_HOST = config('EMAIL_HOST')
 EMAIL_USE_TLS = config('EMAIL_USE_TLS',cast=bool)
 EMAIL_PORT = config('EMAIL_PORT',cast=int)
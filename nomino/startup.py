@@ -0,0 +1,42 @@
+import logging
+import time
+from django.conf import settings
+from django.db import connections
+from django.urls import get_resolver
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    'WARM_UP': True,
+    'CONNECT_DATABASE': False,
+}
+
+
+def get_setting(name):
+    return getattr(settings, 'STARTUP', {}).get(name, DEFAULTS[name])
+
+
+def warm_up():
+    """
+    Load what the first API request would otherwise load, while the process starts (on
+    serverless platforms the init phase, before the first request is waiting):
+    the URLconf and with it every API view, serializer and model, DRF's renderers,
+    parsers and authentication classes, and optionally the database connection.
+    The API docs views are not loaded here, only on their first request.
+    Returns the seconds it took.
+    """
+    started = time.perf_counter()
+    get_resolver().url_patterns
+    from rest_framework.settings import api_settings
+    for name in ('DEFAULT_RENDERER_CLASSES', 'DEFAULT_PARSER_CLASSES', 'DEFAULT_AUTHENTICATION_CLASSES',
+                 'DEFAULT_PERMISSION_CLASSES', 'DEFAULT_THROTTLE_CLASSES', 'DEFAULT_FILTER_BACKENDS'):
+        getattr(api_settings, name)
+    if get_setting('CONNECT_DATABASE'):
+        try:
+            connections['default'].ensure_connection()
+        except Exception:
+            logger.exception("Could not connect to the database during warm up.")
+    elapsed = time.perf_counter() - started
+    logger.debug("Warmed up in %.1f ms.", elapsed * 1000)
+    return elapsed
+
@@ -16,39 +16,24 @@ Including another URLconf
 """
 from django.contrib import admin
 from django.urls import path, include
-from .views import api_root
+from .views import api_root, metrics
 from django.conf import settings
 from django.conf.urls.static import static
-from debug_toolbar.toolbar import debug_toolbar_urls
-from rest_framework import permissions
-from drf_yasg.views import get_schema_view
-from drf_yasg import openapi
-
-
-
-schema_view = get_schema_view(
-   openapi.Info(
-      title="Nomino - E-commerce API",
-      default_version='v1',
-      description="API documentation for Nomino E-commerce project",
-      terms_of_service="https://www.google.com/policies/terms/",
-      contact=openapi.Contact(email="contact@nomino.com"),
-      license=openapi.License(name="BSD License"),
-   ),
-   public=True,
-   permission_classes=(permissions.AllowAny,),
-)
-
-
+from .docs import swagger, redoc, openapi_json
 
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api-auth/', include('rest_framework.urls')),
     path('',api_root),
+    path('metrics/', metrics, name='metrics'),
     path('api/v1/', include('api.urls'), name='api-root'),
-    path('swagger/', schema_view.with_ui('swagger', cache_timeout=0), name='schema-swagger-ui'),
-    path('redoc/', schema_view.with_ui('redoc', cache_timeout=0), name='schema-redoc'),
-
-] + debug_toolbar_urls()
+    path('swagger/', swagger, name='schema-swagger-ui'),
+    path('redoc/', redoc, name='schema-redoc'),
+    path('openapi.json', openapi_json, name='schema-json'),
+
+]
+if 'debug_toolbar' in settings.INSTALLED_APPS:
+    from debug_toolbar.toolbar import debug_toolbar_urls
+    urlpatterns += debug_toolbar_urls()
 urlpatterns += static(settings.MEDIA_URL, document_root = settings.MEDIA_ROOT)
@@ -1,5 +1,24 @@
+from django.http import HttpResponse, HttpResponseForbidden
 from django.shortcuts import redirect
+from django.utils.crypto import constant_time_compare
+from nomino.metrics import registry
+from nomino.performance import get_setting
 
 
 def api_root(request):
-    return redirect('api-root')
\ No newline at end of file
+    return redirect('api-root')
+
+
+def metrics(request):
+    """
+    Metrics of this process in the Prometheus text format. Scrapers authenticate with
+    `Authorization: Bearer <metrics_token>`; without a token configured, only staff can see them.
+    """
+    token = get_setting('METRICS_TOKEN')
+    if token:
+        allowed = constant_time_compare(request.headers.get('Authorization', ''), f"Bearer {token}")
+    else:
+        allowed = request.user.is_staff
+    if not allowed:
+        return HttpResponseForbidden()
+    return HttpResponse(registry.exposition(), content_type='text/plain; version=0.0.4; charset=utf-8')
\ No newline at end of file
@@ -14,3 +14,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'nomino.settings')
 
 app = get_wsgi_application()
+
+from nomino.startup import get_setting, warm_up  # noqa: E402 (needs the settings configured above)
+
+if get_setting('WARM_UP'):
+    warm_up()
@@ -0,0 +1,25 @@
+from django.contrib import admin
+from django.utils import timezone
+from nomino.admin import LargeTableAdminMixin
+from notifications.models import QueuedEmail
+
+# Register your models here.
+
+
+@admin.register(QueuedEmail)
+class QueuedEmailAdmin(LargeTableAdminMixin, admin.ModelAdmin):
+    list_display = ('id', 'subject', 'status', 'attempts', 'created_at', 'sent_at')
+    list_filter = ('status',)
+    date_hierarchy = 'created_at'
+    ordering = ('-created_at',)
+    readonly_fields = ('message', 'attempts', 'last_error', 'created_at', 'sent_at')
+    actions = ['retry_now']
+
+    @admin.display(description="Subject")
+    def subject(self, obj):
+        return obj.message.get('subject')
+
+    @admin.action(description="Retry selected emails on the next send")
+    def retry_now(self, request, queryset):
+        updated = queryset.exclude(status__in=[QueuedEmail.SENT, QueuedEmail.SENDING]).update(status=QueuedEmail.PENDING, next_attempt_at=timezone.now())
+        self.message_user(request, f"{updated} emails queued again.")
@@ -0,0 +1,18 @@
+from django.core.mail.backends.base import BaseEmailBackend
+from notifications.services import EmailQueueServices
+
+
+class QueuedEmailBackend(BaseEmailBackend):
+    """
+    Stores outgoing emails in the QueuedEmail table instead of talking to a mail server.
+    Run `python manage.py send_queued_emails` to deliver them through EMAIL_DELIVERY_BACKEND.
+    """
+    def send_messages(self, email_messages):
+        if not email_messages:
+            return 0
+        try:
+            return EmailQueueServices.enqueue(email_messages)
+        except Exception:
+            if not self.fail_silently:
+                raise
+            return 0
@@ -0,0 +1,34 @@
+import time
+from django.core.management.base import BaseCommand
+from notifications.services import EmailQueueServices, get_setting
+
+
+class Command(BaseCommand):
+    help = "Deliver queued emails in batches over one reused connection."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=None, help="Emails sent per connection.")
+        parser.add_argument('--max-attempts', type=int, default=None, help="Attempts before an email is marked failed.")
+        parser.add_argument('--loop', action='store_true', help="Keep polling for new emails instead of exiting once the queue is drained.")
+        parser.add_argument('--interval', type=float, default=5, help="Seconds to wait between polls with --loop.")
+        parser.add_argument('--status', action='store_true', help="Only report the queue depth.")
+
+    def handle(self, *args, **options):
+        if options['status']:
+            for status, count in EmailQueueServices.queue_depth().items():
+                self.stdout.write(f"{status}: {count}")
+            return
+
+        batch_size = options['batch_size'] or get_setting('BATCH_SIZE')
+        while True:
+            sent, failed = EmailQueueServices.send_batch(batch_size=batch_size, max_attempts=options['max_attempts'])
+            if sent or failed:
+                self.stdout.write(f"Sent {sent}, failed {failed}")
+            if sent + failed == batch_size:
+                continue
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
+
+        depth = EmailQueueServices.queue_depth()
+        self.stdout.write(f"Queue depth: {depth['Pending']} pending ({depth['Due']} due), {depth['Failed']} failed")
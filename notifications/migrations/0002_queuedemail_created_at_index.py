@@ -0,0 +1,17 @@
+# Generated by Django 5.2 on 2026-10-19 12:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='queuedemail',
+            index=models.Index(fields=['created_at'], name='notificatio_created_45b326_idx'),
+        ),
+    ]
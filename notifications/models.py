@@ -0,0 +1,32 @@
+from django.db import models
+from django.utils import timezone
+
+# Create your models here.
+
+
+class QueuedEmail(models.Model):
+    PENDING = 'Pending'
+    SENDING = 'Sending'
+    SENT = 'Sent'
+    FAILED = 'Failed'
+    
+    STATUS_CHOICES = [
+        (PENDING, 'Pending'),
+        (SENDING, 'Sending'),
+        (SENT, 'Sent'),
+        (FAILED, 'Failed')
+    ]
+    # Serialized EmailMessage, see notifications.services.
+    message = models.JSONField()
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    sent_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        indexes = [models.Index(fields=['status', 'next_attempt_at']), models.Index(fields=['created_at'])]
+    
+    def __str__(self):
+        return f"{self.message.get('subject')} to {', '.join(self.message.get('to', []))} - {self.status}"
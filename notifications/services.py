@@ -0,0 +1,169 @@
+import base64
+from datetime import timedelta
+from smtplib import SMTPException
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import transaction
+from django.db.models import Count, Min
+from django.utils import timezone
+from notifications.models import QueuedEmail
+
+DEFAULTS = {
+    'BATCH_SIZE': 100,
+    'MAX_ATTEMPTS': 5,
+    'RETRY_SECONDS': 60,
+    'CLAIM_SECONDS': 300,
+}
+
+
+def get_setting(name):
+    return getattr(settings, 'EMAIL_QUEUE', {}).get(name, DEFAULTS[name])
+
+
+def serialize_message(message):
+    attachments = []
+    for attachment in message.attachments:
+        if not isinstance(attachment, tuple):
+            raise ValueError("Only (filename, content, mimetype) attachments can be queued.")
+        filename, content, mimetype = attachment
+        if isinstance(content, str):
+            content = content.encode()
+        attachments.append([filename, base64.b64encode(content).decode('ascii'), mimetype])
+
+    return {
+        'subject': str(message.subject),
+        'body': str(message.body),
+        'from_email': message.from_email,
+        'to': list(message.to),
+        'cc': list(message.cc),
+        'bcc': list(message.bcc),
+        'reply_to': list(message.reply_to),
+        'headers': dict(message.extra_headers),
+        'content_subtype': message.content_subtype,
+        'alternatives': [[str(content), mimetype] for content, mimetype in getattr(message, 'alternatives', [])],
+        'attachments': attachments,
+    }
+
+
+def build_message(data, connection=None):
+    message = EmailMultiAlternatives(
+        subject=data['subject'],
+        body=data['body'],
+        from_email=data['from_email'],
+        to=data['to'],
+        cc=data['cc'],
+        bcc=data['bcc'],
+        reply_to=data['reply_to'],
+        headers=data['headers'],
+        connection=connection,
+    )
+    message.content_subtype = data['content_subtype']
+    for content, mimetype in data['alternatives']:
+        message.attach_alternative(content, mimetype)
+    for filename, content, mimetype in data['attachments']:
+        message.attach(filename, base64.b64decode(content), mimetype)
+    return message
+
+
+class EmailQueueServices:
+
+
+    @staticmethod
+    def enqueue(messages):
+        queued = QueuedEmail.objects.bulk_create([QueuedEmail(message=serialize_message(message)) for message in messages])
+        return len(queued)
+
+
+    @staticmethod
+    def send_batch(batch_size=None, max_attempts=None, connection=None):
+        """
+        Send up to ``batch_size`` due emails over one connection to EMAIL_DELIVERY_BACKEND.
+        The emails are claimed first, so several workers can run side by side, and sent after
+        that transaction commits. Emails that fail, or can't be sent because the connection
+        won't open, are retried with exponential backoff until ``max_attempts`` is reached.
+        Returns (sent, failed).
+        """
+        max_attempts = max_attempts or get_setting('MAX_ATTEMPTS')
+        connection = connection or get_connection(settings.EMAIL_DELIVERY_BACKEND)
+        batch = EmailQueueServices.claim(batch_size or get_setting('BATCH_SIZE'))
+        if not batch:
+            return 0, 0
+
+        sent = failed = 0
+        try:
+            connection.open()
+        except (OSError, SMTPException) as e:
+            for email in batch:
+                EmailQueueServices._record_failure(email, e, max_attempts)
+            failed = len(batch)
+        else:
+            try:
+                for email in batch:
+                    try:
+                        delivered = connection.send_messages([build_message(email.message, connection)])
+                        if not delivered:
+                            raise RuntimeError("The email backend did not send the message.")
+                    except Exception as e:
+                        failed += 1
+                        EmailQueueServices._record_failure(email, e, max_attempts)
+                    else:
+                        sent += 1
+                        email.status = QueuedEmail.SENT
+                        email.sent_at = timezone.now()
+                        email.last_error = ''
+            finally:
+                connection.close()
+
+        QueuedEmail.objects.bulk_update(batch, ['status', 'last_error', 'next_attempt_at', 'sent_at'])
+        return sent, failed
+
+
+    @staticmethod
+    def claim(batch_size):
+        """
+        Mark up to ``batch_size`` due emails as sending and count the attempt, in a transaction
+        that only holds their row locks (SELECT ... FOR UPDATE SKIP LOCKED) while it claims them.
+        A claimed email that is never finished, because its worker died, is due again after
+        CLAIM_SECONDS.
+        """
+        now = timezone.now()
+        with transaction.atomic():
+            batch = list(
+                QueuedEmail.objects.select_for_update(skip_locked=True)
+                .filter(status__in=[QueuedEmail.PENDING, QueuedEmail.SENDING], next_attempt_at__lte=now)
+                .order_by('next_attempt_at', 'id')[:batch_size]
+            )
+            for email in batch:
+                email.status = QueuedEmail.SENDING
+                email.attempts += 1
+                email.next_attempt_at = now + timedelta(seconds=get_setting('CLAIM_SECONDS'))
+            QueuedEmail.objects.bulk_update(batch, ['status', 'attempts', 'next_attempt_at'])
+        return batch
+
+
+    @staticmethod
+    def _record_failure(email, error, max_attempts):
+        email.last_error = f"{type(error).__name__}: {error}"
+        if email.attempts >= max_attempts:
+            email.status = QueuedEmail.FAILED
+        else:
+            email.status = QueuedEmail.PENDING
+            backoff = get_setting('RETRY_SECONDS') * 2 ** (email.attempts - 1)
+            email.next_attempt_at = timezone.now() + timedelta(seconds=backoff)
+
+
+    @staticmethod
+    def queue_depth():
+        """
+        Emails per status, plus how many pending emails are due now and the age of the oldest one.
+        """
+        depth = {status: 0 for status, _ in QueuedEmail.STATUS_CHOICES}
+        for row in QueuedEmail.objects.values('status').annotate(count=Count('id')).order_by():
+            depth[row['status']] = row['count']
+
+        now = timezone.now()
+        pending = QueuedEmail.objects.filter(status=QueuedEmail.PENDING)
+        oldest = pending.aggregate(oldest=Min('created_at'))['oldest']
+        depth['Due'] = pending.filter(next_attempt_at__lte=now).count()
+        depth['OldestPendingSeconds'] = round((now - oldest).total_seconds()) if oldest else 0
+        return depth
@@ -0,0 +1,106 @@
+import io
+from datetime import timedelta
+from smtplib import SMTPConnectError
+from django.core import mail
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.core.mail.backends.base import BaseEmailBackend
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from notifications.models import QueuedEmail
+from notifications.services import EmailQueueServices
+
+# Create your tests here.
+
+
+class FailingBackend(BaseEmailBackend):
+    """
+    Delivery backend that refuses every message, for the retry tests.
+    """
+    def send_messages(self, messages):
+        raise ConnectionError("Mail server unavailable")
+
+
+class UnreachableBackend(BaseEmailBackend):
+    """
+    Delivery backend whose connection can't be opened, like an SMTP server that is down.
+    """
+    def open(self):
+        raise SMTPConnectError(421, "Service not available")
+
+    def send_messages(self, messages):
+        raise AssertionError("Nothing can be sent without a connection.")
+
+
+@override_settings(
+    EMAIL_BACKEND='notifications.backends.QueuedEmailBackend',
+    EMAIL_DELIVERY_BACKEND='django.core.mail.backends.locmem.EmailBackend',
+    EMAIL_QUEUE={'BATCH_SIZE': 10, 'MAX_ATTEMPTS': 2, 'RETRY_SECONDS': 30},
+)
+class QueuedEmailTests(TestCase):
+
+    def send(self, count=1):
+        for i in range(count):
+            message = EmailMultiAlternatives('Activate your account', 'Plain body', 'noreply@nomino.com', [f'user{i}@example.com'])
+            message.attach_alternative('<p>HTML body</p>', 'text/html')
+            message.attach('menu.txt', b'Soup', 'text/plain')
+            message.send()
+
+    def test_sending_only_queues(self):
+        self.send()
+
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(QueuedEmail.objects.get().status, QueuedEmail.PENDING)
+        self.assertEqual(EmailQueueServices.queue_depth()['Pending'], 1)
+
+    def test_batch_is_delivered_over_one_connection(self):
+        self.send(3)
+        connection = get_connection('django.core.mail.backends.locmem.EmailBackend')
+
+        self.assertEqual(EmailQueueServices.send_batch(connection=connection), (3, 0))
+        self.assertEqual(len(mail.outbox), 3)
+        delivered = mail.outbox[0]
+        self.assertEqual(delivered.to, ['user0@example.com'])
+        self.assertEqual(delivered.alternatives[0][:2], ('<p>HTML body</p>', 'text/html'))
+        self.assertEqual(delivered.attachments[0][:2], ('menu.txt', 'Soup'))
+        self.assertFalse(QueuedEmail.objects.exclude(status=QueuedEmail.SENT).exists())
+
+    def test_failed_delivery_is_retried_then_given_up(self):
+        self.send()
+        backend = FailingBackend()
+
+        self.assertEqual(EmailQueueServices.send_batch(connection=backend), (0, 1))
+        email = QueuedEmail.objects.get()
+        self.assertEqual((email.status, email.attempts), (QueuedEmail.PENDING, 1))
+        self.assertGreater(email.next_attempt_at, timezone.now() + timedelta(seconds=25))
+        self.assertEqual(EmailQueueServices.send_batch(connection=backend), (0, 0))
+
+        QueuedEmail.objects.update(next_attempt_at=timezone.now())
+        EmailQueueServices.send_batch(connection=backend)
+        email.refresh_from_db()
+        self.assertEqual((email.status, email.attempts), (QueuedEmail.FAILED, 2))
+        self.assertIn('Mail server unavailable', email.last_error)
+        self.assertEqual(EmailQueueServices.queue_depth()['Failed'], 1)
+
+    def test_connection_failure_is_retried_without_stopping_the_worker(self):
+        self.send(2)
+
+        with override_settings(EMAIL_DELIVERY_BACKEND='notifications.tests.UnreachableBackend'):
+            call_command('send_queued_emails', stdout=io.StringIO())
+
+        for email in QueuedEmail.objects.all():
+            self.assertEqual((email.status, email.attempts), (QueuedEmail.PENDING, 1))
+            self.assertIn('Service not available', email.last_error)
+            self.assertGreater(email.next_attempt_at, timezone.now() + timedelta(seconds=25))
+
+    def test_emails_are_claimed_before_sending(self):
+        self.send(2)
+        claimed = EmailQueueServices.claim(batch_size=1)
+
+        self.assertEqual([email.status for email in claimed], [QueuedEmail.SENDING])
+        self.assertEqual(QueuedEmail.objects.get(pk=claimed[0].pk).attempts, 1)
+        # Another worker only gets the unclaimed email, until the claim expires.
+        self.assertEqual(EmailQueueServices.send_batch(connection=get_connection('django.core.mail.backends.locmem.EmailBackend')), (1, 0))
+        QueuedEmail.objects.filter(pk=claimed[0].pk).update(next_attempt_at=timezone.now())
+        self.assertEqual(EmailQueueServices.send_batch(connection=get_connection('django.core.mail.backends.locmem.EmailBackend')), (1, 0))
+        self.assertEqual(QueuedEmail.objects.get(pk=claimed[0].pk).attempts, 2)
@@ -1,3 +1,99 @@
-from django.contrib import admin
+from collections import Counter
+from django.contrib import admin, messages
+from nomino.admin import LargeTableAdminMixin
+from orders.models import Cart, CartItem, Order, OrderItem
+from orders.services import OrderServices
 
 # Register your models here.
+
+# Orders moved per bulk_transition call by the status actions.
+TRANSITION_BATCH_SIZE = 500
+
+
+class CartItemInline(admin.TabularInline):
+    model = CartItem
+    autocomplete_fields = ['food_item']
+    extra = 0
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('food_item')
+
+
+@admin.register(Cart)
+class CartAdmin(LargeTableAdminMixin, admin.ModelAdmin):
+    list_display = ('id', 'user', 'created_at', 'updated_at')
+    list_select_related = ('user',)
+    autocomplete_fields = ['user']
+    search_fields = ['=user__email']
+    date_hierarchy = 'created_at'
+    ordering = ('-created_at',)
+    inlines = [CartItemInline]
+
+
+@admin.register(CartItem)
+class CartItemAdmin(LargeTableAdminMixin, admin.ModelAdmin):
+    list_display = ('id', 'cart', 'food_item', 'quantity')
+    list_select_related = ('cart__user', 'food_item')
+    autocomplete_fields = ['cart', 'food_item']
+    search_fields = ['=cart__user__email']
+
+
+class OrderItemInline(admin.TabularInline):
+    model = OrderItem
+    autocomplete_fields = ['food_item']
+    extra = 0
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('food_item')
+
+
+def transition_action(status, description):
+    def action(modeladmin, request, queryset):
+        outcomes = Counter()
+        order_ids = list(queryset.values_list('pk', flat=True))
+        for start in range(0, len(order_ids), TRANSITION_BATCH_SIZE):
+            results = OrderServices.bulk_transition(order_ids[start:start + TRANSITION_BATCH_SIZE], status)
+            outcomes.update(result['result'] for result in results)
+
+        modeladmin.message_user(request, f"{outcomes['updated']} orders marked {status.lower()}.", messages.SUCCESS)
+        skipped = outcomes['invalid_transition'] + outcomes['not_found']
+        if skipped:
+            modeladmin.message_user(request, f"{skipped} orders can't be changed to {status.lower()}.", messages.WARNING)
+
+    action.__name__ = f"mark_{status.lower()}"
+    action.short_description = description
+    return action
+
+
+@admin.register(Order)
+class OrderAdmin(LargeTableAdminMixin, admin.ModelAdmin):
+    """
+    Status changes go through the status actions (OrderServices.bulk_transition), which keep
+    stock, analytics and the kitchen queue in step, so the status can't be edited on the form.
+    """
+    list_display = ('id', 'user', 'status', 'delivery_zone', 'total_price', 'created_at')
+    list_select_related = ('user', 'delivery_zone')
+    list_filter = ('status', 'delivery_zone')
+    autocomplete_fields = ['user', 'delivery_zone']
+    search_fields = ['=id', '=user__email']
+    date_hierarchy = 'created_at'
+    ordering = ('-created_at',)
+    inlines = [OrderItemInline]
+    actions = [
+        transition_action(Order.CONFIRMED, "Confirm selected orders"),
+        transition_action(Order.DELIVERED, "Mark selected orders delivered"),
+        transition_action(Order.CANCELED, "Cancel selected orders"),
+    ]
+
+    def get_readonly_fields(self, request, obj=None):
+        if obj is None:
+            return ('version',)
+        return ('status', 'version')
+
+
+@admin.register(OrderItem)
+class OrderItemAdmin(LargeTableAdminMixin, admin.ModelAdmin):
+    list_display = ('id', 'order', 'food_item', 'quantity', 'price', 'total_price', 'stock_reserved')
+    list_select_related = ('order__user', 'food_item')
+    autocomplete_fields = ['order', 'food_item']
+    search_fields = ['=order__id']
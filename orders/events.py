@@ -0,0 +1,99 @@
+import abc
+import asyncio
+import contextlib
+import threading
+from collections import defaultdict
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+DEFAULTS = {
+    'BROKER': 'orders.events.InMemoryOrderEventBroker',
+    'HEARTBEAT_SECONDS': 15,
+    'QUEUE_SIZE': 100,
+}
+
+
+def get_setting(name):
+    return getattr(settings, 'ORDER_EVENTS', {}).get(name, DEFAULTS[name])
+
+
+class OrderEventBroker(abc.ABC):
+    """
+    Delivers order events to the streams of the user they belong to.
+
+    ``publish`` may be called from any thread. ``subscribe`` is an async context
+    manager yielding an asyncio.Queue that receives the user's events.
+    Brokers backed by an external pub/sub (Redis, Postgres LISTEN/NOTIFY, ...) let
+    events reach streams served by other processes.
+    """
+    @abc.abstractmethod
+    def publish(self, user_id, event):
+        pass
+
+    @abc.abstractmethod
+    def subscribe(self, user_id):
+        pass
+
+
+class InMemoryOrderEventBroker(OrderEventBroker):
+    """
+    Fans events out to the streams open in this process.
+    Each stream costs one asyncio.Queue, so idle connections need no thread.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = defaultdict(set)
+
+    def publish(self, user_id, event):
+        with self._lock:
+            subscribers = list(self._subscribers.get(user_id, ()))
+        for loop, queue in subscribers:
+            with contextlib.suppress(RuntimeError):
+                # The loop may have closed since the stream subscribed.
+                loop.call_soon_threadsafe(_deliver, queue, event)
+
+    @contextlib.asynccontextmanager
+    async def subscribe(self, user_id):
+        subscriber = (asyncio.get_running_loop(), asyncio.Queue(maxsize=get_setting('QUEUE_SIZE')))
+        with self._lock:
+            self._subscribers[user_id].add(subscriber)
+        try:
+            yield subscriber[1]
+        finally:
+            with self._lock:
+                self._subscribers[user_id].discard(subscriber)
+                if not self._subscribers[user_id]:
+                    del self._subscribers[user_id]
+
+    def subscriber_count(self):
+        with self._lock:
+            return sum(len(subscribers) for subscribers in self._subscribers.values())
+
+
+def _deliver(queue, event):
+    if queue.full():
+        # A stalled client only loses its oldest events, never blocks publishers.
+        queue.get_nowait()
+    queue.put_nowait(event)
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                _broker = import_string(get_setting('BROKER'))()
+    return _broker
+
+
+def order_event(event_type, order, previous_status=None):
+    return {
+        'type': event_type,
+        'id': str(order.pk),
+        'status': order.status,
+        'previous_status': previous_status,
+    }
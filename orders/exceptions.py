@@ -0,0 +1,8 @@
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+
+class OrderConflict(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "The order was changed by someone else. Reload it and try again."
+    default_code = 'conflict'
@@ -0,0 +1,75 @@
+import csv
+import json
+from datetime import datetime, time, timedelta
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+from orders.ids import created_range
+from orders.models import OrderItem
+
+# One row per order line, carrying the columns of its order.
+EXPORT_COLUMNS = [
+    ('order_id', 'order_id'),
+    ('created_at', 'order__created_at'),
+    ('user_email', 'order__user__email'),
+    ('status', 'order__status'),
+    ('address', 'order__address'),
+    ('order_total', 'order__total_price'),
+    ('food_item_id', 'food_item_id'),
+    ('food_item', 'food_item__name'),
+    ('quantity', 'quantity'),
+    ('price', 'price'),
+    ('line_total', 'total_price'),
+]
+
+EXPORT_FORMATS = {
+    'csv': 'text/csv',
+    'jsonl': 'application/x-ndjson',
+}
+
+
+def export_rows(start=None, end=None, status=None, chunk_size=2000):
+    """
+    Yield order lines as tuples in EXPORT_COLUMNS order.
+    Rows are read through a server-side cursor ``chunk_size`` rows at a time,
+    so memory stays flat however many orders match.
+    """
+    items = OrderItem.objects.filter(created_range(
+        _start_of_day(start) if start else None,
+        _start_of_day(end + timedelta(days=1)) if end else None,
+        prefix='order__'
+    ))
+    if status:
+        items = items.filter(order__status=status)
+
+    fields = [field for _, field in EXPORT_COLUMNS]
+    return items.order_by('order__created_at', 'order_id', 'id').values_list(*fields).iterator(chunk_size=chunk_size)
+
+
+def export_lines(rows, output='csv'):
+    """
+    Encode ``rows`` as CSV or JSON Lines, yielding one line of text at a time.
+    """
+    columns = [column for column, _ in EXPORT_COLUMNS]
+
+    if output == 'jsonl':
+        for row in rows:
+            yield json.dumps(dict(zip(columns, row)), cls=DjangoJSONEncoder) + "\n"
+        return
+
+    buffer = _LineBuffer()
+    writer = csv.writer(buffer)
+    yield writer.writerow(columns)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def _start_of_day(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+class _LineBuffer:
+    """
+    File-like object for csv.writer that hands back each written line instead of storing it.
+    """
+    def write(self, value):
+        return value
@@ -0,0 +1,37 @@
+from datetime import timedelta
+from django.conf import settings
+from django.db.models import Q
+from nomino.uuids import uuid7_floor
+
+DEFAULTS = {
+    'RANGE_BY_ID': False,
+    'CLOCK_SKEW_SECONDS': 60,
+    'REKEY_BATCH_SIZE': 1000,
+}
+
+
+def get_setting(name):
+    return getattr(settings, 'ORDER_IDS', {}).get(name, DEFAULTS[name])
+
+
+def created_range(start=None, end=None, prefix=''):
+    """
+    Q for rows created in [start, end), on a model with a time-ordered id and created_at
+    (``prefix`` reaches them through a relation, e.g. 'order__').
+
+    With ORDER_IDS['RANGE_BY_ID'] on, the id is bounded too, so the range can be read from
+    the primary key index. Ids are made just before created_at is set, so the lower bound
+    allows CLOCK_SKEW_SECONDS of slack. Only turn it on once every row has a version 7 id
+    (see `manage.py rekey_uuid7`): older random ids sort anywhere.
+    """
+    condition = Q()
+    by_id = get_setting('RANGE_BY_ID')
+    if start is not None:
+        condition &= Q(**{f'{prefix}created_at__gte': start})
+        if by_id:
+            condition &= Q(**{f'{prefix}pk__gte': uuid7_floor(start - timedelta(seconds=get_setting('CLOCK_SKEW_SECONDS')))})
+    if end is not None:
+        condition &= Q(**{f'{prefix}created_at__lt': end})
+        if by_id:
+            condition &= Q(**{f'{prefix}pk__lt': uuid7_floor(end + timedelta(milliseconds=1))})
+    return condition
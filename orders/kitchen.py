@@ -0,0 +1,225 @@
+import heapq
+import itertools
+import threading
+import time
+from collections import OrderedDict
+from datetime import timedelta
+from django.conf import settings
+from orders.models import Order, OrderItem
+
+DEFAULTS = {
+    'PREP_MINUTES': 20,
+    'RESYNC_SECONDS': 30,
+    'PENDING_CACHE_SIZE': 10000,
+}
+
+
+def get_setting(name):
+    return getattr(settings, 'KITCHEN_QUEUE', {}).get(name, DEFAULTS[name])
+
+
+class KitchenOrder:
+    __slots__ = ('id', 'created_at', 'promised_at', 'lines', 'zone_id')
+
+    def __init__(self, order_id, created_at, promised_at, lines, zone_id=None):
+        self.id = order_id
+        self.created_at = created_at
+        self.promised_at = promised_at
+        self.lines = lines
+        self.zone_id = zone_id
+
+
+class KitchenQueue:
+    """
+    Confirmed orders kept in a heap, oldest first, plus the total quantity still to
+    cook per food item across those orders, overall and per delivery zone. Every
+    order is promised PREP_MINUTES after it was placed, so this is also the order
+    of their promised times.
+
+    ``lines`` are (food_item_id, food_item_name, quantity) tuples. Removed orders
+    are left in the heap and skipped when read; the heap is compacted once
+    stale entries outnumber live ones.
+    """
+    def __init__(self, prep_time=None):
+        self.prep_time = prep_time if prep_time is not None else timedelta(minutes=get_setting('PREP_MINUTES'))
+        self._lock = threading.Lock()
+        self._sequence = itertools.count()
+        self._heap = []
+        self._orders = {}
+        self._batches = {}
+        self._zones = {}
+        self._pending = OrderedDict()
+        self.loaded_at = None
+
+    def __len__(self):
+        return len(self._orders)
+
+    def count(self, zone_id=None):
+        """
+        Open orders in the delivery zone ``zone_id``, or in every zone when it is None.
+        """
+        if zone_id is None:
+            return len(self._orders)
+        zone = self._zones.get(zone_id)
+        return zone['orders'] if zone is not None else 0
+
+    def load(self, lines_by_order):
+        """
+        Replace the queue contents with ``lines_by_order``:
+        {order_id: (created_at, lines)} or {order_id: (created_at, lines, zone_id)}.
+        """
+        with self._lock:
+            self._heap, self._orders, self._batches, self._zones = [], {}, {}, {}
+            for order_id, entry in lines_by_order.items():
+                self._add(order_id, *entry)
+            self.loaded_at = time.monotonic()
+
+    def add(self, order_id, created_at, lines, zone_id=None):
+        with self._lock:
+            if order_id in self._orders:
+                return False
+            self._add(order_id, created_at, lines, zone_id)
+            return True
+
+    def remove(self, order_id):
+        with self._lock:
+            order = self._orders.pop(order_id, None)
+            if order is None:
+                return False
+            self._subtract(self._batches, order.lines)
+            zone = self._zones[order.zone_id]
+            zone['orders'] -= 1
+            self._subtract(zone['batches'], order.lines)
+            if zone['orders'] <= 0:
+                del self._zones[order.zone_id]
+            if len(self._heap) > 2 * len(self._orders) + 64:
+                self._heap = [entry for entry in self._heap if self._orders.get(entry[2].id) is entry[2]]
+                heapq.heapify(self._heap)
+            return True
+
+    def snapshot(self, limit=20, zone_id=None):
+        """
+        Return the next ``limit`` orders to prepare and every food item batch, largest first,
+        for the delivery zone ``zone_id`` or for every zone when it is None.
+        """
+        with self._lock:
+            if zone_id is not None and zone_id not in self._zones:
+                return [], []
+            batches = self._batches if zone_id is None else self._zones[zone_id]['batches']
+            orders = self._smallest(limit, zone_id)
+            batches = sorted(
+                ({'food_item': food_item_id, **batch} for food_item_id, batch in batches.items()),
+                key=lambda batch: (-batch['quantity'], batch['name'])
+            )
+        return orders, batches
+
+    def _smallest(self, limit, zone_id=None):
+        # Walk the heap from its root instead of scanning it: only the
+        # children of entries already taken can be next, so this costs O(limit log limit).
+        # Orders of other zones are walked past, so a zone filter costs more the smaller
+        # the zone's share of the queue.
+        heap, orders = self._heap, []
+        frontier = [(heap[0], 0)] if heap else []
+        while frontier and len(orders) < limit:
+            entry, index = heapq.heappop(frontier)
+            if self._orders.get(entry[2].id) is entry[2] and (zone_id is None or entry[2].zone_id == zone_id):
+                orders.append(entry[2])
+            for child in (2 * index + 1, 2 * index + 2):
+                if child < len(heap):
+                    heapq.heappush(frontier, (heap[child], child))
+        return orders
+
+    def remember_pending(self, order_id, created_at, lines, zone_id=None):
+        """
+        Keep the lines of an order that was just placed, so confirming it does not need a query.
+        """
+        with self._lock:
+            self._pending[order_id] = (created_at, lines, zone_id)
+            while len(self._pending) > get_setting('PENDING_CACHE_SIZE'):
+                self._pending.popitem(last=False)
+
+    def pop_pending(self, order_id):
+        with self._lock:
+            return self._pending.pop(order_id, None)
+
+    def _add(self, order_id, created_at, lines, zone_id=None):
+        order = KitchenOrder(order_id, created_at, created_at + self.prep_time, lines, zone_id)
+        self._orders[order_id] = order
+        heapq.heappush(self._heap, (order.created_at, next(self._sequence), order))
+        zone = self._zones.setdefault(zone_id, {'orders': 0, 'batches': {}})
+        zone['orders'] += 1
+        for batches in (self._batches, zone['batches']):
+            for food_item_id, name, quantity in lines:
+                batch = batches.setdefault(food_item_id, {'name': name, 'quantity': 0, 'orders': 0})
+                batch['quantity'] += quantity
+                batch['orders'] += 1
+
+    @staticmethod
+    def _subtract(batches, lines):
+        for food_item_id, _, quantity in lines:
+            batch = batches[food_item_id]
+            batch['quantity'] -= quantity
+            batch['orders'] -= 1
+            if batch['orders'] <= 0:
+                del batches[food_item_id]
+
+
+kitchen_queue = KitchenQueue()
+
+
+def get_kitchen_queue():
+    """
+    Return the process-wide queue, (re)loading it from the database when it is
+    older than KITCHEN_QUEUE['RESYNC_SECONDS']. Between reloads it is kept current
+    by the order signals, which only fire in the process that made the change.
+    """
+    resync = get_setting('RESYNC_SECONDS')
+    if kitchen_queue.loaded_at is None or time.monotonic() - kitchen_queue.loaded_at > resync:
+        kitchen_queue.load(confirmed_order_lines())
+    return kitchen_queue
+
+
+def confirmed_order_lines(order_ids=None):
+    items = OrderItem.objects.filter(order__status=Order.CONFIRMED)
+    if order_ids is not None:
+        items = items.filter(order_id__in=order_ids)
+    rows = items.values_list(
+        'order_id', 'order__created_at', 'order__delivery_zone_id', 'food_item_id', 'food_item__name', 'quantity'
+    ).order_by()
+
+    lines_by_order = {}
+    for order_id, created_at, zone_id, food_item_id, name, quantity in rows:
+        lines_by_order.setdefault(order_id, (created_at, [], zone_id))[1].append((food_item_id, name, quantity))
+    return lines_by_order
+
+
+def track_status_changes(orders, previous_status):
+    """
+    Apply order status changes to the queue: confirmed orders join it, orders
+    leaving the confirmed status drop out.
+    """
+    confirmed = []
+    for order in orders:
+        if order.status == Order.CONFIRMED:
+            confirmed.append(order)
+        else:
+            if order.status in (Order.CANCELED, Order.DELIVERED):
+                kitchen_queue.pop_pending(order.pk)
+            if previous_status[order.pk] == Order.CONFIRMED:
+                kitchen_queue.remove(order.pk)
+
+    if kitchen_queue.loaded_at is None:
+        for order in confirmed:
+            kitchen_queue.pop_pending(order.pk)
+        return
+
+    missing = []
+    for order in confirmed:
+        pending = kitchen_queue.pop_pending(order.pk)
+        if pending is None:
+            missing.append(order.pk)
+        else:
+            kitchen_queue.add(order.pk, *pending)
+    if missing:
+        for order_id, entry in confirmed_order_lines(missing).items():
+            kitchen_queue.add(order_id, *entry)
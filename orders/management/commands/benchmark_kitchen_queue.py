@@ -0,0 +1,63 @@
+import json
+import random
+import time
+from datetime import timedelta
+from uuid import uuid4
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from orders.kitchen import KitchenQueue
+
+
+class Command(BaseCommand):
+    help = "Benchmark kitchen queue operations on synthetic open orders. Does not touch the database."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--orders', type=int, default=5000, help="Open orders in the queue.")
+        parser.add_argument('--food-items', type=int, default=200, help="Distinct food items on the menu.")
+        parser.add_argument('--lines', type=int, default=3, help="Lines per order.")
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        now = timezone.now()
+        menu = [(food_item_id, f"Food item {food_item_id}") for food_item_id in range(1, options['food_items'] + 1)]
+        orders = [
+            (
+                uuid4(),
+                now - timedelta(seconds=rng.randint(0, 3600)),
+                [(*rng.choice(menu), rng.randint(1, 4)) for _ in range(options['lines'])]
+            )
+            for _ in range(options['orders'])
+        ]
+
+        queue = KitchenQueue()
+        results = {'orders': options['orders'], 'food_items': options['food_items']}
+
+        started = time.perf_counter()
+        queue.load({order_id: (created_at, lines) for order_id, created_at, lines in orders})
+        results['load_ms'] = self.elapsed_ms(started)
+
+        results['snapshot_us'] = self.per_call_us(lambda: queue.snapshot(limit=20), 200)
+
+        removed = rng.sample(orders, len(orders) // 2)
+        started = time.perf_counter()
+        for order_id, _, _ in removed:
+            queue.remove(order_id)
+        results['remove_us'] = round(self.elapsed_ms(started) * 1000 / max(len(removed), 1), 2)
+
+        started = time.perf_counter()
+        for order_id, created_at, lines in removed:
+            queue.add(order_id, created_at, lines)
+        results['add_us'] = round(self.elapsed_ms(started) * 1000 / max(len(removed), 1), 2)
+
+        results['snapshot_after_churn_us'] = self.per_call_us(lambda: queue.snapshot(limit=20), 200)
+        self.stdout.write(json.dumps(results, indent=2))
+
+    def per_call_us(self, func, repeat):
+        started = time.perf_counter()
+        for _ in range(repeat):
+            func()
+        return round(self.elapsed_ms(started) * 1000 / repeat, 2)
+
+    def elapsed_ms(self, started):
+        return round((time.perf_counter() - started) * 1000, 3)
@@ -0,0 +1,74 @@
+import json
+import time
+from uuid import uuid4
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, models, transaction
+from nomino.uuids import uuid7
+
+KINDS = {
+    'uuid4': uuid4,
+    'uuid7': uuid7,
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Insert rows keyed by random (uuid4) and time-ordered (uuid7) ids into temporary tables "
+        "and compare insert throughput and primary key index size. Works on PostgreSQL and SQLite."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1000000)
+        parser.add_argument('--batch-size', type=int, default=10000, help="Rows per INSERT batch.")
+        parser.add_argument('--database', default='default')
+
+    def handle(self, *args, **options):
+        connection = connections[options['database']]
+        if connection.vendor not in ('postgresql', 'sqlite'):
+            raise CommandError(f"Index sizes can't be measured on {connection.vendor}.")
+        id_type = models.UUIDField().db_type(connection)
+        field = models.UUIDField()
+
+        results = {'rows': options['rows'], 'vendor': connection.vendor}
+        for kind, make_id in KINDS.items():
+            table = f"benchmark_{kind}_keys"
+            with connection.cursor() as cursor:
+                cursor.execute(f"DROP TABLE IF EXISTS {table}")
+                cursor.execute(f"CREATE TEMPORARY TABLE {table} (id {id_type} PRIMARY KEY, quantity integer NOT NULL)")
+                used_before = self.sqlite_used_bytes(cursor) if connection.vendor == 'sqlite' else 0
+
+                elapsed = 0.0
+                for start in range(0, options['rows'], options['batch_size']):
+                    count = min(options['batch_size'], options['rows'] - start)
+                    batch = [(field.get_db_prep_value(make_id(), connection), index) for index in range(count)]
+                    started = time.perf_counter()
+                    with transaction.atomic(using=options['database']):
+                        cursor.executemany(f"INSERT INTO {table} (id, quantity) VALUES (%s, %s)", batch)
+                    elapsed += time.perf_counter() - started
+
+                results[kind] = {
+                    'insert_rows_per_second': round(options['rows'] / elapsed) if elapsed else None,
+                    **self.sizes(connection, cursor, table, used_before),
+                }
+                cursor.execute(f"DROP TABLE {table}")
+        self.stdout.write(json.dumps(results, indent=2))
+
+    def sizes(self, connection, cursor, table, used_before):
+        if connection.vendor == 'postgresql':
+            cursor.execute("SELECT pg_relation_size(%s), pg_relation_size(%s)", [table, f"{table}_pkey"])
+            table_bytes, index_bytes = cursor.fetchone()
+            return {'table_mb': self.megabytes(table_bytes), 'index_mb': self.megabytes(index_bytes)}
+        # SQLite keeps the rows in a rowid B-tree and the key in a separate unique index; the
+        # pages both use are reported together.
+        return {'table_and_index_mb': self.megabytes(self.sqlite_used_bytes(cursor) - used_before)}
+
+    def sqlite_used_bytes(self, cursor):
+        cursor.execute("PRAGMA temp.page_count")
+        pages = cursor.fetchone()[0]
+        cursor.execute("PRAGMA temp.freelist_count")
+        pages -= cursor.fetchone()[0]
+        cursor.execute("PRAGMA temp.page_size")
+        return pages * cursor.fetchone()[0]
+
+    def megabytes(self, size):
+        return round(size / 1024 / 1024, 2)
@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand, CommandError
+from orders.models import Order
+from orders.exports import EXPORT_FORMATS, export_rows, export_lines
+from orders.serializers import OrderExportSerializer
+
+
+class Command(BaseCommand):
+    help = "Stream orders and their line items as CSV or JSON Lines."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', choices=list(EXPORT_FORMATS), default='csv')
+        parser.add_argument('--start', help="First order day to export (YYYY-MM-DD).")
+        parser.add_argument('--end', help="Last order day to export (YYYY-MM-DD).")
+        parser.add_argument('--status', choices=[status for status, _ in Order.STATUS_CHOICES])
+        parser.add_argument('--file', help="Write to this file instead of stdout.")
+        parser.add_argument('--chunk-size', type=int, default=2000, help="Rows fetched per database round trip.")
+
+    def handle(self, *args, **options):
+        params = {key: options[key] for key in ('output', 'start', 'end', 'status') if options[key]}
+        serializer = OrderExportSerializer(data=params)
+        if not serializer.is_valid():
+            raise CommandError(serializer.errors)
+        params = serializer.validated_data
+
+        rows = export_rows(
+            start=params.get('start'), end=params.get('end'), status=params.get('status'),
+            chunk_size=options['chunk_size']
+        )
+        lines = export_lines(rows, output=params['output'])
+
+        if not options['file']:
+            for line in lines:
+                self.stdout.write(line, ending='')
+            return
+
+        written = 0
+        with open(options['file'], 'w', newline='', encoding='utf-8') as export_file:
+            for line in lines:
+                export_file.write(line)
+                written += 1
+        header = 1 if params['output'] == 'csv' else 0
+        self.stderr.write(f"Exported {written - header} order lines to {options['file']}")
@@ -0,0 +1,72 @@
+import json
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from nomino.uuids import uuid7_at
+from orders.ids import get_setting
+from orders.kitchen import kitchen_queue
+from orders.models import Cart, Order
+
+MODELS = {
+    'order': Order,
+    'cart': Cart,
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Replace the random (version 4) ids of existing orders and carts with time-ordered ids made "
+        "from their created_at, updating every foreign key that points at them. Ids change, so links "
+        "holding an old order id stop working; run it before turning on ORDER_IDS['RANGE_BY_ID']."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--model', choices=[*MODELS, 'all'], default='all')
+        parser.add_argument('--batch-size', type=int, default=get_setting('REKEY_BATCH_SIZE'), help="Rows rekeyed per transaction.")
+        parser.add_argument('--dry-run', action='store_true', help="Count the rows to rekey without changing them.")
+
+    def handle(self, *args, **options):
+        names = list(MODELS) if options['model'] == 'all' else [options['model']]
+        results = {}
+        for name in names:
+            model = MODELS[name]
+            results[name] = 0
+            for rows in self.legacy_batches(model, options['batch_size']):
+                if not options['dry_run']:
+                    self.rekey(model, rows)
+                results[name] += len(rows)
+
+        if not options['dry_run']:
+            # The kitchen queue is keyed by order id; other processes reload theirs within KITCHEN_QUEUE['RESYNC_SECONDS'].
+            kitchen_queue.loaded_at = None
+        self.stdout.write(json.dumps({'dry_run': options['dry_run'], 'rekeyed': results}, indent=2))
+
+    def legacy_batches(self, model, batch_size):
+        """
+        Yield lists of (pk, created_at) for rows whose id isn't version 7, walking the table in
+        id order. Rekeyed rows may be read once more further on, and are skipped then.
+        """
+        rows = model._base_manager.order_by('pk').values_list('pk', 'created_at')
+        last_id = None
+        while True:
+            batch = list((rows if last_id is None else rows.filter(pk__gt=last_id))[:batch_size])
+            if not batch:
+                return
+            last_id = batch[-1][0]
+            legacy = [(pk, created_at) for pk, created_at in batch if pk.version != 7]
+            if legacy:
+                yield legacy
+
+    def rekey(self, model, rows):
+        """
+        Give each (pk, created_at) in ``rows`` a version 7 id for its created_at, in one
+        transaction. Foreign keys are checked at commit, so the rows and the ones pointing at
+        them can be updated in either order.
+        """
+        relations = [relation for relation in model._meta.related_objects if relation.field.many_to_one or relation.field.one_to_one]
+        with transaction.atomic():
+            for old_id, created_at in rows:
+                new_id = uuid7_at(created_at)
+                model._base_manager.filter(pk=old_id).update(**{model._meta.pk.attname: new_id})
+                for relation in relations:
+                    column = relation.field.attname
+                    relation.related_model._base_manager.filter(**{column: old_id}).update(**{column: new_id})
@@ -0,0 +1,47 @@
+import json
+import time
+from datetime import timedelta
+from django.core.management.base import BaseCommand
+from orders.models import CartItem
+from orders.services import CartServices, get_setting
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete carts that haven't changed for --idle-days, with their items, in batches of short "
+        "transactions, recording them for abandoned cart analytics first unless --no-stats is given."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--idle-days', type=float, default=None, help="Days since a cart last changed before it is swept.")
+        parser.add_argument('--batch-size', type=int, default=None, help="Carts deleted per transaction.")
+        parser.add_argument('--pause', type=float, default=0, help="Seconds to wait between batches.")
+        parser.add_argument('--max-batches', type=int, default=None, help="Stop after this many batches.")
+        parser.add_argument('--no-stats', action='store_true', help="Don't record the carts in DailyAbandonedCarts.")
+        parser.add_argument('--dry-run', action='store_true', help="Only count the carts that would be swept.")
+
+    def handle(self, *args, **options):
+        idle_days = options['idle_days'] if options['idle_days'] is not None else get_setting('IDLE_DAYS')
+        batch_size = options['batch_size'] or get_setting('BATCH_SIZE')
+        carts = CartServices.abandoned(timedelta(days=idle_days))
+
+        if options['dry_run']:
+            results = {'dry_run': True, 'carts': carts.count(), 'items': CartItem.objects.filter(cart__in=carts).count()}
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+
+        record_stats = False if options['no_stats'] else get_setting('RECORD_STATS')
+        results = {'carts': 0, 'items': 0, 'batches': 0, 'stats_recorded': record_stats}
+        started = time.perf_counter()
+        while options['max_batches'] is None or results['batches'] < options['max_batches']:
+            deleted_carts, deleted_items = CartServices.sweep_batch(carts, batch_size, record_stats)
+            if not deleted_carts:
+                break
+            results['carts'] += deleted_carts
+            results['items'] += deleted_items
+            results['batches'] += 1
+            if deleted_carts < batch_size:
+                break
+            time.sleep(options['pause'])
+        results['seconds'] = round(time.perf_counter() - started, 3)
+        self.stdout.write(json.dumps(results, indent=2))
@@ -0,0 +1,18 @@
+# Generated by Django 5.2 on 2026-10-19 11:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0002_order_address'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='orderitem',
+            name='stock_reserved',
+            field=models.BooleanField(default=False),
+        ),
+    ]
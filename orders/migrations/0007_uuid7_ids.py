@@ -0,0 +1,24 @@
+# Generated by Django 5.2 on 2026-10-19 12:15
+
+import nomino.uuids
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0006_order_delivery_zone'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='cart',
+            name='id',
+            field=models.UUIDField(default=nomino.uuids.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='order',
+            name='id',
+            field=models.UUIDField(default=nomino.uuids.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+    ]
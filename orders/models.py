@@ -1,15 +1,21 @@
 from django.db import models
 from users.models import User
 from food_item.models import FoodItem
-from uuid import uuid4
+from delivery.models import DeliveryZone
+from nomino.uuids import uuid7
 from django.core.validators import MinValueValidator
 
 # Create your models here.
 
 class Cart(models.Model):
-    id = models.UUIDField(primary_key=True, default=uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='cart')
     created_at = models.DateTimeField(auto_now_add=True)
+    # Also moved by CartServices.touch when the cart's items change, so idle carts can be swept.
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        indexes = [models.Index(fields=['created_at']), models.Index(fields=['updated_at'])]
     
     def __str__(self):
         return f"Cart of {self.user.first_name} {self.user.last_name}"
@@ -39,13 +45,33 @@ class Order(models.Model):
         (DELIVERED, 'Delivered'),
         (CANCELED, 'Canceled')
     ]
-    id = models.UUIDField(primary_key=True, default=uuid4, editable=False)
+    
+    # Statuses an order may move to from each status. Delivered and canceled orders are final.
+    TRANSITIONS = {
+        PENDING: [CONFIRMED, CANCELED],
+        CONFIRMED: [DELIVERED, CANCELED],
+        DELIVERED: [],
+        CANCELED: [],
+    }
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='orders')
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=PENDING)
     total_price = models.DecimalField(max_digits=10, decimal_places=2)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     address = models.TextField()
+    # Where the order is delivered, set at checkout; the zone is None outside every zone.
+    latitude = models.FloatField(null=True, blank=True)
+    longitude = models.FloatField(null=True, blank=True)
+    delivery_zone = models.ForeignKey(DeliveryZone, on_delete=models.SET_NULL, null=True, blank=True, related_name='orders')
+    # Bumped by every status change; writes are conditional on the version that was read.
+    version = models.PositiveIntegerField(default=0)
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['created_at']),
+            models.Index(fields=['delivery_zone', 'status']),
+        ]
     
     def __str__(self):
         return f"Order {self.id} by {self.user.email} - {self.status}"
@@ -57,6 +83,7 @@ class OrderItem(models.Model):
     quantity = models.PositiveIntegerField()
     price = models.DecimalField(max_digits=10, decimal_places=2)
     total_price = models.DecimalField(max_digits=12, decimal_places=2)
+    stock_reserved = models.BooleanField(default=False)
     
     def __str__(self):
         return f"{self.food_item.name} x {self.quantity}"
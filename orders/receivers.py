@@ -0,0 +1,27 @@
+from django.dispatch import receiver
+from orders.signals import order_placed, order_status_changed
+from orders.events import get_broker, order_event
+from orders.kitchen import kitchen_queue, track_status_changes
+
+
+@receiver(order_placed)
+def publish_order_placed(sender, order, **kwargs):
+    get_broker().publish(order.user_id, order_event('order.placed', order))
+
+
+@receiver(order_status_changed)
+def publish_order_status_changed(sender, orders, previous_status, **kwargs):
+    broker = get_broker()
+    for order in orders:
+        broker.publish(order.user_id, order_event('order.status_changed', order, previous_status[order.pk]))
+
+
+@receiver(order_placed)
+def remember_order_lines_for_kitchen(sender, order, items, **kwargs):
+    lines = [(item.food_item_id, item.food_item.name, item.quantity) for item in items]
+    kitchen_queue.remember_pending(order.pk, order.created_at, lines, order.delivery_zone_id)
+
+
+@receiver(order_status_changed)
+def update_kitchen_queue(sender, orders, previous_status, **kwargs):
+    track_status_changes(orders=orders, previous_status=previous_status)
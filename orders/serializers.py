@@ -1,7 +1,11 @@
 from rest_framework import serializers
 from orders.models import Cart, CartItem, Order, OrderItem
 from food_item.models import FoodItem
+from delivery.models import Address
 from orders.services import OrderServices
+from orders.exceptions import OrderConflict
+from orders.exports import EXPORT_FORMATS
+from nomino.docs import swagger_serializer_method
 
 
 
@@ -70,6 +74,7 @@ class CartSerializer(serializers.ModelSerializer):
 
 class OrderCreateSerializer(serializers.Serializer):
     cart_id = serializers.UUIDField()
+    address_id = serializers.IntegerField(required=False, help_text="One of the user's addresses. Defaults to their default address.")
     
     def validate_cart_id(self, cart_id):
         if not Cart.objects.get(id=cart_id):
@@ -83,12 +88,19 @@ class OrderCreateSerializer(serializers.Serializer):
             raise serializers.ValidationError("You can only create an order for your own cart!")
         
         return cart_id
+    
+    def validate_address_id(self, address_id):
+        address = Address.objects.filter(id=address_id, user=self.context.get('user')).first()
+        if address is None:
+            raise serializers.ValidationError("You have no address with this id.")
+        return address
+    
     def create(self, validated_data):
         user = self.context.get('user')
         cart_id = validated_data.get('cart_id')
         
         try:
-            order = OrderServices.create_order(user=user, cart_id=cart_id)
+            order = OrderServices.create_order(user=user, cart_id=cart_id, address=validated_data.get('address_id'))
             return order
         except ValueError as e:
             raise serializers.ValidationError(str(e))
@@ -100,9 +112,17 @@ class OrderCreateSerializer(serializers.Serializer):
 class UpdateOrderSerializer(serializers.ModelSerializer):
     class Meta:
         model = Order
-        fields = ['status']
+        fields = ['status','version']
+        extra_kwargs = {
+            'version': {'required': False, 'read_only': False}
+        }
         
         
+    def validate_version(self, version):
+        if self.instance is not None and version != self.instance.version:
+            raise OrderConflict()
+        return version
+        
     def update(self, instance, validated_data):
         user = self.context['user']
         new_status = validated_data['status']
@@ -113,7 +133,7 @@ class UpdateOrderSerializer(serializers.ModelSerializer):
         if not user.is_staff:
             raise serializers.ValidationError({'detail':"You are not allowed to update the order!"})
         
-        return super().update(instance,validated_data)
+        return OrderServices.update_status(order=instance, status=new_status)
     
     
 class OrderItemSerializer(serializers.ModelSerializer):
@@ -127,7 +147,55 @@ class OrderSerializer(serializers.ModelSerializer):
     items = OrderItemSerializer(many=True)
     class Meta:
         model = Order
-        fields = ['id','address','user','status','total_price','created_at','items']
+        fields = ['id','address','delivery_zone','user','status','version','total_price','created_at','items']
+        
+        
+class OrderExportSerializer(serializers.Serializer):
+    start = serializers.DateField(required=False)
+    end = serializers.DateField(required=False)
+    status = serializers.ChoiceField(choices=Order.STATUS_CHOICES, required=False)
+    output = serializers.ChoiceField(choices=list(EXPORT_FORMATS), default='csv')
+    
+    def validate(self, attrs):
+        if attrs.get('start') and attrs.get('end') and attrs['start'] > attrs['end']:
+            raise serializers.ValidationError("start must not be after end.")
+        return attrs
+        
+        
+class BulkOrderTransitionSerializer(serializers.Serializer):
+    ids = serializers.ListField(child=serializers.UUIDField(), min_length=1, max_length=500)
+    status = serializers.ChoiceField(choices=Order.STATUS_CHOICES)
+    
+    def validate_ids(self, ids):
+        return list(dict.fromkeys(ids))
+    
+    def create(self, validated_data):
+        return OrderServices.bulk_transition(order_ids=validated_data['ids'], status=validated_data['status'])
+    
+    def to_representation(self, instance):
+        updated = sum(1 for result in instance if result['result'] == 'updated')
+        return BulkOrderTransitionResponseSerializer({'updated': updated, 'results': instance}).data
+    
+    
+class BulkOrderTransitionResultSerializer(serializers.Serializer):
+    id = serializers.UUIDField()
+    result = serializers.CharField()
+    status = serializers.CharField(allow_null=True)
+    
+    
+class BulkOrderTransitionResponseSerializer(serializers.Serializer):
+    updated = serializers.IntegerField()
+    results = BulkOrderTransitionResultSerializer(many=True)
+        
+        
+class ZoneOrderCountQuerySerializer(serializers.Serializer):
+    status = serializers.ChoiceField(choices=Order.STATUS_CHOICES, required=False)
+    
+    
+class ZoneOrderCountSerializer(serializers.Serializer):
+    zone = serializers.IntegerField(allow_null=True)
+    name = serializers.CharField(allow_null=True)
+    orders = serializers.IntegerField()
         
         
 class EmptySerializer(serializers.Serializer):
@@ -135,3 +203,35 @@ class EmptySerializer(serializers.Serializer):
 
 
 
+class KitchenOrderLineSerializer(serializers.Serializer):
+    food_item = serializers.IntegerField()
+    name = serializers.CharField()
+    quantity = serializers.IntegerField()
+    
+    
+class KitchenOrderSerializer(serializers.Serializer):
+    id = serializers.UUIDField()
+    zone = serializers.IntegerField(source='zone_id', allow_null=True)
+    created_at = serializers.DateTimeField()
+    promised_at = serializers.DateTimeField()
+    items = serializers.SerializerMethodField(method_name='get_items')
+    
+    @swagger_serializer_method(serializer_or_field=KitchenOrderLineSerializer(many=True))
+    def get_items(self, instance):
+        lines = [{'food_item': food_item_id, 'name': name, 'quantity': quantity} for food_item_id, name, quantity in instance.lines]
+        return KitchenOrderLineSerializer(lines, many=True).data
+    
+    
+class KitchenBatchSerializer(serializers.Serializer):
+    food_item = serializers.IntegerField()
+    name = serializers.CharField()
+    quantity = serializers.IntegerField()
+    orders = serializers.IntegerField()
+    
+    
+class KitchenQueueSerializer(serializers.Serializer):
+    open_orders = serializers.IntegerField()
+    orders = KitchenOrderSerializer(many=True)
+    batches = KitchenBatchSerializer(many=True)
+    
+    
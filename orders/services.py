@@ -1,20 +1,48 @@
 from orders.models import Order, OrderItem, Cart, CartItem
+from analytics.services import AnalyticsServices
+from food_item.services import StockServices
+from delivery.services import DeliveryServices
+from collections import defaultdict
+from datetime import timedelta
+from django.conf import settings
 from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
 from rest_framework.exceptions import PermissionDenied, ValidationError
+from orders.signals import order_placed, order_status_changed, send_on_commit
+from orders.exceptions import OrderConflict
+
+DEFAULTS = {
+    'IDLE_DAYS': 30,
+    'BATCH_SIZE': 500,
+    'RECORD_STATS': True,
+}
+
+
+def get_setting(name):
+    return getattr(settings, 'ABANDONED_CARTS', {}).get(name, DEFAULTS[name])
+
 
 class OrderServices:
     
     
     @staticmethod
-    def create_order(user, cart_id):
+    def create_order(user, cart_id, address=None):
+        """
+        Place an order for the items in the cart, delivered to ``address`` (a delivery.Address)
+        or the user's default address, and assigned to the delivery zone containing it.
+        """
+        point = DeliveryServices.delivery_point(user, address)
         
         with transaction.atomic():
             cart = Cart.objects.get(id=cart_id)
             cart_items = CartItem.objects.select_related('food_item').filter(cart=cart)
+            reserved = StockServices.reserve([(item.food_item, item.quantity) for item in cart_items], timezone.localdate())
             total_price = sum([item.food_item.price*item.quantity for item in cart_items])
-            address = user.address if hasattr(user, 'address') and user.address else "User doesn't have any address yet!"
-            print(f"User: {user}, Address: {address}")
-            order = Order.objects.create(user=user, total_price=total_price, address=address)
+            order = Order.objects.create(
+                user=user, total_price=total_price, address=point.text,
+                latitude=point.latitude, longitude=point.longitude, delivery_zone_id=point.zone_id
+            )
             
             order_items = [
                     OrderItem(
@@ -22,7 +50,8 @@ class OrderServices:
                         food_item = item.food_item,
                         price = item.food_item.price,
                         quantity = item.quantity,
-                        total_price = item.food_item.price*item.quantity
+                        total_price = item.food_item.price*item.quantity,
+                        stock_reserved = item.food_item_id in reserved
                     )
                     for item in cart_items
                 ]
@@ -30,15 +59,14 @@ class OrderServices:
             OrderItem.objects.bulk_create(order_items)
             
             cart.delete()
+            send_on_commit(order_placed, sender=Order, order=order, items=order_items)
             return order
         
         
     @staticmethod
     def cancel_order(user,order):
         if user.is_staff:
-            order.status = Order.CANCELED
-            order.save()
-            return order
+            return OrderServices.update_status(order=order, status=Order.CANCELED)
         
         if user != order.user:
             raise PermissionDenied({"detail" : "You can only cancel your own order!"})
@@ -46,7 +74,133 @@ class OrderServices:
         if order.status == Order.DELIVERED:
             raise ValidationError({'detail':"Your product is already delivered. You can't cancel the order now!"})
         
-        order.status = Order.CANCELED
-        order.save()
+        return OrderServices.update_status(order=order, status=Order.CANCELED)
+    
+    
+    @staticmethod
+    def update_status(order, status):
+        """
+        Move ``order`` to ``status`` if Order.TRANSITIONS allows it, with an
+        `UPDATE ... WHERE version = n` that only writes the changed columns.
+        Raises OrderConflict when the order changed since it was read.
+        """
+        previous_status = order.status
+        if status == previous_status:
+            return order
+        if status not in Order.TRANSITIONS[previous_status]:
+            raise ValidationError({'detail': f"A {previous_status.lower()} order can't be changed to {status.lower()}."})
+        
+        updated_at = timezone.now()
+        with transaction.atomic():
+            updated = Order.objects.filter(pk=order.pk, version=order.version).update(
+                status=status, version=F('version') + 1, updated_at=updated_at
+            )
+            if not updated:
+                raise OrderConflict()
+            order.status = status
+            order.version += 1
+            order.updated_at = updated_at
+            if status == Order.CANCELED:
+                OrderServices.release_stock([order])
+        
+        send_on_commit(order_status_changed, sender=Order, orders=[order], previous_status={order.pk: previous_status})
         return order
-        
\ No newline at end of file
+    
+    
+    @staticmethod
+    def bulk_transition(order_ids, status):
+        """
+        Move every order in ``order_ids`` that allows it to ``status`` with one
+        `UPDATE ... WHERE id IN (...) AND status IN (...)`.
+        Returns the outcome for each id: updated, unchanged, invalid_transition or not_found.
+        """
+        allowed_from = [current for current, targets in Order.TRANSITIONS.items() if status in targets]
+        results = {order_id: {'id': order_id, 'result': 'not_found', 'status': None} for order_id in order_ids}
+        
+        with transaction.atomic():
+            orders = list(
+                Order.objects.select_for_update()
+                .filter(id__in=results)
+                .only('id', 'status', 'version', 'total_price', 'created_at', 'user_id')
+            )
+            previous_status = {order.pk: order.status for order in orders}
+            changed = [order for order in orders if order.status in allowed_from]
+            
+            if changed:
+                Order.objects.filter(id__in=[order.pk for order in changed], status__in=allowed_from).update(
+                    status=status, version=F('version') + 1, updated_at=timezone.now()
+                )
+                for order in changed:
+                    order.status = status
+                    order.version += 1
+                if status == Order.CANCELED:
+                    OrderServices.release_stock(changed)
+                send_on_commit(order_status_changed, sender=Order, orders=changed, previous_status=previous_status)
+        
+        for order in orders:
+            if previous_status[order.pk] == status:
+                result = 'unchanged'
+            elif order.status == status:
+                result = 'updated'
+            else:
+                result = 'invalid_transition'
+            results[order.pk] = {'id': order.pk, 'result': result, 'status': order.status}
+        return list(results.values())
+    
+    
+    @staticmethod
+    def release_stock(orders):
+        """
+        Return the stock reserved by ``orders`` at checkout to the day it was taken from.
+        """
+        days = {order.pk: timezone.localdate(order.created_at) for order in orders}
+        items = OrderItem.objects.filter(order_id__in=days, stock_reserved=True)
+        lines = defaultdict(list)
+        for order_id, food_item_id, quantity in items.values_list('order_id', 'food_item_id', 'quantity'):
+            lines[days[order_id]].append((food_item_id, quantity))
+        
+        for day, day_lines in lines.items():
+            StockServices.release(day_lines, day)
+        if lines:
+            items.update(stock_reserved=False)
+
+
+class CartServices:
+    
+    
+    @staticmethod
+    def touch(cart_id):
+        """
+        Mark the cart as changed now, after its items change.
+        """
+        Cart.objects.filter(pk=cart_id).update(updated_at=timezone.now())
+    
+    
+    @staticmethod
+    def abandoned(idle=None):
+        """
+        Carts not changed for ``idle`` (a timedelta, ABANDONED_CARTS['IDLE_DAYS'] by default).
+        """
+        idle = idle if idle is not None else timedelta(days=get_setting('IDLE_DAYS'))
+        return Cart.objects.filter(updated_at__lt=timezone.now() - idle)
+    
+    
+    @staticmethod
+    def sweep_batch(carts, batch_size=None, record_stats=None):
+        """
+        Delete up to ``batch_size`` of the oldest carts in the queryset ``carts`` and their items
+        in one short transaction, recording them in the abandoned cart rollup first when
+        ``record_stats`` is set. Carts locked by a request are left for the next batch.
+        Returns (carts deleted, items deleted).
+        """
+        batch_size = batch_size or get_setting('BATCH_SIZE')
+        record_stats = get_setting('RECORD_STATS') if record_stats is None else record_stats
+        with transaction.atomic():
+            ids = list(carts.order_by('updated_at').select_for_update(skip_locked=True).values_list('pk', flat=True)[:batch_size])
+            if not ids:
+                return 0, 0
+            batch = carts.filter(pk__in=ids)
+            if record_stats:
+                AnalyticsServices.record_abandoned_carts(batch)
+            _, deleted = batch.delete()
+        return deleted.get(Cart._meta.label, 0), deleted.get(CartItem._meta.label, 0)
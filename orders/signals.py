@@ -0,0 +1,28 @@
+import logging
+from django.db import transaction
+from django.dispatch import Signal
+
+logger = logging.getLogger(__name__)
+
+
+# Sent after the transaction that placed an order has committed.
+# Receivers get ``order`` and ``items`` (the OrderItem instances that were created).
+order_placed = Signal()
+
+# Sent after the transaction that changed the status of one or more orders has committed.
+# Receivers get ``orders`` and ``previous_status`` (a dict of order pk -> old status),
+# so bulk transitions are delivered as a single event.
+order_status_changed = Signal()
+
+
+def send_on_commit(signal, **kwargs):
+    """
+    Send ``signal`` once the current transaction commits.
+    Failing receivers are logged instead of breaking the request that already committed.
+    """
+    def send():
+        for receiver, response in signal.send_robust(**kwargs):
+            if isinstance(response, Exception):
+                logger.error("Order signal receiver %r failed", receiver, exc_info=response)
+
+    transaction.on_commit(send)
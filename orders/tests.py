@@ -1,3 +1,805 @@
-from django.test import TestCase
+import asyncio
+import csv
+import io
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+import unittest
+import uuid
+from datetime import timedelta
+from decimal import Decimal
+from django.db import connection, OperationalError
+from django.conf import settings
+from django.core.management import CommandError, call_command
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from analytics.models import DailyAbandonedCarts
+from delivery.models import DeliveryZone
+from food_item.models import Category, FoodItem, FoodItemStock
+from food_item.services import StockServices
+from nomino.uuids import uuid7_at, uuid7_time
+from orders.events import InMemoryOrderEventBroker, get_broker
+from orders.ids import created_range
+from orders.kitchen import KitchenQueue, get_kitchen_queue, kitchen_queue, track_status_changes
+from orders.models import Cart, CartItem, Order, OrderItem
+from orders.services import OrderServices
+from orders.signals import order_status_changed
+from orders.views import _order_event_stream
+from orders.exceptions import OrderConflict
+from rest_framework.exceptions import ValidationError
+from rest_framework.test import APIClient
+from users.models import User
 
 # Create your tests here.
+
+
+def create_food_item():
+    category = Category.objects.create(name='Soups', details='Hot soups')
+    return FoodItem.objects.create(name='Chicken Soup', category=category, description='Soup', price='4.50', image='soup.jpg')
+
+
+def create_cart(email, food_item, quantity=1):
+    user = User.objects.create_user(email=email)
+    cart = Cart.objects.create(user=user)
+    CartItem.objects.create(cart=cart, food_item=food_item, quantity=quantity)
+    return user, cart.id
+
+
+class StockReservationTests(TestCase):
+
+    def setUp(self):
+        self.food_item = create_food_item()
+        StockServices.set_daily_stock(self.food_item, timezone.localdate(), 3)
+
+    def remaining(self):
+        return sum(FoodItemStock.objects.filter(food_item=self.food_item).values_list('quantity', flat=True))
+
+    def test_checkout_fails_when_sold_out(self):
+        user, cart_id = create_cart('hungry@example.com', self.food_item, quantity=4)
+
+        with self.assertRaises(ValueError):
+            OrderServices.create_order(user=user, cart_id=cart_id)
+        self.assertEqual(self.remaining(), 3)
+        self.assertFalse(Order.objects.exists())
+
+    def test_cancel_releases_stock(self):
+        user, cart_id = create_cart('hungry@example.com', self.food_item, quantity=2)
+        order = OrderServices.create_order(user=user, cart_id=cart_id)
+        self.assertEqual(self.remaining(), 1)
+
+        OrderServices.cancel_order(user=user, order=order)
+        self.assertEqual(self.remaining(), 3)
+
+    def test_items_without_stock_are_not_limited(self):
+        FoodItemStock.objects.all().delete()
+        user, cart_id = create_cart('hungry@example.com', self.food_item, quantity=50)
+
+        order = OrderServices.create_order(user=user, cart_id=cart_id)
+        self.assertFalse(order.items.get().stock_reserved)
+
+    def checkout_until_sold_out(self, checkouts, quantity=1):
+        outcomes = []
+        for index in range(checkouts):
+            user, cart_id = create_cart(f'customer{index}@example.com', self.food_item, quantity=quantity)
+            try:
+                OrderServices.create_order(user=user, cart_id=cart_id)
+                outcomes.append('ordered')
+            except ValueError:
+                outcomes.append('sold out')
+        return outcomes
+
+    def test_single_row_stock_sells_out_without_going_negative(self):
+        outcomes = self.checkout_until_sold_out(5)
+        self.assertEqual(outcomes, ['ordered'] * 3 + ['sold out'] * 2)
+        self.assertEqual(self.remaining(), 0)
+
+    def test_sharded_stock_is_taken_across_shards(self):
+        StockServices.set_daily_stock(self.food_item, timezone.localdate(), 12, shards=4)
+        # Each checkout needs more than any one shard (3) holds.
+        outcomes = self.checkout_until_sold_out(5, quantity=5)
+
+        self.assertEqual(outcomes, ['ordered'] * 2 + ['sold out'] * 3)
+        self.assertEqual(self.remaining(), 2)
+        self.assertFalse(FoodItemStock.objects.filter(quantity__lt=0).exists())
+
+
+@unittest.skipUnless(connection.vendor == 'postgresql', "SQLite has no row locks, so checkouts can't race on it.")
+class StockReservationConcurrencyTests(TransactionTestCase):
+    checkouts = 30
+    stock = 12
+
+    def setUp(self):
+        self.food_item = create_food_item()
+        self.carts = [create_cart(f'customer{i}@example.com', self.food_item) for i in range(self.checkouts)]
+
+    def checkout_concurrently(self):
+        barrier = threading.Barrier(len(self.carts))
+        outcomes = []
+
+        def checkout(user, cart_id):
+            barrier.wait()
+            try:
+                for attempt in range(100):
+                    try:
+                        OrderServices.create_order(user=user, cart_id=cart_id)
+                        outcomes.append('ordered')
+                        return
+                    except ValueError:
+                        outcomes.append('sold out')
+                        return
+                    except OperationalError:
+                        # The database may abort a transaction that deadlocks; retry like a client would.
+                        time.sleep(random.uniform(0, 0.01))
+                outcomes.append('failed')
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=checkout, args=cart) for cart in self.carts]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return outcomes
+
+    def assert_not_oversold(self, outcomes):
+        ordered = outcomes.count('ordered')
+        remaining = sum(FoodItemStock.objects.filter(food_item=self.food_item).values_list('quantity', flat=True))
+
+        self.assertEqual(len(outcomes), self.checkouts)
+        self.assertNotIn('failed', outcomes)
+        self.assertEqual(ordered, self.stock)
+        self.assertEqual(outcomes.count('sold out'), self.checkouts - self.stock)
+        self.assertEqual(Order.objects.count(), self.stock)
+        self.assertEqual(remaining, 0)
+        self.assertFalse(FoodItemStock.objects.filter(quantity__lt=0).exists())
+
+    def test_single_row_stock_is_not_oversold(self):
+        StockServices.set_daily_stock(self.food_item, timezone.localdate(), self.stock)
+        self.assert_not_oversold(self.checkout_concurrently())
+
+    def test_sharded_stock_is_not_oversold(self):
+        StockServices.set_daily_stock(self.food_item, timezone.localdate(), self.stock, shards=4)
+        self.assert_not_oversold(self.checkout_concurrently())
+
+
+class OrderStatusTests(TestCase):
+
+    def setUp(self):
+        self.customer, cart_id = create_cart('customer@example.com', create_food_item())
+        self.staff = User.objects.create_user(email='staff@example.com', is_staff=True)
+        self.order = OrderServices.create_order(user=self.customer, cart_id=cart_id)
+
+    def test_transition_bumps_version(self):
+        OrderServices.update_status(order=self.order, status=Order.CONFIRMED)
+
+        self.order.refresh_from_db()
+        self.assertEqual((self.order.status, self.order.version), (Order.CONFIRMED, 1))
+
+    def test_stale_order_is_rejected(self):
+        stale = Order.objects.get(id=self.order.id)
+        OrderServices.update_status(order=self.order, status=Order.CONFIRMED)
+
+        with self.assertRaises(OrderConflict):
+            OrderServices.update_status(order=stale, status=Order.CANCELED)
+        self.assertEqual(Order.objects.get(id=self.order.id).status, Order.CONFIRMED)
+
+    def test_transition_must_be_allowed(self):
+        with self.assertRaises(ValidationError):
+            OrderServices.update_status(order=self.order, status=Order.DELIVERED)
+
+    def test_patch_with_stale_version_returns_conflict(self):
+        client = APIClient()
+        client.force_authenticate(self.staff)
+
+        response = client.patch(f'/api/v1/orders/{self.order.id}/', {'status': Order.CONFIRMED, 'version': 0}, format='json')
+        self.assertEqual(response.status_code, 200)
+        response = client.patch(f'/api/v1/orders/{self.order.id}/', {'status': Order.DELIVERED, 'version': 0}, format='json')
+        self.assertEqual(response.status_code, 409)
+
+
+class BulkTransitionTests(TestCase):
+
+    def setUp(self):
+        self.food_item = create_food_item()
+        StockServices.set_daily_stock(self.food_item, timezone.localdate(), 10)
+        self.staff = User.objects.create_user(email='staff@example.com', is_staff=True)
+        self.orders = []
+        for index in range(3):
+            user, cart_id = create_cart(f'customer{index}@example.com', self.food_item, quantity=2)
+            self.orders.append(OrderServices.create_order(user=user, cart_id=cart_id))
+        self.delivered = OrderServices.update_status(order=OrderServices.update_status(order=self.orders[2], status=Order.CONFIRMED), status=Order.DELIVERED)
+        self.events = []
+        order_status_changed.connect(self.record_event)
+        self.addCleanup(order_status_changed.disconnect, self.record_event)
+
+    def record_event(self, sender, orders, previous_status, **kwargs):
+        self.events.append(({order.pk: order.status for order in orders}, previous_status))
+
+    def remaining(self):
+        return sum(FoodItemStock.objects.filter(food_item=self.food_item).values_list('quantity', flat=True))
+
+    def test_results_for_each_order(self):
+        pending, confirmed = self.orders[0], OrderServices.update_status(order=self.orders[1], status=Order.CONFIRMED)
+        missing = uuid.uuid4()
+
+        results = OrderServices.bulk_transition([pending.id, confirmed.id, self.delivered.id, missing], Order.CONFIRMED)
+        self.assertEqual(results, [
+            {'id': pending.id, 'result': 'updated', 'status': Order.CONFIRMED},
+            {'id': confirmed.id, 'result': 'unchanged', 'status': Order.CONFIRMED},
+            {'id': self.delivered.id, 'result': 'invalid_transition', 'status': Order.DELIVERED},
+            {'id': missing, 'result': 'not_found', 'status': None},
+        ])
+        self.assertEqual(
+            {order.id: (order.status, order.version) for order in Order.objects.all()},
+            {pending.id: (Order.CONFIRMED, 1), confirmed.id: (Order.CONFIRMED, 1), self.delivered.id: (Order.DELIVERED, 2)},
+        )
+
+    def test_orders_change_in_one_conditional_update(self):
+        with CaptureQueriesContext(connection) as queries:
+            OrderServices.bulk_transition([order.id for order in self.orders], Order.CONFIRMED)
+        updates = [query['sql'] for query in queries.captured_queries if query['sql'].startswith('UPDATE')]
+        self.assertEqual(len(updates), 1)
+        self.assertIn('"status" IN', updates[0])
+        self.assertIn('"version" + 1', updates[0])
+
+        order_ids = [order.id for order in self.orders]
+        with self.assertNumQueries(2 + 2 * connection.features.uses_savepoints):
+            OrderServices.bulk_transition(order_ids[:2], Order.DELIVERED)
+        self.assertEqual(list(Order.objects.filter(id__in=order_ids[:2]).values_list('version', flat=True)), [2, 2])
+
+    def test_cancellation_releases_stock_and_signals_after_commit(self):
+        self.assertEqual(self.remaining(), 4)
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            OrderServices.bulk_transition([self.orders[0].id, self.orders[1].id, self.delivered.id], Order.CANCELED)
+            self.assertEqual(self.events, [])
+        self.assertEqual(self.remaining(), 8)
+
+        for callback in callbacks:
+            callback()
+        self.assertEqual(self.events, [(
+            {self.orders[0].id: Order.CANCELED, self.orders[1].id: Order.CANCELED},
+            {self.orders[0].id: Order.PENDING, self.orders[1].id: Order.PENDING, self.delivered.id: Order.DELIVERED},
+        )])
+
+    def test_endpoint_is_staff_only(self):
+        client = APIClient()
+        payload = {'ids': [str(self.orders[0].id), str(self.orders[0].id)], 'status': Order.CONFIRMED}
+        client.force_authenticate(self.orders[0].user)
+        self.assertEqual(client.post('/api/v1/orders/bulk-transition/', payload, format='json').status_code, 403)
+
+        client.force_authenticate(self.staff)
+        response = client.post('/api/v1/orders/bulk-transition/', payload, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {'updated': 1, 'results': [{'id': str(self.orders[0].id), 'result': 'updated', 'status': Order.CONFIRMED}]})
+
+
+class OrderEventTests(TestCase):
+
+    def event(self, number):
+        return {'type': 'order.status_changed', 'id': str(number), 'status': Order.CONFIRMED, 'previous_status': Order.PENDING}
+
+    async def test_events_fan_out_to_every_stream_of_the_user(self):
+        broker = InMemoryOrderEventBroker()
+        async with broker.subscribe(1) as first, broker.subscribe(1) as second, broker.subscribe(2) as other:
+            self.assertEqual(broker.subscriber_count(), 3)
+            # publish is called from the threads that commit order changes.
+            await asyncio.to_thread(broker.publish, 1, self.event(1))
+            await asyncio.sleep(0)
+
+            self.assertEqual([first.get_nowait(), second.get_nowait()], [self.event(1), self.event(1)])
+            self.assertTrue(other.empty())
+        self.assertEqual(broker.subscriber_count(), 0)
+
+    @override_settings(ORDER_EVENTS={'QUEUE_SIZE': 2})
+    async def test_full_stream_drops_its_oldest_event(self):
+        broker = InMemoryOrderEventBroker()
+        async with broker.subscribe(1) as queue:
+            for number in range(3):
+                broker.publish(1, self.event(number))
+            await asyncio.sleep(0)
+
+            self.assertEqual([queue.get_nowait(), queue.get_nowait()], [self.event(1), self.event(2)])
+            self.assertTrue(queue.empty())
+
+    @override_settings(ORDER_EVENTS={'HEARTBEAT_SECONDS': 0.01})
+    async def test_stream_frames(self):
+        broker = get_broker()
+        subscribers = broker.subscriber_count()
+        stream = _order_event_stream(1)
+        self.assertEqual(await anext(stream), "retry: 5000\n\n")
+        self.assertEqual(await anext(stream), ": keep-alive\n\n")
+
+        broker.publish(1, self.event(7))
+        self.assertEqual(await anext(stream), f"event: order.status_changed\ndata: {json.dumps(self.event(7))}\n\n")
+        self.assertEqual(broker.subscriber_count(), subscribers + 1)
+
+        # The server closes the generator when the client disconnects.
+        await stream.aclose()
+        self.assertEqual(broker.subscriber_count(), subscribers)
+
+    def test_stream_needs_asgi(self):
+        response = self.client.get('/api/v1/orders/events/')
+        self.assertEqual(response.status_code, 501)
+
+    async def test_stream_needs_a_token(self):
+        response = await self.async_client.get('/api/v1/orders/events/')
+        self.assertEqual(response.status_code, 401)
+        response = await self.async_client.get('/api/v1/orders/events/', {'token': 'not-a-token'})
+        self.assertEqual(response.status_code, 401)
+
+
+class OrderStatusConcurrencyTests(TransactionTestCase):
+    rounds = 10
+
+    def setUp(self):
+        food_item = create_food_item()
+        self.staff = User.objects.create_user(email='staff@example.com', is_staff=True)
+        self.orders = []
+        for i in range(self.rounds):
+            customer, cart_id = create_cart(f'customer{i}@example.com', food_item)
+            order = OrderServices.create_order(user=customer, cart_id=cart_id)
+            self.orders.append(OrderServices.update_status(order=order, status=Order.CONFIRMED))
+
+    def race(self, order):
+        barrier = threading.Barrier(2)
+        outcomes = {}
+
+        def change(user, status):
+            instance = Order.objects.get(id=order.id)
+            barrier.wait()
+            try:
+                for attempt in range(100):
+                    try:
+                        if status == Order.CANCELED:
+                            OrderServices.cancel_order(user=user, order=instance)
+                        else:
+                            OrderServices.update_status(order=instance, status=status)
+                        outcomes[status] = 'applied'
+                        return
+                    except OrderConflict:
+                        outcomes[status] = 'conflict'
+                        return
+                    except OperationalError:
+                        time.sleep(random.uniform(0, 0.01))
+            finally:
+                connection.close()
+
+        threads = [
+            threading.Thread(target=change, args=(order.user, Order.CANCELED)),
+            threading.Thread(target=change, args=(self.staff, Order.DELIVERED)),
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return outcomes
+
+    def test_racing_cancel_and_delivery_cannot_both_win(self):
+        for order in self.orders:
+            outcomes = self.race(order)
+
+            self.assertEqual(sorted(outcomes.values()), ['applied', 'conflict'])
+            winner = next(status for status, outcome in outcomes.items() if outcome == 'applied')
+            order.refresh_from_db()
+            self.assertEqual(order.status, winner)
+            self.assertEqual(order.version, 2)
+
+
+class KitchenQueueTests(TestCase):
+
+    def setUp(self):
+        self.now = timezone.now()
+        self.queue = KitchenQueue(prep_time=timedelta(minutes=20))
+
+    def add(self, order_id, minutes_ago, lines=((7, 'Soup', 1),), zone_id=None):
+        return self.queue.add(order_id, self.now - timedelta(minutes=minutes_ago), list(lines), zone_id)
+
+    def test_snapshot_lists_the_oldest_orders_first(self):
+        for order_id, minutes_ago in ((1, 5), (2, 30), (3, 10), (4, 10), (5, 1)):
+            self.add(order_id, minutes_ago)
+
+        orders, _ = self.queue.snapshot(limit=4)
+        self.assertEqual([order.id for order in orders], [2, 3, 4, 1])
+        self.assertEqual(orders[0].promised_at, self.now - timedelta(minutes=10))
+        self.assertEqual([order.id for order in self.queue.snapshot(limit=10)[0]], [2, 3, 4, 1, 5])
+
+    def test_batches_follow_adds_and_removes(self):
+        self.assertTrue(self.add(1, 3, [(7, 'Soup', 2), (8, 'Rice', 1)]))
+        self.assertTrue(self.add(2, 2, [(8, 'Rice', 4)]))
+        self.assertFalse(self.add(1, 1, [(7, 'Soup', 9)]))
+        self.assertEqual(self.queue.snapshot()[1], [
+            {'food_item': 8, 'name': 'Rice', 'quantity': 5, 'orders': 2},
+            {'food_item': 7, 'name': 'Soup', 'quantity': 2, 'orders': 1},
+        ])
+
+        self.assertTrue(self.queue.remove(2))
+        self.assertFalse(self.queue.remove(2))
+        self.assertEqual([(batch['food_item'], batch['quantity']) for batch in self.queue.snapshot()[1]], [(7, 2), (8, 1)])
+        self.queue.remove(1)
+        self.assertEqual((len(self.queue), self.queue.snapshot()), (0, ([], [])))
+
+    def test_removed_orders_are_compacted_out_of_the_heap(self):
+        minutes = list(range(300))
+        random.Random(1).shuffle(minutes)
+        for order_id, minutes_ago in enumerate(minutes):
+            self.add(order_id, minutes_ago)
+        for order_id in range(0, 300, 3):
+            self.queue.remove(order_id)
+        self.assertEqual(len(self.queue._heap), 300)
+
+        for order_id in range(1, 300, 3):
+            self.queue.remove(order_id)
+        self.assertLessEqual(len(self.queue._heap), 2 * len(self.queue) + 64)
+        live = sorted(range(2, 300, 3), key=lambda order_id: -minutes[order_id])
+        self.assertEqual([order.id for order in self.queue.snapshot(limit=100)[0]], live)
+
+    @override_settings(KITCHEN_QUEUE={'PENDING_CACHE_SIZE': 2})
+    def test_pending_lines_are_bounded(self):
+        for order_id in (1, 2, 3):
+            self.queue.remember_pending(order_id, self.now, [(7, 'Soup', order_id)], None)
+
+        self.assertIsNone(self.queue.pop_pending(1))
+        self.assertEqual(self.queue.pop_pending(3), (self.now, [(7, 'Soup', 3)], None))
+        self.assertIsNone(self.queue.pop_pending(3))
+
+
+class KitchenQueueTrackingTests(TestCase):
+
+    def setUp(self):
+        self.food_item = create_food_item()
+        kitchen_queue.load({})
+        self.addCleanup(setattr, kitchen_queue, 'loaded_at', None)
+
+    def place_order(self, email):
+        user, cart_id = create_cart(email, self.food_item, quantity=2)
+        with self.captureOnCommitCallbacks(execute=True):
+            return OrderServices.create_order(user=user, cart_id=cart_id)
+
+    def confirm(self, order):
+        order.status = Order.CONFIRMED
+        Order.objects.filter(pk=order.pk).update(status=Order.CONFIRMED)
+        return order
+
+    def test_confirmed_orders_join_from_the_pending_lines(self):
+        order = self.confirm(self.place_order('customer@example.com'))
+
+        with self.assertNumQueries(0):
+            track_status_changes([order], {order.pk: Order.PENDING})
+        orders, batches = kitchen_queue.snapshot()
+        self.assertEqual([(kitchen_order.id, kitchen_order.lines) for kitchen_order in orders], [(order.pk, [(self.food_item.id, 'Chicken Soup', 2)])])
+        self.assertEqual(batches[0]['quantity'], 2)
+
+    def test_orders_missing_from_the_pending_lines_are_loaded(self):
+        first, second = self.place_order('first@example.com'), self.place_order('second@example.com')
+        kitchen_queue.pop_pending(first.pk)
+        kitchen_queue.pop_pending(second.pk)
+        self.confirm(first), self.confirm(second)
+
+        with self.assertNumQueries(1):
+            track_status_changes([first, second], {first.pk: Order.PENDING, second.pk: Order.PENDING})
+        self.assertEqual([order.id for order in kitchen_queue.snapshot()[0]], [first.pk, second.pk])
+
+    def test_orders_leaving_confirmed_drop_out(self):
+        delivered, canceled = self.place_order('first@example.com'), self.place_order('second@example.com')
+        with self.captureOnCommitCallbacks(execute=True):
+            OrderServices.bulk_transition([delivered.pk, canceled.pk], Order.CONFIRMED)
+        self.assertEqual(len(kitchen_queue), 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            OrderServices.update_status(order=Order.objects.get(pk=delivered.pk), status=Order.DELIVERED)
+            OrderServices.cancel_order(user=canceled.user, order=Order.objects.get(pk=canceled.pk))
+        self.assertEqual((len(kitchen_queue), kitchen_queue.snapshot()), (0, ([], [])))
+
+    def test_unloaded_queue_is_left_for_the_next_reload(self):
+        order = self.confirm(self.place_order('customer@example.com'))
+        kitchen_queue.loaded_at = None
+
+        track_status_changes([order], {order.pk: Order.PENDING})
+        self.assertEqual(len(kitchen_queue), 0)
+        self.assertIsNone(kitchen_queue.pop_pending(order.pk))
+        self.assertEqual([kitchen_order.id for kitchen_order in get_kitchen_queue().snapshot()[0]], [order.pk])
+
+
+@override_settings(DATABASE_REPLICAS={**settings.DATABASE_REPLICAS, 'ALIASES': []})
+class OrderExportTests(TestCase):
+    header = 'order_id,created_at,user_email,status,address,order_total,food_item_id,food_item,quantity,price,line_total'
+
+    def setUp(self):
+        self.food_item = create_food_item()
+        self.rice = FoodItem.objects.create(name='Rice, fried', category=self.food_item.category, description='Rice', price='2.00', image='rice.jpg')
+        self.customer = User.objects.create_user(email='customer@example.com')
+        self.today = timezone.localdate()
+        self.old = self.create_order(Order.DELIVERED, days_ago=3, lines=[(self.food_item, 1)])
+        self.new = self.create_order(Order.CONFIRMED, days_ago=0, lines=[(self.food_item, 2), (self.rice, 1)])
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user(email='staff@example.com', is_staff=True))
+
+    def create_order(self, status, days_ago, lines):
+        created_at = timezone.now().replace(hour=12, minute=0, second=0, microsecond=0) - timedelta(days=days_ago)
+        order = Order.objects.create(id=uuid7_at(created_at), user=self.customer, status=status, total_price='11.00', address='House 4, Dhaka')
+        Order.objects.filter(pk=order.pk).update(created_at=created_at)
+        for food_item, quantity in lines:
+            OrderItem.objects.create(order=order, food_item=food_item, quantity=quantity, price=food_item.price, total_price=Decimal(food_item.price) * quantity)
+        order.refresh_from_db()
+        return order
+
+    def export(self, **params):
+        response = self.client.get('/api/v1/orders/export/', params)
+        self.assertEqual(response.status_code, 200)
+        return b''.join(response.streaming_content).decode()
+
+    def test_csv_rows(self):
+        lines = self.export().splitlines()
+        self.assertEqual(lines[0], self.header)
+        self.assertEqual(list(csv.reader(lines[1:])), [
+            [str(self.old.id), str(self.old.created_at), 'customer@example.com', Order.DELIVERED, 'House 4, Dhaka', '11.00', str(self.food_item.id), 'Chicken Soup', '1', '4.50', '4.50'],
+            [str(self.new.id), str(self.new.created_at), 'customer@example.com', Order.CONFIRMED, 'House 4, Dhaka', '11.00', str(self.food_item.id), 'Chicken Soup', '2', '4.50', '9.00'],
+            [str(self.new.id), str(self.new.created_at), 'customer@example.com', Order.CONFIRMED, 'House 4, Dhaka', '11.00', str(self.rice.id), 'Rice, fried', '1', '2.00', '2.00'],
+        ])
+
+    def test_jsonl_rows(self):
+        rows = [json.loads(line) for line in self.export(output='jsonl').splitlines()]
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(rows[2], {
+            'order_id': str(self.new.id), 'created_at': self.new.created_at.isoformat().replace('+00:00', 'Z'),
+            'user_email': 'customer@example.com', 'status': Order.CONFIRMED, 'address': 'House 4, Dhaka',
+            'order_total': '11.00', 'food_item_id': self.rice.id, 'food_item': 'Rice, fried', 'quantity': 1,
+            'price': '2.00', 'line_total': '2.00',
+        })
+
+    def test_filters(self):
+        def order_ids(**params):
+            return {row['order_id'] for row in map(json.loads, self.export(output='jsonl', **params).splitlines())}
+
+        self.assertEqual(order_ids(start=self.today), {str(self.new.id)})
+        self.assertEqual(order_ids(end=self.today - timedelta(days=1)), {str(self.old.id)})
+        self.assertEqual(order_ids(start=self.today - timedelta(days=3), end=self.today - timedelta(days=3)), {str(self.old.id)})
+        self.assertEqual(order_ids(status=Order.CONFIRMED), {str(self.new.id)})
+        self.assertEqual(order_ids(status=Order.CANCELED), set())
+
+    def test_response(self):
+        response = self.client.get('/api/v1/orders/export/')
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Disposition'], f'attachment; filename="orders-{self.today:%Y%m%d}.csv"')
+        self.assertEqual(self.client.get('/api/v1/orders/export/', {'output': 'jsonl'})['Content-Type'], 'application/x-ndjson')
+        self.assertEqual(self.client.get('/api/v1/orders/export/', {'start': self.today, 'end': self.today - timedelta(days=1)}).status_code, 400)
+
+        self.client.force_authenticate(self.customer)
+        self.assertEqual(self.client.get('/api/v1/orders/export/').status_code, 403)
+
+    def test_command_writes_a_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'orders.csv')
+            stderr = io.StringIO()
+            call_command('export_orders', '--file', path, '--status', Order.CONFIRMED, '--chunk-size', '1', stderr=stderr)
+            with open(path, newline='', encoding='utf-8') as export_file:
+                rows = list(csv.reader(export_file))
+
+        self.assertEqual(','.join(rows[0]), self.header)
+        self.assertEqual([(row[0], row[7]) for row in rows[1:]], [(str(self.new.id), 'Chicken Soup'), (str(self.new.id), 'Rice, fried')])
+        self.assertIn('Exported 2 order lines', stderr.getvalue())
+
+        with self.assertRaises(CommandError):
+            call_command('export_orders', '--start', str(self.today), '--end', str(self.today - timedelta(days=1)))
+
+
+class OrderAdminTests(TestCase):
+    def setUp(self):
+        self.food_item = create_food_item()
+        self.customer = User.objects.create_user(email='customer@example.com')
+        self.client.force_login(User.objects.create_superuser(email='admin@example.com', password='secret'))
+
+    def create_orders(self, count, status=Order.PENDING):
+        orders = []
+        for _ in range(count):
+            order = Order.objects.create(user=self.customer, status=status, total_price='4.50', address='Dhaka')
+            OrderItem.objects.create(order=order, food_item=self.food_item, quantity=1, price='4.50', total_price='4.50')
+            orders.append(order)
+        return orders
+
+    def changelist_queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def test_changelists_make_the_same_queries_for_more_rows(self):
+        urls = ['/admin/orders/order/', '/admin/orders/orderitem/', '/admin/orders/cart/', '/admin/orders/cartitem/']
+        self.create_orders(2)
+        create_cart('first@example.com', self.food_item)
+        small = [self.changelist_queries(url) for url in urls]
+
+        self.create_orders(10)
+        for index in range(10):
+            create_cart(f'cart{index}@example.com', self.food_item)
+        self.assertEqual([self.changelist_queries(url) for url in urls], small)
+
+    def test_status_actions_use_the_transitions(self):
+        pending = self.create_orders(2)
+        delivered = self.create_orders(1, status=Order.DELIVERED)
+
+        response = self.client.post('/admin/orders/order/', {
+            'action': 'mark_confirmed',
+            '_selected_action': [str(order.pk) for order in pending + delivered],
+        }, follow=True)
+
+        messages = [str(message) for message in response.context['messages']]
+        self.assertEqual(messages, ["2 orders marked confirmed.", "1 orders can't be changed to confirmed."])
+        self.assertEqual(Order.objects.filter(status=Order.CONFIRMED).count(), 2)
+        self.assertEqual(Order.objects.get(pk=delivered[0].pk).status, Order.DELIVERED)
+
+    def test_search_by_id_or_email(self):
+        order = self.create_orders(1)[0]
+        self.assertContains(self.client.get('/admin/orders/order/', {'q': str(order.pk)}), str(order.pk))
+        self.assertEqual(self.client.get('/admin/orders/order/', {'q': 'customer@example.com'}).status_code, 200)
+
+
+@override_settings(DATABASE_REPLICAS={**settings.DATABASE_REPLICAS, 'ALIASES': []})
+class DeliveryZoneOrderTests(TestCase):
+    def setUp(self):
+        self.food_item = create_food_item()
+        self.customer = User.objects.create_user(email='customer@example.com')
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user(email='staff@example.com', is_staff=True))
+        self.dhanmondi = DeliveryZone.objects.create(name='Dhanmondi', boundary=[[90.36, 23.73], [90.40, 23.73], [90.40, 23.77]])
+        self.gulshan = DeliveryZone.objects.create(name='Gulshan', boundary=[[90.40, 23.77], [90.43, 23.77], [90.43, 23.81]])
+
+    def create_order(self, zone, status=Order.CONFIRMED):
+        order = Order.objects.create(user=self.customer, status=status, total_price='4.50', address='Dhaka', delivery_zone=zone)
+        OrderItem.objects.create(order=order, food_item=self.food_item, quantity=1, price='4.50', total_price='4.50')
+        return order
+
+    def test_kitchen_queue_by_zone(self):
+        queue = KitchenQueue()
+        now = timezone.now()
+        queue.load({
+            1: (now, [(7, 'Soup', 2)], self.dhanmondi.id),
+            2: (now, [(7, 'Soup', 1), (8, 'Rice', 1)], self.gulshan.id),
+            3: (now, [(8, 'Rice', 3)], None),
+        })
+
+        orders, batches = queue.snapshot(zone_id=self.gulshan.id)
+        self.assertEqual([order.id for order in orders], [2])
+        self.assertEqual([(batch['food_item'], batch['quantity']) for batch in batches], [(8, 1), (7, 1)])
+        self.assertEqual((queue.count(), queue.count(self.gulshan.id), queue.count(None)), (3, 1, 3))
+
+        queue.remove(2)
+        self.assertEqual(queue.snapshot(zone_id=self.gulshan.id), ([], []))
+        self.assertEqual(queue.count(self.gulshan.id), 0)
+        self.assertEqual([(batch['food_item'], batch['quantity']) for batch in queue.snapshot()[1]], [(8, 3), (7, 2)])
+
+    def test_kitchen_endpoint_filters_by_zone(self):
+        self.create_order(self.dhanmondi)
+        self.create_order(self.gulshan)
+        kitchen_queue.loaded_at = None
+
+        response = self.client.get('/api/v1/kitchen/', {'zone': self.gulshan.id})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['open_orders'], 1)
+        self.assertEqual([order['zone'] for order in response.json()['orders']], [self.gulshan.id])
+
+    def test_order_counts_per_zone(self):
+        self.create_order(self.dhanmondi)
+        self.create_order(self.dhanmondi, status=Order.DELIVERED)
+        self.create_order(self.gulshan)
+        self.create_order(None)
+
+        response = self.client.get('/api/v1/orders/zones/', {'status': Order.CONFIRMED})
+
+        self.assertEqual(response.status_code, 200)
+        counts = {row['zone']: row['orders'] for row in response.json()}
+        self.assertEqual(counts, {self.dhanmondi.id: 1, self.gulshan.id: 1, None: 1})
+        self.assertEqual(len(self.client.get('/api/v1/orders/', {'zone': 'none'}).json()), 1)
+
+    def test_customers_cannot_count_orders(self):
+        self.client.force_authenticate(self.customer)
+        self.assertEqual(self.client.get('/api/v1/orders/zones/').status_code, 403)
+
+
+class OrderIdTests(TestCase):
+    def setUp(self):
+        self.food_item = create_food_item()
+        self.customer = User.objects.create_user(email='customer@example.com')
+
+    def create_order(self, created_at, id=None):
+        order = Order.objects.create(user=self.customer, total_price='4.50', address='Dhaka', **({'id': id} if id else {}))
+        Order.objects.filter(pk=order.pk).update(created_at=created_at)
+        OrderItem.objects.create(order=order, food_item=self.food_item, quantity=1, price='4.50', total_price='4.50')
+        return order
+
+    def test_new_orders_and_carts_get_time_ordered_ids(self):
+        first = Order.objects.create(user=self.customer, total_price='4.50', address='Dhaka')
+        second = Order.objects.create(user=self.customer, total_price='4.50', address='Dhaka')
+        self.assertEqual((first.id.version, Cart.objects.create(user=self.customer).id.version), (7, 7))
+        self.assertLess(first.id, second.id)
+
+    def test_rekey_rewrites_legacy_ids_and_their_references(self):
+        now = timezone.now()
+        legacy_created = now - timedelta(days=2)
+        legacy = self.create_order(legacy_created, id=uuid.uuid4())
+        current = self.create_order(now)
+        cart = Cart.objects.create(user=self.customer, id=uuid.uuid4())
+        CartItem.objects.create(cart=cart, food_item=self.food_item, quantity=1)
+
+        call_command('rekey_uuid7', batch_size=1, stdout=io.StringIO())
+
+        ids = list(Order.objects.order_by('pk').values_list('pk', flat=True))
+        self.assertEqual([value.version for value in ids], [7, 7])
+        self.assertEqual(ids[1], current.id)
+        # The id keeps created_at to the millisecond.
+        self.assertLess(legacy_created - uuid7_time(ids[0]), timedelta(milliseconds=1))
+        self.assertFalse(Order.objects.filter(pk=legacy.id).exists())
+        self.assertEqual(OrderItem.objects.get(order_id=ids[0]).food_item_id, self.food_item.id)
+        self.assertEqual(Cart.objects.get().items.count(), 1)
+        self.assertEqual(Cart.objects.get().id.version, 7)
+
+    def test_created_range_by_id(self):
+        now = timezone.now()
+        orders = [self.create_order(now - timedelta(days=days), id=uuid7_at(now - timedelta(days=days))) for days in (3, 2, 1)]
+        start, end = now - timedelta(days=2, hours=1), now - timedelta(days=1, hours=1)
+
+        for by_id in (False, True):
+            with self.settings(ORDER_IDS={'RANGE_BY_ID': by_id}):
+                self.assertEqual(list(Order.objects.filter(created_range(start, end))), [orders[1]])
+                self.assertEqual(OrderItem.objects.filter(created_range(start=start, prefix='order__')).count(), 2)
+
+    def test_benchmark_runs(self):
+        output = io.StringIO()
+        call_command('benchmark_uuid_keys', rows=50, batch_size=20, stdout=output)
+        results = json.loads(output.getvalue())
+        self.assertEqual(set(results), {'rows', 'vendor', 'uuid4', 'uuid7'})
+
+
+class AbandonedCartTests(TestCase):
+    def setUp(self):
+        self.food_item = create_food_item()
+
+    def create_carts(self, count, idle_days, quantity=2):
+        carts = []
+        for _ in range(count):
+            _, cart_id = create_cart(f'user{User.objects.count()}@example.com', self.food_item, quantity=quantity)
+            Cart.objects.filter(pk=cart_id).update(updated_at=timezone.now() - timedelta(days=idle_days))
+            carts.append(cart_id)
+        return carts
+
+    def sweep(self, *args, **options):
+        output = io.StringIO()
+        call_command('sweep_abandoned_carts', *args, stdout=output, **options)
+        return json.loads(output.getvalue())
+
+    def test_cart_item_changes_touch_the_cart(self):
+        cart_id = self.create_carts(1, idle_days=40)[0]
+        client = APIClient()
+        client.force_authenticate(Cart.objects.get(pk=cart_id).user)
+
+        response = client.post(f'/api/v1/carts/{cart_id}/items/', {'food_item': self.food_item.id, 'quantity': 1}, format='json')
+
+        self.assertEqual(response.status_code, 201)
+        self.assertGreater(Cart.objects.get(pk=cart_id).updated_at, timezone.now() - timedelta(minutes=1))
+
+    def test_sweeps_idle_carts_in_batches(self):
+        idle = self.create_carts(5, idle_days=40)
+        active = self.create_carts(2, idle_days=1)
+
+        self.assertEqual(self.sweep(dry_run=True), {'dry_run': True, 'carts': 5, 'items': 5})
+        results = self.sweep(batch_size=2)
+
+        self.assertEqual((results['carts'], results['items'], results['batches']), (5, 5, 3))
+        self.assertEqual(set(Cart.objects.values_list('pk', flat=True)), set(active))
+        self.assertFalse(CartItem.objects.filter(cart_id__in=idle).exists())
+        stats = DailyAbandonedCarts.objects.get()
+        self.assertEqual((stats.carts, stats.items, stats.quantity, stats.value), (5, 5, 10, Decimal('45.00')))
+
+    def test_stats_are_optional(self):
+        self.create_carts(2, idle_days=40)
+        results = self.sweep(no_stats=True, idle_days=30)
+
+        self.assertEqual((results['carts'], results['stats_recorded']), (2, False))
+        self.assertFalse(DailyAbandonedCarts.objects.exists())
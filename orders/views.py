@@ -1,14 +1,26 @@
 from django.shortcuts import render
 from rest_framework.viewsets import GenericViewSet, ModelViewSet
-from orders.serializers import CartSerializer, CartItemSerializer,EmptySerializer, CartItemUpdateSerializer, OrderSerializer, OrderCreateSerializer, UpdateOrderSerializer
-from rest_framework.permissions import IsAuthenticated
+from orders.serializers import CartSerializer, CartItemSerializer,EmptySerializer, CartItemUpdateSerializer, OrderSerializer, OrderCreateSerializer, UpdateOrderSerializer, OrderExportSerializer, BulkOrderTransitionSerializer, BulkOrderTransitionResponseSerializer, KitchenQueueSerializer, ZoneOrderCountQuerySerializer, ZoneOrderCountSerializer
+from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from orders.models import Cart, CartItem, Order, OrderItem
 from rest_framework.decorators import action
-from orders.services import OrderServices
+from orders.services import CartServices, OrderServices
+from orders.exports import EXPORT_FORMATS, export_rows, export_lines
+from orders.events import get_broker, get_setting
+from orders.kitchen import get_kitchen_queue
+from django.http import StreamingHttpResponse, JsonResponse
+from django.core.handlers.asgi import ASGIRequest
+from django.db.models import Count
+from django.utils import timezone
+from asgiref.sync import sync_to_async
+from users.authentication import CachedJWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken, AuthenticationFailed
+import asyncio
+import json
 from rest_framework.response import Response
 from rest_framework.exceptions import ValidationError
-from drf_yasg.utils import swagger_auto_schema
-from drf_yasg import openapi
+from nomino.docs import swagger_auto_schema
+from nomino.docs import openapi
 
 
 # Create your views here.
@@ -20,6 +32,7 @@ class CartViewSet(ModelViewSet):
     """
     serializer_class = CartSerializer
     permission_classes = [IsAuthenticated]
+    throttle_scope = 'orders'
 
     @swagger_auto_schema(
         operation_summary="Return cart for the authenticated user.",
@@ -79,9 +92,11 @@ class CartViewSet(ModelViewSet):
         return super().destroy(request, *args, **kwargs)
     
     def get_queryset(self):
+        if getattr(self, 'swagger_fake_view', False):
+            return Cart.objects.none()
         if self.request.user.is_staff:
-            return Cart.objects.all()
-        return Cart.objects.filter(user=self.request.user)
+            return Cart.objects.prefetch_related("items__food_item").all()
+        return Cart.objects.prefetch_related("items__food_item").filter(user=self.request.user)
     
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
@@ -92,6 +107,7 @@ class CartItemViewSet(ModelViewSet):
     API endpoint for managing cart items within a specific cart.
     """   
     permission_classes = [IsAuthenticated]
+    throttle_scope = 'orders'
 
     @swagger_auto_schema(
         operation_summary="Return all items in the specified cart.",
@@ -185,11 +201,20 @@ class CartItemViewSet(ModelViewSet):
         return CartItemSerializer
     
     def get_queryset(self):
-        return CartItem.objects.filter(cart_id = self.kwargs.get('cart_pk'))
+        return CartItem.objects.select_related('food_item').filter(cart_id = self.kwargs.get('cart_pk'))
     
     def perform_create(self, serializer):
         cart = Cart.objects.get(id = self.kwargs.get('cart_pk'))
         serializer.save(cart = cart)
+        CartServices.touch(cart.pk)
+        
+    def perform_update(self, serializer):
+        serializer.save()
+        CartServices.touch(serializer.instance.cart_id)
+        
+    def perform_destroy(self, instance):
+        instance.delete()
+        CartServices.touch(instance.cart_id)
         
     def get_serializer_context(self):
         return {'cart_pk':self.kwargs.get('cart_pk')}
@@ -202,10 +227,14 @@ class OrderViewSet(ModelViewSet):
     """
     http_method_names = ['get', 'post', 'patch', 'delete', 'head', 'option']
     permission_classes = [IsAuthenticated]
+    throttle_scope = 'orders'
 
     @swagger_auto_schema(
         operation_summary="Return all orders for the authenticated user.",
-        operation_description="Staff users can view all orders.",
+        operation_description="Staff users can view all orders, and filter them by delivery zone with `zone` (an id, or `none` for orders outside every zone).",
+        manual_parameters=[
+            openapi.Parameter('zone', openapi.IN_QUERY, type=openapi.TYPE_STRING)
+        ],
         responses={
             200: openapi.Response(
                 description="List of orders",
@@ -249,7 +278,7 @@ class OrderViewSet(ModelViewSet):
     
     @swagger_auto_schema(
         operation_summary="Update an order's status.",
-        operation_description="Only staff can update order status, except for cancellation.",
+        operation_description="Only staff can update order status, except for cancellation. Send the `version` that was read to make sure nobody changed the order in the meantime.",
         request_body=UpdateOrderSerializer,
         responses={
             200: openapi.Response(
@@ -258,7 +287,8 @@ class OrderViewSet(ModelViewSet):
             ),
             400: "Validation error",
             403: "You are not allowed to update the order!",
-            404: "Order not found."
+            404: "Order not found.",
+            409: "The order was changed by someone else. Reload it and try again."
         }
     )
     def partial_update(self, request, *args, **kwargs):
@@ -315,7 +345,8 @@ class OrderViewSet(ModelViewSet):
                     }
                 )
             ),
-            404: "Order not found."
+            404: "Order not found.",
+            409: "The order was changed by someone else. Reload it and try again."
         }
     )
     @action(detail=True, methods=['post'])
@@ -332,9 +363,89 @@ class OrderViewSet(ModelViewSet):
             return ValidationError(str(e))
         return Response({'status': 'Order Canceled'})
     
+    @swagger_auto_schema(
+        operation_summary="Export orders and their line items.",
+        operation_description="Streams one row per order line as CSV or JSON Lines. Only staff can export orders.",
+        query_serializer=OrderExportSerializer,
+        responses={
+            200: "Streamed CSV or JSON Lines file.",
+            400: "Validation error",
+            403: "You do not have permission to perform this action."
+        }
+    )
+    @action(detail=False, methods=['get'], permission_classes=[IsAdminUser])
+    def export(self, request):
+        """
+        Stream matching order lines without loading the orders into memory.
+        """
+        serializer = OrderExportSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        params = serializer.validated_data
+        output = params['output']
+        
+        rows = export_rows(start=params.get('start'), end=params.get('end'), status=params.get('status'))
+        response = StreamingHttpResponse(export_lines(rows, output=output), content_type=EXPORT_FORMATS[output])
+        filename = f"orders-{timezone.localdate():%Y%m%d}.{output}"
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+    
+    @swagger_auto_schema(
+        operation_summary="Move many orders to a new status at once.",
+        operation_description="Only staff can run bulk transitions. Orders whose current status does not allow the move are reported and left unchanged.",
+        request_body=BulkOrderTransitionSerializer,
+        responses={
+            200: openapi.Response(
+                description="Outcome for each order id: updated, unchanged, invalid_transition or not_found",
+                schema=BulkOrderTransitionResponseSerializer()
+            ),
+            400: "Validation error",
+            403: "You do not have permission to perform this action."
+        }
+    )
+    @action(detail=False, methods=['post'], url_path='bulk-transition', permission_classes=[IsAdminUser])
+    def bulk_transition(self, request):
+        serializer = BulkOrderTransitionSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        return Response(serializer.data)
+    
+    @swagger_auto_schema(
+        operation_summary="Count orders per delivery zone.",
+        operation_description="Only staff can count orders. `zone` is null for orders outside every zone. Filter by `status`.",
+        query_serializer=ZoneOrderCountQuerySerializer,
+        responses={
+            200: openapi.Response(
+                description="Order count per zone",
+                schema=ZoneOrderCountSerializer(many=True)
+            ),
+            400: "Validation error",
+            403: "You do not have permission to perform this action."
+        }
+    )
+    @action(detail=False, methods=['get'], permission_classes=[IsAdminUser])
+    def zones(self, request):
+        serializer = ZoneOrderCountQuerySerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        orders = Order.objects.all()
+        if 'status' in serializer.validated_data:
+            orders = orders.filter(status=serializer.validated_data['status'])
+        rows = (
+            orders.values('delivery_zone_id', 'delivery_zone__name')
+            .annotate(orders=Count('id'))
+            .order_by('delivery_zone__name')
+        )
+        counts = [{'zone': row['delivery_zone_id'], 'name': row['delivery_zone__name'], 'orders': row['orders']} for row in rows]
+        return Response(ZoneOrderCountSerializer(counts, many=True).data)
+    
     def get_serializer_class(self):
         if self.action == "cancel":
             return EmptySerializer
+        if self.action == "zones":
+            return ZoneOrderCountQuerySerializer
+        if self.action == "export":
+            return OrderExportSerializer
+        if self.action == "bulk_transition":
+            return BulkOrderTransitionSerializer
         if self.request.method == "POST":
             return OrderCreateSerializer
         if self.request.method == "PATCH":
@@ -342,19 +453,107 @@ class OrderViewSet(ModelViewSet):
         return OrderSerializer
     
     def get_queryset(self):
+        if getattr(self, 'swagger_fake_view', False):
+            return Order.objects.none()
         if self.request.user.is_staff:
-            return Order.objects.prefetch_related("items__food_item").all()
+            return filter_by_zone(Order.objects.prefetch_related("items__food_item").all(), self.request.query_params.get('zone'))
         return Order.objects.prefetch_related("items__food_item").filter(user = self.request.user)
     
     def get_serializer_context(self):
         return {'user_id': self.request.user.id, 'user':self.request.user}
     
     
-
     
+class KitchenQueueViewSet(GenericViewSet):
+    """
+    API endpoint for the kitchen preparation queue.
+    """
+    permission_classes = [IsAdminUser]
+    serializer_class = KitchenQueueSerializer
     
+    @swagger_auto_schema(
+        operation_summary="Return the next confirmed orders to prepare and the quantities to cook per food item.",
+        operation_description="Orders are listed oldest first, which is also the order of their promised times. `limit` sets how many orders are returned (default 20). `zone` limits the orders, batches and count to one delivery zone.",
+        manual_parameters=[
+            openapi.Parameter('limit', openapi.IN_QUERY, type=openapi.TYPE_INTEGER),
+            openapi.Parameter('zone', openapi.IN_QUERY, type=openapi.TYPE_INTEGER)
+        ],
+        responses={
+            200: openapi.Response(
+                description="Kitchen queue",
+                schema=KitchenQueueSerializer()
+            ),
+            403: "You do not have permission to perform this action."
+        }
+    )
+    def list(self, request, *args, **kwargs):
+        try:
+            limit = min(max(int(request.query_params.get('limit', 20)), 1), 200)
+            zone_id = int(request.query_params['zone']) if 'zone' in request.query_params else None
+        except ValueError:
+            raise ValidationError({'detail': "limit and zone must be integers."})
+        
+        queue = get_kitchen_queue()
+        orders, batches = queue.snapshot(limit=limit, zone_id=zone_id)
+        return Response(KitchenQueueSerializer({'open_orders': queue.count(zone_id), 'orders': orders, 'batches': batches}).data)
+    
+    
+    
+def filter_by_zone(orders, zone):
+    """
+    Orders in the delivery zone with id ``zone``, or outside every zone for "none".
+    """
+    if zone is None:
+        return orders
+    if zone.lower() == 'none':
+        return orders.filter(delivery_zone__isnull=True)
+    try:
+        return orders.filter(delivery_zone_id=int(zone))
+    except ValueError:
+        raise ValidationError({'zone': "A zone id or 'none' is required."})
+    
+    
+async def order_events(request):
+    """
+    Server-Sent Events stream of the authenticated user's order updates.
+    Authenticate with the usual `Authorization: JWT <token>` header, or with
+    `?token=<access token>` since browser EventSource cannot set headers.
+    """
+    if not isinstance(request, ASGIRequest):
+        return JsonResponse({'detail': "Order events are only served by the ASGI application."}, status=501)
+    
+    try:
+        user = await _authenticate_stream(request)
+    except (InvalidToken, AuthenticationFailed) as e:
+        detail = e.detail if isinstance(e.detail, dict) else {'detail': e.detail}
+        return JsonResponse(detail, status=e.status_code)
+    if user is None:
+        return JsonResponse({'detail': "Authentication credentials were not provided."}, status=401)
+    
+    response = StreamingHttpResponse(_order_event_stream(user.id), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
 
 
+async def _authenticate_stream(request):
+    authentication = CachedJWTAuthentication()
+    header = authentication.get_header(request)
+    raw_token = authentication.get_raw_token(header) if header else request.GET.get('token')
+    if not raw_token:
+        return None
+    validated_token = authentication.get_validated_token(raw_token)
+    return await sync_to_async(authentication.get_user)(validated_token)
 
-    
-    
\ No newline at end of file
+
+async def _order_event_stream(user_id):
+    heartbeat = get_setting('HEARTBEAT_SECONDS')
+    async with get_broker().subscribe(user_id) as queue:
+        yield "retry: 5000\n\n"
+        while True:
+            try:
+                event = await asyncio.wait_for(queue.get(), timeout=heartbeat)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            yield f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
@@ -1,10 +1,11 @@
 from django.contrib import admin
 from users.models import User
 from django.contrib.auth.admin import UserAdmin
+from nomino.admin import LargeTableAdminMixin
 
 # Register your models here.
 
-class CustomUserAdmin(UserAdmin):
+class CustomUserAdmin(LargeTableAdminMixin, UserAdmin):
     model = User
     list_display = ('email', 'first_name', 'last_name', 'is_staff', 'is_active')
     list_filter = ('is_staff', 'is_active')
@@ -0,0 +1,117 @@
+import copy
+import threading
+import time
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.authentication import JWTAuthentication, JWTStatelessUserAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+DEFAULTS = {
+    'LOCAL_TTL_SECONDS': 5,
+    'SHARED_TTL_SECONDS': 60,
+    'LOCAL_MAX_ENTRIES': 10000,
+}
+
+
+def get_setting(name):
+    return getattr(settings, 'JWT_USER_CACHE', {}).get(name, DEFAULTS[name])
+
+
+class UserCache:
+    """
+    Users looked up by id, kept for a few seconds in this process and for a
+    minute in the shared Django cache. Saving or deleting a user drops both entries
+    (see users.receivers); other processes drop their local copy within LOCAL_TTL_SECONDS.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = {}
+
+    def key(self, user_id):
+        return f"jwt-user:{user_id}"
+
+    def get(self, user_id):
+        now = time.monotonic()
+        entry = self._local.get(user_id)
+        if entry is not None and entry[0] > now:
+            return entry[1]
+
+        user = cache.get(self.key(user_id))
+        if user is not None:
+            self._remember(user_id, user, now)
+        return user
+
+    def set(self, user_id, user):
+        cache.set(self.key(user_id), user, get_setting('SHARED_TTL_SECONDS'))
+        self._remember(user_id, user, time.monotonic())
+
+    def invalidate(self, user_id):
+        cache.delete(self.key(user_id))
+        with self._lock:
+            self._local.pop(user_id, None)
+
+    def clear_local(self):
+        with self._lock:
+            self._local.clear()
+
+    def _remember(self, user_id, user, now):
+        with self._lock:
+            if len(self._local) >= get_setting('LOCAL_MAX_ENTRIES'):
+                self._local.clear()
+            self._local[user_id] = (now + get_setting('LOCAL_TTL_SECONDS'), user)
+
+
+user_cache = UserCache()
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that resolves the user through ``user_cache`` instead of
+    querying the users table on every request. The active and password-change
+    checks still run against the cached user.
+    """
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        user = user_cache.get(user_id)
+        if user is None:
+            try:
+                user = self.user_model.objects.get(**{api_settings.USER_ID_FIELD: user_id})
+            except self.user_model.DoesNotExist:
+                raise AuthenticationFailed(_("User not found"), code="user_not_found")
+            user_cache.set(user_id, user)
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(_("The user's password has been changed."), code="password_changed")
+
+        # Views get their own instance, so changes they make never leak into the cache.
+        return copy.copy(user)
+
+
+class JWTClaimsAuthentication(JWTStatelessUserAuthentication):
+    """
+    Authenticates from the token claims alone, without touching the database or cache.
+    request.user is a TokenUser exposing only ``id`` and ``is_staff`` (as of when
+    the token was issued), so use it only for endpoints that need nothing more.
+    """
+
+
+class ClaimsOnlyReadsMixin:
+    """
+    Viewset mixin that authenticates safe (read) requests with JWTClaimsAuthentication.
+    """
+    def get_authenticators(self):
+        if self.request.method in SAFE_METHODS:
+            return [JWTClaimsAuthentication()]
+        return super().get_authenticators()
@@ -0,0 +1,20 @@
+from django.apps import apps
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from users.models import User
+from users.authentication import user_cache
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_user(sender, instance, **kwargs):
+    user_cache.invalidate(instance.pk)
+
+
+if apps.is_installed('rest_framework_simplejwt.token_blacklist'):
+    from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+    @receiver(post_save, sender=BlacklistedToken)
+    def invalidate_user_of_blacklisted_token(sender, instance, **kwargs):
+        if instance.token.user_id is not None:
+            user_cache.invalidate(instance.token.user_id)
@@ -1,4 +1,5 @@
 from djoser.serializers import UserCreateSerializer as BaseUserCreateSerializer, UserSerializer as BaseUserSerializer
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer as BaseTokenObtainPairSerializer
 
 
 
@@ -10,4 +11,13 @@ class UserCreateSerializer(BaseUserCreateSerializer):
 class UserSerializer(BaseUserSerializer):
     class Meta(BaseUserSerializer.Meta):
         ref_name = 'CustomUser'
-        fields = ['id','email','first_name','last_name','phone_number','address']
\ No newline at end of file
+        fields = ['id','email','first_name','last_name','phone_number','address']
+        
+        
+class TokenObtainPairSerializer(BaseTokenObtainPairSerializer):
+    @classmethod
+    def get_token(cls, user):
+        # Lets JWTClaimsAuthentication tell staff apart without loading the user.
+        token = super().get_token(user)
+        token['is_staff'] = user.is_staff
+        return token
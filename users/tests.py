@@ -1,3 +1,48 @@
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from users.authentication import CachedJWTAuthentication, JWTClaimsAuthentication, user_cache
+from users.models import User
+from users.serializers import TokenObtainPairSerializer
 
 # Create your tests here.
+
+
+class CachedJWTAuthenticationTests(TestCase):
+
+    def setUp(self):
+        user_cache.clear_local()
+        self.user = User.objects.create_user(email='customer@example.com', password='password', is_staff=True)
+        self.token = str(TokenObtainPairSerializer.get_token(self.user).access_token)
+
+    def tearDown(self):
+        user_cache.invalidate(self.user.pk)
+
+    def authenticate(self, authentication):
+        request = APIRequestFactory().get('/', HTTP_AUTHORIZATION=f'JWT {self.token}')
+        return authentication.authenticate(request)[0]
+
+    def test_user_is_loaded_once(self):
+        self.assertEqual(self.authenticate(CachedJWTAuthentication()), self.user)
+
+        with CaptureQueriesContext(connection) as queries:
+            user = self.authenticate(CachedJWTAuthentication())
+        self.assertEqual(user, self.user)
+        self.assertEqual(len(queries), 0)
+
+    def test_saving_the_user_invalidates_the_cache(self):
+        self.authenticate(CachedJWTAuthentication())
+        self.user.is_active = False
+        self.user.save()
+
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate(CachedJWTAuthentication())
+
+    def test_claims_only_mode_does_not_query(self):
+        with CaptureQueriesContext(connection) as queries:
+            user = self.authenticate(JWTClaimsAuthentication())
+        self.assertEqual(len(queries), 0)
+        self.assertEqual(user.id, self.user.id)
+        self.assertTrue(user.is_staff)